@@ -0,0 +1,14 @@
+-- 재채점(src.rescore)을 위한 원본 유사도 점수 및 식별력 등급 저장 컬럼
+-- 적용: psql "$DB_URL" -f migrations/001_infringe_risk_raw_scores.sql
+
+ALTER TABLE tbl_infringe_risk
+    ADD COLUMN IF NOT EXISTS risk_no              bigserial,
+    ADD COLUMN IF NOT EXISTS visual_raw_score     double precision,   -- 외관 유사도 (보정 전, 코사인)
+    ADD COLUMN IF NOT EXISTS phonetic_raw_score   double precision,   -- 호칭 유사도 (보정 전, 0~100)
+    ADD COLUMN IF NOT EXISTS conceptual_raw_score double precision,   -- 관념 유사도 (보정 전, 코사인)
+    ADD COLUMN IF NOT EXISTS visual_grade         smallint,           -- 외관 식별력 등급 (1~5)
+    ADD COLUMN IF NOT EXISTS phonetic_grade       smallint,           -- 호칭 식별력 등급 (1~5)
+    ADD COLUMN IF NOT EXISTS conceptual_grade     smallint,           -- 관념 식별력 등급 (1~5)
+    ADD COLUMN IF NOT EXISTS rescore_date         timestamp;          -- 마지막 재채점 일시
+
+CREATE UNIQUE INDEX IF NOT EXISTS ux_infringe_risk_risk_no ON tbl_infringe_risk (risk_no);
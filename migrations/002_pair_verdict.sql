@@ -0,0 +1,14 @@
+-- 상표 쌍 판정 이력 (Safe 포함). 동일 입력(이미지, 상표명, 설정 버전)으로 판정된 쌍은 revisit_days 동안 후보에서 제외
+-- 적용: psql "$DB_URL" -f migrations/002_pair_verdict.sql
+
+CREATE TABLE IF NOT EXISTS tbl_pair_verdict (
+    p_trademark_reg_no  varchar(20)      NOT NULL,          -- 보호 상표 등록번호
+    c_trademark_no      bigint           NOT NULL,          -- 수집 상표 번호
+    c_image_digest      char(64)         NOT NULL,          -- 수집 상표 이미지 SHA-256 (hex)
+    c_trademark_name    text             NOT NULL,          -- 판정 당시 수집 상표명
+    config_version      varchar(16)      NOT NULL,          -- 판정 당시 risk 설정 해시
+    risk_level          varchar(1)       NOT NULL,          -- H / M / L / S
+    total_score         double precision,
+    judge_date          timestamp        NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (p_trademark_reg_no, c_trademark_no)
+);
@@ -0,0 +1,9 @@
+-- 상표 이미지 지각 해시 (64bit dHash, signed bigint)
+-- 적용: psql "$DB_URL" -f migrations/003_trademark_dhash.sql
+-- 기존 데이터 채우기: python -m src.tools.backfill dhash
+
+ALTER TABLE tbl_protection_trademark
+    ADD COLUMN IF NOT EXISTS p_trademark_dhash bigint;
+
+ALTER TABLE tbl_collect_trademark
+    ADD COLUMN IF NOT EXISTS c_trademark_dhash bigint;
@@ -0,0 +1,47 @@
+-- 상품류 코드 정수 배열 (후보 검색 상품류 필터를 GIN 인덱스로 처리)
+-- 적용: psql "$DB_URL" -f migrations/004_trademark_class_codes.sql
+-- 기존 데이터 채우기: python -m src.tools.backfill class_codes
+
+-- '|' 구분 상품류 코드 문자열 -> 정렬된 정수 배열 (숫자가 아닌 코드는 무시, NULL은 빈 배열)
+CREATE OR REPLACE FUNCTION class_code_array(class_code text) RETURNS int[]
+    LANGUAGE sql IMMUTABLE AS $$
+    SELECT coalesce(array_agg(DISTINCT trim(c)::int ORDER BY trim(c)::int), '{}'::int[])
+      FROM unnest(string_to_array(class_code, '|')) AS c
+     WHERE trim(c) ~ '^[0-9]{1,2}$'
+$$;
+
+ALTER TABLE tbl_protection_trademark
+    ADD COLUMN IF NOT EXISTS p_trademark_class_codes int[];
+
+ALTER TABLE tbl_collect_trademark
+    ADD COLUMN IF NOT EXISTS c_trademark_class_codes int[];
+
+-- 상품류 코드 문자열 변경 시 배열 컬럼 자동 갱신
+CREATE OR REPLACE FUNCTION trg_p_trademark_class_codes() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+BEGIN
+    NEW.p_trademark_class_codes := class_code_array(NEW.p_trademark_class_code);
+    RETURN NEW;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION trg_c_trademark_class_codes() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+BEGIN
+    NEW.c_trademark_class_codes := class_code_array(NEW.c_trademark_class_code);
+    RETURN NEW;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS p_trademark_class_codes ON tbl_protection_trademark;
+CREATE TRIGGER p_trademark_class_codes
+    BEFORE INSERT OR UPDATE OF p_trademark_class_code ON tbl_protection_trademark
+    FOR EACH ROW EXECUTE FUNCTION trg_p_trademark_class_codes();
+
+DROP TRIGGER IF EXISTS c_trademark_class_codes ON tbl_collect_trademark;
+CREATE TRIGGER c_trademark_class_codes
+    BEFORE INSERT OR UPDATE OF c_trademark_class_code ON tbl_collect_trademark
+    FOR EACH ROW EXECUTE FUNCTION trg_c_trademark_class_codes();
+
+CREATE INDEX IF NOT EXISTS ix_protection_trademark_class_codes ON tbl_protection_trademark USING gin (p_trademark_class_codes);
+CREATE INDEX IF NOT EXISTS ix_collect_trademark_class_codes ON tbl_collect_trademark USING gin (c_trademark_class_codes);
@@ -0,0 +1,51 @@
+-- 수집 상표 / 침해 위험군 상표명·이미지 다이제스트 (침해 위험군 제외 조건을 인덱스 해시 조회로 처리)
+-- 적용: psql "$DB_URL" -f migrations/005_trademark_digests.sql
+-- 기존 데이터 채우기: python -m src.tools.backfill digests
+
+-- 상표명 다이제스트: 소문자 + 공백/문장부호 제거 후 SHA-256 (hex), NULL은 NULL
+CREATE OR REPLACE FUNCTION trademark_name_digest(name text) RETURNS char(64)
+    LANGUAGE sql IMMUTABLE STRICT AS $$
+    SELECT encode(sha256(convert_to(regexp_replace(lower(name), '[[:space:][:punct:]]+', '', 'g'), 'UTF8')), 'hex')
+$$;
+
+-- 이미지 다이제스트: SHA-256 (hex), NULL은 NULL
+CREATE OR REPLACE FUNCTION trademark_image_digest(image bytea) RETURNS char(64)
+    LANGUAGE sql IMMUTABLE STRICT AS $$
+    SELECT encode(sha256(image), 'hex')
+$$;
+
+ALTER TABLE tbl_collect_trademark
+    ADD COLUMN IF NOT EXISTS c_name_digest  char(64),
+    ADD COLUMN IF NOT EXISTS c_image_digest char(64);
+
+ALTER TABLE tbl_infringe_risk
+    ADD COLUMN IF NOT EXISTS c_name_digest  char(64),
+    ADD COLUMN IF NOT EXISTS c_image_digest char(64);
+
+-- 상표명/이미지 변경 시 다이제스트 자동 갱신 (두 테이블 모두 c_trademark_name, c_trademark_image 컬럼 사용)
+CREATE OR REPLACE FUNCTION trg_c_trademark_digests() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+BEGIN
+    NEW.c_name_digest  := trademark_name_digest(NEW.c_trademark_name);
+    NEW.c_image_digest := trademark_image_digest(NEW.c_trademark_image);
+    RETURN NEW;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS c_trademark_digests ON tbl_collect_trademark;
+CREATE TRIGGER c_trademark_digests
+    BEFORE INSERT OR UPDATE OF c_trademark_name, c_trademark_image ON tbl_collect_trademark
+    FOR EACH ROW EXECUTE FUNCTION trg_c_trademark_digests();
+
+DROP TRIGGER IF EXISTS c_trademark_digests ON tbl_infringe_risk;
+CREATE TRIGGER c_trademark_digests
+    BEFORE INSERT OR UPDATE OF c_trademark_name, c_trademark_image ON tbl_infringe_risk
+    FOR EACH ROW EXECUTE FUNCTION trg_c_trademark_digests();
+
+-- 후보 검색 제외 조건: 보호 상표별 (상품명, 상표명 다이제스트) / (상품명, 이미지 다이제스트) 조회
+CREATE INDEX IF NOT EXISTS ix_infringe_risk_name_digest  ON tbl_infringe_risk (p_trademark_reg_no, c_product_name, c_name_digest);
+CREATE INDEX IF NOT EXISTS ix_infringe_risk_image_digest ON tbl_infringe_risk (p_trademark_reg_no, c_product_name, c_image_digest);
+
+-- matrix 엔진 제외 대상 조회 (침해 위험군 -> 수집 상표)
+CREATE INDEX IF NOT EXISTS ix_collect_trademark_name_digest  ON tbl_collect_trademark (c_product_name, c_name_digest);
+CREATE INDEX IF NOT EXISTS ix_collect_trademark_image_digest ON tbl_collect_trademark (c_product_name, c_image_digest);
@@ -0,0 +1,93 @@
+-- 침해 위험군 참조 저장 (db.risk_storage: reference)
+-- 이미지/벡터를 복사하지 않고 c_trademark_no로 tbl_collect_trademark를 참조, 조회는 v_infringe_risk 사용
+-- 적용: psql "$DB_URL" -f migrations/006_infringe_risk_reference.sql
+-- 전제: 005_trademark_digests.sql 적용 (다이제스트 함수/컬럼), 다이제스트 백필(python -m src.tools.backfill digests) 권장
+--       백필이 누락된 행은 아래에서 먼저 다이제스트를 계산하며, 다이제스트가 없는 행은 연결 대상에서 제외
+-- 스키마 변경/기존 행 연결만 수행하며 복사본(이미지, 벡터)은 유지 (risk_storage: copy 에서도 적용 필요)
+-- 참조 저장 전환 후 기존 복사본 제거: python -m src.tools.backfill reference_copies (risk_storage: reference 에서만 실행)
+
+ALTER TABLE tbl_infringe_risk
+    ADD COLUMN IF NOT EXISTS c_trademark_no bigint;   -- 수집 상표 번호 (참조)
+
+CREATE INDEX IF NOT EXISTS ix_infringe_risk_c_trademark_no ON tbl_infringe_risk (c_trademark_no);
+
+-- 참조 저장 행은 이미지가 없으므로 저장 시 전달된 이미지 다이제스트 유지
+CREATE OR REPLACE FUNCTION trg_infringe_risk_digests() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+BEGIN
+    NEW.c_name_digest  := trademark_name_digest(NEW.c_trademark_name);
+    NEW.c_image_digest := coalesce(trademark_image_digest(NEW.c_trademark_image), NEW.c_image_digest);
+    RETURN NEW;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS c_trademark_digests ON tbl_infringe_risk;
+CREATE TRIGGER c_trademark_digests
+    BEFORE INSERT OR UPDATE OF c_trademark_name, c_trademark_image ON tbl_infringe_risk
+    FOR EACH ROW EXECUTE FUNCTION trg_infringe_risk_digests();
+
+-- 기존 행: 백필 누락 다이제스트 계산 (복사본 제거 후에는 다시 계산할 수 없으므로 연결 전에 수행)
+UPDATE tbl_collect_trademark
+   SET c_name_digest  = coalesce(c_name_digest, trademark_name_digest(c_trademark_name)),
+       c_image_digest = coalesce(c_image_digest, trademark_image_digest(c_trademark_image))
+ WHERE (c_name_digest IS NULL AND c_trademark_name IS NOT NULL)
+    OR (c_image_digest IS NULL AND c_trademark_image IS NOT NULL);
+
+UPDATE tbl_infringe_risk
+   SET c_name_digest  = coalesce(c_name_digest, trademark_name_digest(c_trademark_name)),
+       c_image_digest = coalesce(c_image_digest, trademark_image_digest(c_trademark_image))
+ WHERE (c_name_digest IS NULL AND c_trademark_name IS NOT NULL)
+    OR (c_image_digest IS NULL AND c_trademark_image IS NOT NULL);
+
+-- 기존 행: 판매 페이지 URL + 상품명 + 상표명/이미지 다이제스트가 같은 수집 상표와 연결
+-- (다이제스트가 NULL인 행끼리 일치하지 않도록 두 다이제스트 모두 있는 행만 연결)
+UPDATE tbl_infringe_risk r
+   SET c_trademark_no = (SELECT min(a.c_trademark_no)
+                           FROM tbl_collect_trademark a
+                          WHERE a.c_product_page_url = r.c_product_page_url
+                            AND a.c_product_name IS NOT DISTINCT FROM r.c_product_name
+                            AND a.c_name_digest = r.c_name_digest
+                            AND a.c_image_digest = r.c_image_digest)
+ WHERE r.c_trademark_no IS NULL
+   AND r.c_name_digest IS NOT NULL
+   AND r.c_image_digest IS NOT NULL;
+
+-- 조회용 뷰: 복사본이 없으면 참조 수집 상표 값 사용
+CREATE OR REPLACE VIEW v_infringe_risk AS
+SELECT r.risk_no,
+       r.p_trademark_reg_no,
+       r.c_trademark_no,
+       r.c_product_name,
+       r.c_product_page_url,
+       r.c_manufacturer_info,
+       r.c_brand_info,
+       r.c_l_category,
+       r.c_m_category,
+       r.c_s_category,
+       r.c_trademark_type,
+       r.c_trademark_class_code,
+       r.c_trademark_name,
+       coalesce(r.c_trademark_name_vec, a.c_trademark_name_vec)   AS c_trademark_name_vec,
+       coalesce(r.c_trademark_image, a.c_trademark_image)         AS c_trademark_image,
+       coalesce(r.c_trademark_image_vec, a.c_trademark_image_vec) AS c_trademark_image_vec,
+       r.c_trademark_ent_date,
+       r.c_name_digest,
+       r.c_image_digest,
+       r.visual_score,
+       r.visual_weight,
+       r.phonetic_score,
+       r.phonetic_weight,
+       r.conceptual_score,
+       r.conceptual_weight,
+       r.total_score,
+       r.risk_level,
+       r.judge_date,
+       r.visual_raw_score,
+       r.phonetic_raw_score,
+       r.conceptual_raw_score,
+       r.visual_grade,
+       r.phonetic_grade,
+       r.conceptual_grade,
+       r.rescore_date
+  FROM tbl_infringe_risk r
+  LEFT JOIN tbl_collect_trademark a ON a.c_trademark_no = r.c_trademark_no;
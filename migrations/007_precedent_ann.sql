@@ -0,0 +1,13 @@
+-- 판례 검색 ANN 인덱스 + 인용 표현 포함 여부 저장 컬럼 (HML 가중치/인용 감점은 검색 후 재정렬에서 적용)
+-- 적용: psql "$DB_URL" -f migrations/007_precedent_ann.sql
+
+-- 본문 청크의 판결 인용 표현 포함 여부 (재정렬 시 감점 대상)
+ALTER TABLE tbl_precedent
+    ADD COLUMN IF NOT EXISTS content_has_citation boolean
+    GENERATED ALWAYS AS (content ~ '대법원|판결|선고|제[0-9]+조') STORED;
+
+-- 주제별 HNSW 인덱스 (WHERE topic = ... ORDER BY content_vec <=> $1 LIMIT n 조회용)
+CREATE INDEX IF NOT EXISTS ix_precedent_content_vec_legal ON tbl_precedent
+    USING hnsw (content_vec vector_cosine_ops) WHERE topic = '법리';
+CREATE INDEX IF NOT EXISTS ix_precedent_content_vec_fact ON tbl_precedent
+    USING hnsw (content_vec vector_cosine_ops) WHERE topic = '본문';
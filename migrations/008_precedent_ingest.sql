@@ -0,0 +1,11 @@
+-- 웹 검색(법령정보센터) 판례 적재 (precedent.ingest)
+-- 웹 검색으로 조회한 판례를 청크/임베딩하여 tbl_precedent 에 추가, 이후 실행에서는 외부 API 없이 검색
+-- 적용: psql "$DB_URL" -f migrations/008_precedent_ingest.sql (007 적용 이후)
+-- 전제: precedent_no 는 기본값(시퀀스/identity)으로 채번됨
+
+ALTER TABLE tbl_precedent
+    ADD COLUMN IF NOT EXISTS source text NOT NULL DEFAULT 'corpus',   -- corpus: 초기 적재, law_api: 웹 검색 적재
+    ADD COLUMN IF NOT EXISTS source_id text;                          -- 원천 식별자 (법령정보센터 판례일련번호)
+
+-- 적재 전 사건번호 중복 확인용
+CREATE INDEX IF NOT EXISTS ix_precedent_case_id ON tbl_precedent (case_id);
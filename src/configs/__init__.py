@@ -1,4 +1,6 @@
 import os
+import json
+import hashlib
 import yaml
 from jinja2 import Template
 
@@ -11,6 +13,11 @@ def _load_yaml(filename: str) -> dict:
 model_config: dict = _load_yaml('model_config.yaml')
 _prompts_raw: dict = _load_yaml('prompts.yaml')
 
+def model_config_version() -> str:
+    """앙상블 판정에 영향을 주는 risk 설정의 해시 (설정 변경 시 기존 판정 무효화 용도)"""
+    risk_config = json.dumps(model_config.get('risk', {}), sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(risk_config.encode('utf-8')).hexdigest()[:16]
+
 def get_system_prompt(task: str) -> str:
     """system 프롬프트 반환 (정적 텍스트, 렌더링 불필요)"""
     return _prompts_raw['prompts'][task]['system']
@@ -1,9 +1,15 @@
+import asyncio
 import os
 from functools import lru_cache
 from dotenv import load_dotenv
 from langchain_openai import AzureChatOpenAI, AzureOpenAIEmbeddings
 from openai import AsyncOpenAI
 from src.tools.vector_store import VectorStore
+from src.tools.risk_writer import InfringeRiskWriter
+from src.tools.precedent_index import PrecedentIndexLoader
+from src.tools.precedent_ingest import PrecedentIngestor
+from src.tools.web_search import LawApiClient, ResponseCache, SpeculativeWebSearch
+from src.utils.cache import MemoCache
 from src.configs import model_config
 
 # 환경 변수 로드
@@ -17,6 +23,79 @@ class Container:
     def get_vector_store() -> VectorStore:
         return VectorStore()
 
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def get_risk_writer() -> InfringeRiskWriter:
+        db_config = model_config.get('db', {})
+        return InfringeRiskWriter(
+            Container.get_vector_store(),
+            batch_size=int(db_config.get('risk_writer_batch_size', 200)),
+            flush_interval=float(db_config.get('risk_writer_flush_sec', 5.0)),
+        )
+
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def get_reason_trademark_cache() -> MemoCache:
+        risk_config = model_config.get('risk', {})
+        return MemoCache(
+            "거절사유",
+            maxsize=int(risk_config.get('reason_cache_size', 256)),
+            ttl=risk_config.get('reason_cache_ttl_sec'),
+        )
+
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def get_precedent_index() -> PrecedentIndexLoader:
+        index_config = model_config.get('precedent', {}).get('index', {})
+        return PrecedentIndexLoader(
+            Container.get_vector_store(),
+            lexical_weight=float(index_config.get('lexical_weight', 0.3)),
+            k1=float(index_config.get('bm25_k1', 1.5)),
+            b=float(index_config.get('bm25_b', 0.75)),
+        )
+
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def get_query_memo() -> MemoCache:
+        memo_config = model_config.get('precedent', {}).get('memo', {})
+        return MemoCache("판례쿼리", maxsize=int(memo_config.get('size', 512)), ttl=memo_config.get('ttl_sec'))
+
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def get_grading_memo() -> MemoCache:
+        memo_config = model_config.get('precedent', {}).get('memo', {})
+        return MemoCache("판례검증", maxsize=int(memo_config.get('size', 512)), ttl=memo_config.get('ttl_sec'))
+
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def get_law_api_client() -> LawApiClient:
+        web_config = model_config.get('web_search', {})
+        cache_path = web_config.get('cache_path')
+        return LawApiClient(
+            max_connections=int(web_config.get('max_connections', 20)),
+            max_per_host=int(web_config.get('max_per_host', 4)),
+            timeout=float(web_config.get('timeout_sec', 15)),
+            cache=ResponseCache(cache_path) if cache_path else None,
+            list_cache_ttl=float(web_config.get('list_cache_ttl_sec', 86400)),
+            detail_cache_ttl=float(web_config.get('detail_cache_ttl_sec', 2592000)),
+        )
+
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def get_speculative_web_search() -> SpeculativeWebSearch:
+        return SpeculativeWebSearch(Container.get_law_api_client())
+
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def get_precedent_ingestor() -> PrecedentIngestor:
+        ingest_config = model_config.get('precedent', {}).get('ingest', {})
+        return PrecedentIngestor(
+            Container.get_vector_store(),
+            Container.get_text_embedding_model(),
+            chunk_chars=int(ingest_config.get('chunk_chars', 800)),
+            overlap=int(ingest_config.get('chunk_overlap', 100)),
+        )
+
     @staticmethod
     @lru_cache(maxsize=1)
     def get_gpt51_chat() -> AzureChatOpenAI:
@@ -57,6 +136,13 @@ class Container:
             base_url=os.getenv("VLLM_API_URL")
         )
 
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def get_vllm_semaphore() -> asyncio.Semaphore:
+        """vLLM 동시 요청 상한 (실행 전체 공유)"""
+        qwen_config = model_config.get('models', {}).get('qwen_reporter', {})
+        return asyncio.Semaphore(max(1, int(qwen_config.get('max_concurrency', 8))))
+
     @staticmethod
     @lru_cache(maxsize=1)
     def get_text_embedding_model() -> AzureOpenAIEmbeddings:
@@ -1,6 +1,7 @@
 from typing import Dict, Any
 from src.graph.state import GraphState
-from src.services.visual_scoring import calculate_visual_similarity
+from src.services.visual_scoring import calculate_visual_similarity, is_near_duplicate_image
+from src.configs import model_config
 from src.services.phonetic_scoring import calculate_phonetic_similarity
 from src.services.conceptual_scoring import calculate_conceptual_similarity
 from src.services.ensemble import calculate_risk
@@ -17,6 +18,12 @@ def visual_similarity(state: GraphState) -> Dict[str, Any]:
         
         logger.info(f"[시각적 유사도] 분석 시작: {p_tm.p_trademark_name} vs {c_tm.c_trademark_name}")
         
+        # 근사 동일 이미지 (재인코딩/크롭) Fast Path
+        if is_near_duplicate_image(p_tm, c_tm):
+            score = model_config.get('image_hash').get('visual_score')
+            logger.info(f"[시각적 유사도] 근사 동일 이미지 판정: 점수={score:.4f}")
+            return {"visual_similarity_score": score}
+        
         score = calculate_visual_similarity(
             p_tm.p_trademark_image_vec, 
             c_tm.c_trademark_image_vec
@@ -54,6 +61,14 @@ def conceptual_similarity(state: GraphState) -> Dict[str, Any]:
         
         logger.info(f"[관념적 유사도] 분석 시작: {p_tm.p_trademark_name} vs {c_tm.c_trademark_name}")
         
+        # 근사 동일 이미지 (재인코딩/크롭) Fast Path: Vision 캡셔닝 생략
+        if is_near_duplicate_image(p_tm, c_tm):
+            hash_config = model_config.get('image_hash')
+            score = hash_config.get('conceptual_score')
+            logger.info(f"[관념적 유사도] 근사 동일 이미지 판정 (캡셔닝 생략): 점수={score:.4f}")
+            # 묘사문 대신 동일 이미지임을 명시 (앙상블 쿼리 생성/식별 평가 프롬프트의 sem_desc)
+            return {"conceptual_similarity_score": score, "conceptual_description": hash_config.get('conceptual_description', '')}
+        
         dict_result = calculate_conceptual_similarity(p_tm, c_tm)
         
         score = dict_result.get("score", 0.0)
@@ -104,7 +119,7 @@ async def ensemble_model(state: GraphState) -> Dict[str, Any]:
 async def save_infringe_risk_node(state: GraphState) -> Dict[str, Any]:
     """위험군 저장 노드"""
     try:
-        vector_store = Container.get_vector_store()
+        risk_writer = Container.get_risk_writer()
         
         # 앙상블 모델 결과
         ensemble_result = state.get("ensemble_result")
@@ -118,17 +133,19 @@ async def save_infringe_risk_node(state: GraphState) -> Dict[str, Any]:
         
         # 결과 재검증
         if risk_level in ["H", "M", "L"]:
-            # 수집 상표 정보, 앙상블 모델 결과, 보호 상표 번호
-            risk_data = {
-                "c_tm": state["current_collected_trademark"],
-                "ensemble_result": state["ensemble_result"],
-                "p_trademark_reg_no": p_trademark_reg_no
-            }
+            # 처리중인 수집 상표 + 동일 (상표명, 이미지) 수집 상표 모두 저장
+            c_tm_list = [state["current_collected_trademark"], *state.get("duplicate_trademarks", [])]
             
-            # INSERT tbl_infringe_risk 
-            logger.info("[위험군 저장] DB 저장 시작")
-            await vector_store.save_infringe_risk(risk_data)
-            logger.info("[위험군 저장] 완료")
+            # INSERT tbl_infringe_risk (버퍼 적재 후 일괄 저장)
+            logger.info(f"[위험군 저장] 저장 버퍼 적재 ({len(c_tm_list)}건)")
+            for c_tm in c_tm_list:
+                # 수집 상표 정보, 앙상블 모델 결과, 보호 상표 번호
+                risk_data = {
+                    "c_tm": c_tm,
+                    "ensemble_result": state["ensemble_result"],
+                    "p_trademark_reg_no": p_trademark_reg_no
+                }
+                await risk_writer.add(risk_data)
         else:
             logger.info("[위험군 저장] 조건 미달로 저장하지 않음")
         
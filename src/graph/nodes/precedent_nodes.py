@@ -1,7 +1,10 @@
 from typing import Dict, Any
 from src.graph.state import GraphState
 from src.utils.logger import get_logger
-from src.services.precedent import generate_query, retrieve_precedents, grade_precedents
+from src.configs import model_config
+from src.container import Container
+from src.graph.nodes.web_search_nodes import speculation_key
+from src.services.precedent import generate_query, retrieve_precedents, prefilter_precedents, grade_precedents, precedent_memo_key
 
 logger = get_logger(__name__)
 
@@ -25,7 +28,8 @@ def generate_query_node(state: GraphState) -> Dict[str, Any]:
                        state["protection_trademark"].p_product_kinds,
                        state["ensemble_result"].visual_description,
                        weights,
-                       scores)
+                       scores,
+                       memo_key=precedent_memo_key(state, state.get("rewrite_count", 0)))
         
         queries = query_json.get("queries", [])
         logger.info(f"[판례 검색 쿼리] 생성 완료: {len(queries)}개 ({', '.join(queries[:3])}...)")
@@ -58,7 +62,39 @@ async def retrieve_precedents_node(state: GraphState) -> Dict[str, Any]:
         logger.error(f"[판례 검색] 오류 발생: {e}", exc_info=True)
         return {"retrieved_precedents": []}
 
-def grade_precedents_node(state: GraphState) -> Dict[str, Any]:
+def prefilter_precedents_node(state: GraphState) -> Dict[str, Any]:
+    """판례 사전 필터 노드 (LLM 검증 전 로컬 점수로 상위 K건 선별)"""
+    try:
+        precedents = prefilter_precedents(state)
+        return {"retrieved_precedents": precedents}
+    except Exception as e:
+        logger.error(f"[판례 사전 필터] 오류 발생 (필터 없이 진행): {e}", exc_info=True)
+        return {}
+
+def _start_speculative_web_search(state: GraphState) -> bool:
+    """
+    판례 검색 결과가 빈약하면(건수 min_hits 미만 또는 최고 검색 유사도 원점수(HML/인용 보정 전) min_score 미만) 투기 웹 검색 시작
+    - retrieve_precedents 직후 첫 검증(web_search_count == 0)에서만 시작 (웹 검색 결과 재검증 시 미시작)
+    - 키워드: 첫 번째 검색 쿼리 (없으면 보호상표명), grade_precedents 의 0건 분기와 동일
+    """
+    precedent_config = model_config.get('precedent', {})
+    speculative_config = precedent_config.get('speculative_web_search', {})
+    if not speculative_config.get('enabled', False):
+        return False
+    if state.get("web_search_count", 0) > 0 or precedent_config.get("max_web_search_count", 3) <= 0:
+        return False
+    
+    precedents = state.get("retrieved_precedents", [])
+    top_score = max((p.retrieval_score for p in precedents if p.retrieval_score is not None), default=0.0)
+    if len(precedents) >= speculative_config.get('min_hits', 5) and top_score >= speculative_config.get('min_score', 0.5):
+        return False
+    
+    queries = state.get("search_querys", [])
+    keywords = [queries[0]] if queries else [state["protection_trademark"].p_trademark_name]
+    logger.info(f"[판례 검증] 검색 결과 빈약 ({len(precedents)}건, 최고 점수 {top_score:.2f}) -> 투기 웹 검색")
+    return Container.get_speculative_web_search().start(speculation_key(state), keywords)
+
+async def grade_precedents_node(state: GraphState) -> Dict[str, Any]:
     """판례 검증 노드 (Agentic 하지 않은 구조화된 검증)"""
     try:
         logger.info("[판례 검증] 적합성 평가 시작")
@@ -66,7 +102,10 @@ def grade_precedents_node(state: GraphState) -> Dict[str, Any]:
         rewrite_count = state.get("rewrite_count", 0)
         web_search_count = state.get("web_search_count", 0)
         
-        grade_precedents_result = grade_precedents(state)
+        # 검색 결과가 빈약하면 검증과 병렬로 웹 검색 미리 시작
+        speculating = _start_speculative_web_search(state)
+        
+        grade_precedents_result = await grade_precedents(state)
         
         # 검증 결과
         refined = grade_precedents_result.get("refined_precedents", [])
@@ -94,8 +133,13 @@ def grade_precedents_node(state: GraphState) -> Dict[str, Any]:
             return_dict["web_search_count"] = web_search_count + 1
             return_dict["web_search_keywords"] = web_search_keywords
             logger.info(f"   ↪ 웹 검색 카운트 증가 ({web_search_count} -> {return_dict['web_search_count']})")
+        
+        # web_search 로 분기하지 않으면 투기 검색 취소 (web_search_node 에서 회수)
+        if speculating and grading_decision != "web_search":
+            Container.get_speculative_web_search().cancel(speculation_key(state))
             
         return return_dict
     except Exception as e:
+        Container.get_speculative_web_search().cancel(speculation_key(state))
         logger.error(f"[판례 검증] 오류 발생: {e}", exc_info=True)
         return {"grading_decision": "approved", "refined_precedents": []} # Fail-safe
@@ -1,8 +1,11 @@
 from typing import Dict, Any
 from src.graph.state import GraphState
+from src.configs import model_config
 from src.utils.format import extract_common_context, extract_precedent_context
 from src.utils.logger import get_logger
-from src.services.report import generate_report, evaluate_report
+from src.services.report import (
+    generate_report, evaluate_report, generate_report_candidates, evaluate_report_candidates, select_best_report,
+)
 
 logger = get_logger(__name__)
 
@@ -17,11 +20,21 @@ async def generate_report_node(state: GraphState) -> Dict[str, Any]:
         # 컨텍스트 조립 (refined_precedents가 있으면 우선 사용)
         context = {**extract_common_context(state), **extract_precedent_context(state, use_refined=True)}
         
-        cleaned_content = generate_report(context)
+        # Best-of-N: 첫 생성에서만 후보 N개 생성 (모두 미달 시 이후 재생성은 기존 1건 루프)
+        sampling = model_config.get('report_sampling', {})
+        n = int(sampling.get('n', 1))
+        if sampling.get('enabled', False) and n > 1 and state.get("regeneration_count", 0) == 0:
+            candidates = await generate_report_candidates(
+                context, n, use_n_param=sampling.get('use_n_param', True), temperature=sampling.get('temperature'),
+            )
+            logger.info(f"[보고서 생성] 후보 {len(candidates)}건 완료: {[len(c) for c in candidates]}자")
+            return {"report_content": candidates[0], "report_candidates": candidates}
+        
+        cleaned_content = await generate_report(context)
         
         logger.info(f"[보고서 생성] 완료: {len(cleaned_content)}자")
         
-        return {"report_content": cleaned_content}
+        return {"report_content": cleaned_content, "report_candidates": []}
         
     except Exception as e:
         logger.error(f"[보고서 생성] 오류 발생: {e}", exc_info=True)
@@ -39,7 +52,18 @@ async def evaluate_report_node(state: GraphState) -> Dict[str, Any]:
         # 평가용 컨텍스트: 원본 데이터 + 생성된 보고서
         context = {**extract_common_context(state), **extract_precedent_context(state, use_refined=True)}
         
-        result = evaluate_report(context, report_content)
+        # Best-of-N 후보가 있으면 동시 평가 후 통과 후보 중 최고점 선택 (모두 미달 시 최고점 후보로 재생성 분기)
+        candidates = state.get("report_candidates") or []
+        if len(candidates) > 1:
+            threshold = model_config.get('retry', {}).get('report_evaluation_threshold')
+            evaluations = await evaluate_report_candidates(context, candidates)
+            best = select_best_report(evaluations, threshold)
+            if best is None:
+                raise RuntimeError(f"후보 보고서 {len(candidates)}건 평가 모두 실패")
+            report_content, result = candidates[best], evaluations[best]
+            logger.info(f"[보고서 평가] 후보 {len(candidates)}건 중 #{best} 선택 | 점수: {[e.score if e else None for e in evaluations]}")
+        else:
+            result = await evaluate_report(context, report_content)
                       
         logger.info(f"[보고서 평가] 결과: {result.decision} (점수: {result.score})")
         logger.info(f"피드백: {result.feedback}")
@@ -50,6 +74,8 @@ async def evaluate_report_node(state: GraphState) -> Dict[str, Any]:
             logger.info(f"보고서 재생성 카운트 증가 ({regeneration_count-1} -> {regeneration_count})")
         
         return {
+            "report_content": report_content,
+            "report_candidates": [],
             "evaluation_score": result.score,
             "evaluation_feedback": result.feedback,
             "evaluation_decision": result.decision,
@@ -58,6 +84,7 @@ async def evaluate_report_node(state: GraphState) -> Dict[str, Any]:
     except Exception as e:
         logger.error(f"[보고서 평가] 오류 발생: {e}", exc_info=True)
         return {
+            "report_candidates": [],
             "evaluation_score": 0.0,
             "evaluation_decision": "regenerate",
             "evaluation_feedback": "Error parsing output"
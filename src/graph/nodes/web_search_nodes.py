@@ -1,5 +1,4 @@
 import asyncio
-import aiohttp
 import re
 import os
 from typing import List, Dict, Any, Optional
@@ -7,10 +6,16 @@ from src.model.schema import Precedent
 from src.graph.state import GraphState
 from src.configs import model_config
 from src.utils.logger import get_logger
-from src.tools.web_search import fetch_precedent_list, fetch_precedent_detail
+from src.utils.format import score_to_hml
+from src.tools.web_search import search_precedents
+from src.container import Container
 
 logger = get_logger(__name__)
 
+def speculation_key(state: GraphState):
+    """투기 웹 검색 키 (보호상표 - 수집상표 쌍)"""
+    return (state["protection_trademark"].p_trademark_reg_no, state["current_collected_trademark"].c_trademark_no)
+
 async def web_search_node(state: GraphState) -> Dict[str, Any]:
     """
     웹 검색 노드 (법령정보센터 API 연동)
@@ -23,6 +28,7 @@ async def web_search_node(state: GraphState) -> Dict[str, Any]:
         # 키워드가 없으면 기존 쿼리를 fallback으로 사용하거나 빈 리스트 처리
         if not keywords:
             logger.warning("[웹 검색] 검색 키워드가 없어 검색을 건너뜁니다.")
+            Container.get_speculative_web_search().cancel(speculation_key(state))
             return {
                 "retrieved_precedents": [],
                 "web_search_count": web_search_count + 1
@@ -30,27 +36,27 @@ async def web_search_node(state: GraphState) -> Dict[str, Any]:
         
         logger.info(f"[웹 검색] 시작: 키워드={keywords} (시도 {web_search_count + 1}회)")
         
-        async with aiohttp.ClientSession() as session:
-            # 판례 목록 조회
-            prec_ids = await fetch_precedent_list(session, keywords)
-            
-            if not prec_ids:
-                logger.info("[웹 검색] 외부 API에서 판례를 찾지 못했습니다.")
-                return {
-                    "retrieved_precedents": [],
-                    "web_search_count": web_search_count + 1
-                }
-                
-            # 판례 본문 조회 (병렬 처리)
-            logger.info(f"[웹 검색] 상세 본문 조회 시작 ({len(prec_ids)}건)")
-            tasks = [fetch_precedent_detail(session, pid) for pid in prec_ids]
-            results = await asyncio.gather(*tasks)
-                    
-            # None 제외 및 유효한 결과만 필터링
-            precedents = [r for r in results if r is not None]
+        # 판례 검증과 병렬로 시작한 투기 검색 결과가 있으면 사용
+        speculative_config = model_config.get('precedent', {}).get('speculative_web_search', {})
+        precedents = await Container.get_speculative_web_search().take(
+            speculation_key(state), keywords,
+            reuse_on_mismatch=speculative_config.get('reuse_on_keyword_mismatch', False),
+        )
+        
+        if precedents is None:
+            precedents = await search_precedents(Container.get_law_api_client(), keywords)
             
         logger.info(f"[웹 검색] 완료: 유효한 판례 {len(precedents)}건 확보")
         
+        # 웹 검색 판례 로컬 적재 (백그라운드, 이후 실행에서는 DB 검색으로 조회)
+        if precedents and model_config.get('precedent', {}).get('ingest', {}).get('enabled', False):
+            scores = {
+                "visual": state["visual_similarity_score"],
+                "phonetic": state["phonetic_similarity_score"],
+                "conceptual": state["conceptual_similarity_score"],
+            }
+            Container.get_precedent_ingestor().submit(precedents, score_to_hml(scores))
+        
         # 검색 결과 반환하여, 다시 판례 검증 노드로 라우팅
         return {
             "retrieved_precedents": precedents,
@@ -7,6 +7,7 @@ class GraphState(TypedDict):
     protection_trademark: ProtectionTrademarkInfo       # 보호 상표
     collected_trademarks: List[CollectedTrademarkInfo]  # 수집 상표 리스트
     current_collected_trademark: CollectedTrademarkInfo # 처리중인 수집 상표 정보
+    duplicate_trademarks: List[CollectedTrademarkInfo]  # 처리중인 수집 상표와 동일한 (상표명, 이미지) 수집 상표 (결과 공유)
     
     # 모델 점수 및 가중치
     visual_similarity_score : float                     # 시각
@@ -30,6 +31,7 @@ class GraphState(TypedDict):
     
     # 보고서 관련
     report_content: str                                 # 보고서 내용
+    report_candidates: List[str]                        # Best-of-N 후보 보고서 (평가 후 비움)
     evaluation_score: float                             # 보고서 평가 점수
     evaluation_feedback: str                            # 보고서 평가 피드백
     evaluation_decision: str                            # 보고서 평가 결정 (approved, regenerate, rewrite_all)
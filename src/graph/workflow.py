@@ -5,7 +5,7 @@ from src.configs import model_config
 
 from src.graph.nodes.model_nodes import visual_similarity, phonetic_similarity, conceptual_similarity, ensemble_model, save_infringe_risk_node
 from src.graph.nodes.web_search_nodes import web_search_node
-from src.graph.nodes.precedent_nodes import generate_query_node, grade_precedents_node , retrieve_precedents_node
+from src.graph.nodes.precedent_nodes import generate_query_node, grade_precedents_node , retrieve_precedents_node, prefilter_precedents_node
 from src.graph.nodes.report_nodes import generate_report_node, evaluate_report_node
 
 
@@ -93,9 +93,10 @@ workflow.add_node("ensemble_model", ensemble_model)
 # 침해 위험 상표 저장
 workflow.add_node("save_risk", save_infringe_risk_node)
 
-# 판례 검색 Query 생성, 판례 검색, 판례 검증, 웹 검색
+# 판례 검색 Query 생성, 판례 검색, 판례 사전 필터, 판례 검증, 웹 검색
 workflow.add_node("generate_query", generate_query_node)
 workflow.add_node("retrieve_precedents", retrieve_precedents_node)
+workflow.add_node("prefilter_precedents", prefilter_precedents_node)
 workflow.add_node("grade_precedents", grade_precedents_node )
 workflow.add_node("web_search", web_search_node)
 
@@ -131,8 +132,9 @@ workflow.add_edge("save_risk", "generate_query")
 # 판례 검색 Query 생성 -> 판례 검색
 workflow.add_edge("generate_query", "retrieve_precedents")
 
-# 판례 검색 -> 판례 검증
-workflow.add_edge("retrieve_precedents", "grade_precedents")
+# 판례 검색 -> 판례 사전 필터 -> 판례 검증
+workflow.add_edge("retrieve_precedents", "prefilter_precedents")
+workflow.add_edge("prefilter_precedents", "grade_precedents")
 
 # 판례 검증 -> 보고서 생성, 판례 검색 Query 생성, 웹 검색 분기
 workflow.add_conditional_edges(
@@ -1,16 +1,101 @@
 import asyncio
 import os
+from typing import List, Optional, Tuple
 from dotenv import load_dotenv
 from src.graph.state import GraphState
 from src.utils.db import Database
 from src.container import Container
+from src.configs import model_config
 from src.graph.workflow import app
 from src.utils.logger import get_logger
 from src.services.send_mail import send_report_mail
+from src.services.dedup import cluster_collected_trademarks
 from src.model.schema import ApprovedReport, ProtectionTrademarkInfo, CollectedTrademarkInfo
 
 logger = get_logger(__name__)
 
+async def process_cluster(
+    p_tm: ProtectionTrademarkInfo,
+    c_tm_list: List[CollectedTrademarkInfo],
+    cluster: List[CollectedTrademarkInfo],
+    vector_store,
+) -> Tuple[Optional[ApprovedReport], int]:
+    """클러스터 대표 상표 1건 Graph 실행 -> (승인 보고서 또는 None, 처리 건수)"""
+    c_tm, duplicates = cluster[0], cluster[1:]
+    
+    # 수집 상표명
+    c_tm_name = c_tm.c_trademark_name
+    logger.info(f"  후보 상표 분석 시작: {c_tm_name}" + (f" (동일 상표 {len(duplicates)}건 포함)" if duplicates else ""))
+
+    # LangGraph State 구성
+    initial_state: GraphState = {
+        "protection_trademark": p_tm,
+        "collected_trademarks": c_tm_list,
+        "current_collected_trademark": c_tm,
+        "duplicate_trademarks": duplicates,
+        "visual_similarity_score": 0.0,
+        "visual_weight": 0.0,
+        "phonetic_similarity_score": 0.0,
+        "phonetic_weight": 0.0,
+        "conceptual_similarity_score": 0.0,
+        "conceptual_weight": 0.0,
+        "conceptual_description": "",
+        "ensemble_result": None,
+        "search_querys": [],
+        "retrieved_precedents": [],
+        "refined_precedents": [],
+        "grading_decision": "",
+        "query_feedback": "",
+        "web_search_keywords": [],
+        "is_precedent_exists": False,
+        "report_content": "",
+        "report_candidates": [],
+        "evaluation_score": 0.0,
+        "evaluation_feedback": "",
+        "evaluation_decision": "",
+        "rewrite_count": 0,
+        "web_search_count": 0,
+        "regeneration_count": 0,
+        "is_infringement_found": False
+    }
+
+    # Graph 비동기 실행
+    try:
+        result = await app.ainvoke(initial_state)
+
+        is_infringement = result.get("is_infringement_found", False)
+        ensemble_result = result.get("ensemble_result")
+        risk_level = ensemble_result.risk_level if ensemble_result else "N/A"
+
+        # 판정 이력 저장 (Safe 판정 쌍도 유효 기간 동안 재분석 제외, Fail-safe 결과는 저장하지 않음)
+        if ensemble_result and ensemble_result.visual_raw_score is not None and model_config.get("verdict", {}).get("enabled", False):
+            for member in cluster:
+                await vector_store.save_pair_verdict(p_tm.p_trademark_reg_no, member, ensemble_result)
+
+        status_icon = "🚨" if is_infringement else "✅"
+        logger.info(f"  {status_icon} [{c_tm_name}] 분석 결과: 침해여부={is_infringement}, 위험등급={risk_level}")
+
+        # 보고서 승인 시 반환하여 보호 상표 단위로 누적 (메일 발송은 전체 클러스터 완료 후)
+        approved_report = None
+        evaluation_decision = result.get("evaluation_decision", "")
+        if evaluation_decision == "approved":
+            c_tm_info = result.get("current_collected_trademark")
+
+            approved_report = ApprovedReport(
+                c_trademark_name=c_tm_info.c_trademark_name,
+                c_trademark_image=c_tm_info.c_trademark_image,
+                report_content=result.get("report_content", ""),
+                risk_level=risk_level,
+                total_score=ensemble_result.total_score if ensemble_result else 0.0,
+                duplicate_page_urls=[d.c_product_page_url for d in duplicates]
+            )
+        
+        return approved_report, len(cluster)
+        
+    except Exception as e:
+        logger.error(f"      ❌ {c_tm_name} 처리 중 오류 발생: {e}", exc_info=True)
+        return None, 0
+
 async def main():
     """
     TIP 프로젝트 메인 실행 스크립트 (Azure Container Job 진입점)
@@ -38,7 +123,13 @@ async def main():
 
         logger.info(f"유사 상표 후보가 있는 보호 상표 {len(target_groups)}개를 찾았습니다.")
 
-        # 배치 루프 실행
+        # 배치 루프 실행 (보호 상표 단위 순차, 보호 상표 내 클러스터는 pair_concurrency 개까지 동시 실행)
+        pair_concurrency = max(1, int(model_config.get("pipeline", {}).get("pair_concurrency", 1)))
+        pair_semaphore = asyncio.Semaphore(pair_concurrency)
+        
+        async def run_limited(p_tm, c_tm_list, cluster):
+            async with pair_semaphore:
+                return await process_cluster(p_tm, c_tm_list, cluster, vector_store)
         
         for group in target_groups:
             p_tm = group["protection_trademark"]        # 보호 상표 1개 정보
@@ -62,71 +153,15 @@ async def main():
             # 보고서 누적 리스트 초기화 (보호 상표 단위)
             approved_reports: list[ApprovedReport] = []
             
-            # 수집 상표 N개를 하나씩 순회하며 Graph 실행 (1:1 비교 컨텍스트)
-            for c_tm in c_tm_list:
-                
-                # 수집 상표명
-                c_tm_name = c_tm.c_trademark_name
-                logger.info(f"  후보 상표 분석 시작: {c_tm_name}")
-                
-                # LangGraph State 구성
-                initial_state: GraphState = {
-                    "protection_trademark": p_tm,
-                    "collected_trademarks": c_tm_list,
-                    "current_collected_trademark": c_tm,
-                    "visual_similarity_score": 0.0,
-                    "visual_weight": 0.0,
-                    "phonetic_similarity_score": 0.0,
-                    "phonetic_weight": 0.0,
-                    "conceptual_similarity_score": 0.0,
-                    "conceptual_weight": 0.0,
-                    "conceptual_description": "",
-                    "ensemble_result": None,
-                    "search_querys": [],
-                    "retrieved_precedents": [],
-                    "refined_precedents": [],
-                    "grading_decision": "",
-                    "query_feedback": "",
-                    "web_search_keywords": [],
-                    "is_precedent_exists": False,
-                    "report_content": "",
-                    "evaluation_score": 0.0,
-                    "evaluation_feedback": "",
-                    "evaluation_decision": "",
-                    "rewrite_count": 0,
-                    "web_search_count": 0,
-                    "regeneration_count": 0,
-                    "is_infringement_found": False
-                }
-                
-                # Graph 비동기 실행
-                try:
-                    result = await app.ainvoke(initial_state)
-                    
-                    is_infringement = result.get("is_infringement_found", False)
-                    ensemble_result = result.get("ensemble_result")
-                    risk_level = ensemble_result.risk_level if ensemble_result else "N/A"
-                    
-                    status_icon = "🚨" if is_infringement else "✅"
-                    logger.info(f"  {status_icon} [{c_tm_name}] 분석 결과: 침해여부={is_infringement}, 위험등급={risk_level}")
-                    
-                    # 보고서 승인 시 리스트에 누적 (메일 발송은 루프 종료 후)
-                    evaluation_decision = result.get("evaluation_decision", "")
-                    if evaluation_decision == "approved":
-                        c_tm_info = result.get("current_collected_trademark")
-                        
-                        approved_reports.append(ApprovedReport(
-                            c_trademark_name=c_tm_info.c_trademark_name,
-                            c_trademark_image=c_tm_info.c_trademark_image,
-                            report_content=result.get("report_content", ""),
-                            risk_level=risk_level,
-                            total_score=ensemble_result.total_score if ensemble_result else 0.0
-                        ))
-                    
-                    total_processed += 1
-                    
-                except Exception as e:
-                    logger.error(f"      ❌ {c_tm_name} 처리 중 오류 발생: {e}", exc_info=True)
+            # 동일 (상표명, 이미지) 수집 상표는 클러스터로 묶어 대표 상표 1건만 Graph 실행
+            clusters = cluster_collected_trademarks(c_tm_list)
+            
+            # 클러스터 대표 상표별 Graph 실행 (1:1 비교 컨텍스트, 결과는 클러스터 순서 유지)
+            results = await asyncio.gather(*(run_limited(p_tm, c_tm_list, cluster) for cluster in clusters))
+            for approved_report, processed in results:
+                total_processed += processed
+                if approved_report is not None:
+                    approved_reports.append(approved_report)
             
             # 수집 상표 N개 처리 완료 후, 승인된 보고서가 있으면 메일 발송
             if approved_reports:
@@ -147,7 +182,15 @@ async def main():
         raise e
         
     finally:
-        # 6. 리소스 정리
+        # 6. 리소스 정리 (버퍼에 남은 위험군 저장, 웹 검색 판례 적재 대기, 웹 검색 세션 및 DB 연결 종료)
+        failed_risks = await Container.get_risk_writer().close()
+        if failed_risks:
+            logger.error(f"❌ 위험군 저장 실패 {len(failed_risks)}건")
+            for failed in failed_risks:
+                logger.error(f"   - {failed['p_trademark_reg_no']} / {failed['c_trademark_name']} (c_trademark_no={failed['c_trademark_no']}): {failed['error']}")
+        
+        await Container.get_precedent_ingestor().close()
+        await Container.get_law_api_client().close()
         await Database.close()
         logger.info(f"🏁 작업 종료. 총 처리 건수: {total_processed}")
 
@@ -12,6 +12,7 @@ class ProtectionTrademarkInfo(BaseModel):
     p_trademark_image_vec : list[float]
     p_trademark_user_no : int
     p_product_kinds : str
+    p_trademark_dhash : Optional[int] = None    # 이미지 지각 해시 (dHash)
 
 class CollectedTrademarkInfo(BaseModel):
     """수집 상표 정보"""
@@ -30,6 +31,7 @@ class CollectedTrademarkInfo(BaseModel):
     c_trademark_image : str
     c_trademark_image_vec : list[float]
     c_trademark_ent_date : datetime
+    c_trademark_dhash : Optional[int] = None    # 이미지 지각 해시 (dHash)
     
 
 class InfringementRisk(BaseModel):
@@ -44,6 +46,13 @@ class InfringementRisk(BaseModel):
     risk_level: str
     risk_level_ko: str
     visual_description: str
+    # 재채점용 원본 점수 (보정 전) 및 식별력 등급 (1~5)
+    visual_raw_score: Optional[float] = None
+    phonetic_raw_score: Optional[float] = None
+    conceptual_raw_score: Optional[float] = None
+    visual_grade: Optional[int] = None
+    phonetic_grade: Optional[int] = None
+    conceptual_grade: Optional[int] = None
 
 class ReasonTrademark(BaseModel):
     """거절 사유 정보"""
@@ -61,6 +70,9 @@ class Precedent(BaseModel):
     start_page : str | None = None
     content: str
     is_relevant: bool # 적합성 여부
+    score: Optional[float] = None # 검색/사전 필터 점수 (높을수록 관련)
+    retrieval_score: Optional[float] = None # 검색 유사도 원점수 (HML 가중/인용 감점 전, 사전 필터가 score 를 갱신해도 유지)
+    topic: Optional[str] = None # 판례 주제 (법리/본문), 웹 검색 판례 적재 시 사용
     
     
 class EvaluationResult(BaseModel):
@@ -76,6 +88,7 @@ class ApprovedReport(BaseModel):
     report_content: str         # 보고서 내용
     risk_level: str             # 위험도 (H, M)
     total_score: float          # 종합 점수
+    duplicate_page_urls: List[str] = []  # 동일 상표 (상표명, 이미지) 판매 페이지 URL
 
 class JudgeDecision(BaseModel):
     """판례 적합성 판단 및 후속 작업 결정 모델"""
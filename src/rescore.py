@@ -0,0 +1,116 @@
+import argparse
+import asyncio
+from collections import Counter
+from typing import Any, Dict, List, Optional
+import yaml
+from src.utils.db import Database
+from src.container import Container
+from src.services.ensemble import compute_ensemble_score
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+def rescore_rows(rows: List[Dict[str, Any]], risk_config: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    """
+    저장된 원본 점수 + 식별력 등급으로 총점/위험도를 재계산
+    - 변경된 행만 반환 (이전 값은 prev_total_score, prev_risk_level에 보존)
+    """
+    changed = []
+
+    for row in rows:
+        ensemble_scores = compute_ensemble_score(
+            {
+                "visual": row["visual_raw_score"],
+                "phonetic": row["phonetic_raw_score"],
+                "semantic": row["conceptual_raw_score"],
+            },
+            {
+                "visual": row["visual_grade"] if row["visual_grade"] is not None else 3,
+                "phonetic": row["phonetic_grade"] if row["phonetic_grade"] is not None else 3,
+                "semantic": row["conceptual_grade"] if row["conceptual_grade"] is not None else 3,
+            },
+            risk_config,
+        )
+
+        total_score = ensemble_scores["total_score"]
+        risk_level = ensemble_scores["risk_level"]
+
+        if round(row["total_score"] or 0.0, 4) == total_score and row["risk_level"] == risk_level:
+            continue
+
+        calibrated = ensemble_scores["calibrated_scores"]
+        weights = ensemble_scores["weights"]
+        changed.append({
+            "risk_no": row["risk_no"],
+            "p_trademark_reg_no": row["p_trademark_reg_no"],
+            "c_trademark_name": row["c_trademark_name"],
+            "visual_score": calibrated["visual"],
+            "visual_weight": weights["visual"],
+            "phonetic_score": calibrated["phonetic"],
+            "phonetic_weight": weights["phonetic"],
+            "conceptual_score": calibrated["semantic"],
+            "conceptual_weight": weights["semantic"],
+            "total_score": total_score,
+            "risk_level": risk_level,
+            "prev_total_score": row["total_score"],
+            "prev_risk_level": row["risk_level"],
+        })
+
+    return changed
+
+def _load_risk_config(config_path: Optional[str]) -> Optional[Dict[str, Any]]:
+    """--config 지정 시 해당 YAML의 risk 설정 사용 (미지정 시 model_config.yaml)"""
+    if not config_path:
+        return None
+    with open(config_path, 'r', encoding='utf-8') as f:
+        return yaml.safe_load(f).get("risk")
+
+async def main(apply: bool = False, config_path: Optional[str] = None, show: int = 20):
+    """
+    위험군 재채점 스크립트 (LLM 호출 없음)
+    1. tbl_infringe_risk의 원본 유사도 점수 + 식별력 등급 조회
+    2. 현재 risk 설정(anchors, grade_weight, risk_threshold)으로 총점/위험도 재계산
+    3. 변경 내역 리포트, --apply 시 DB 반영
+    """
+    await Database.get_pool()
+    vector_store = Container.get_vector_store()
+
+    try:
+        risk_config = _load_risk_config(config_path)
+        rows = await vector_store.fetch_rescore_targets()
+
+        if not rows:
+            logger.info("재채점 대상이 없습니다. (원본 점수 미저장 데이터는 제외)")
+            return
+
+        changed = rescore_rows(rows, risk_config)
+
+        # 위험도 전이 요약 (예: M -> H)
+        transitions = Counter(f"{r['prev_risk_level']} -> {r['risk_level']}" for r in changed)
+        logger.info(f"재채점 결과: 전체 {len(rows)}건 중 {len(changed)}건 변경")
+        for transition, count in transitions.most_common():
+            logger.info(f" - {transition}: {count}건")
+
+        # 총점 변화가 큰 순으로 상위 N건 출력
+        for r in sorted(changed, key=lambda x: abs(x["total_score"] - (x["prev_total_score"] or 0.0)), reverse=True)[:show]:
+            logger.info(
+                f"   [{r['risk_no']}] {r['p_trademark_reg_no']} / {r['c_trademark_name']}: "
+                f"{r['prev_total_score']:.4f}({r['prev_risk_level']}) -> {r['total_score']:.4f}({r['risk_level']})"
+            )
+
+        if apply:
+            updated = await vector_store.update_rescored_risks(changed)
+            logger.info(f"🏁 재채점 결과 DB 반영 완료: {updated}건")
+        else:
+            logger.info("🏁 리포트만 출력했습니다. DB 반영은 --apply 옵션을 사용하세요.")
+    finally:
+        await Database.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="tbl_infringe_risk 오프라인 재채점")
+    parser.add_argument("--apply", action="store_true", help="재채점 결과를 DB에 반영")
+    parser.add_argument("--config", default=None, help="risk 설정을 읽을 YAML 경로 (기본: model_config.yaml)")
+    parser.add_argument("--show", type=int, default=20, help="출력할 변경 건수")
+    args = parser.parse_args()
+
+    asyncio.run(main(apply=args.apply, config_path=args.config, show=args.show))
@@ -0,0 +1,40 @@
+from typing import Dict, List, Tuple
+from src.model.schema import CollectedTrademarkInfo
+from src.utils.fingerprint import image_digest, normalize_trademark_name
+from src.utils.image_hash import cached_dhash
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+def collected_cluster_key(c_tm: CollectedTrademarkInfo) -> Tuple[str, str]:
+    """
+    중복 판매 페이지 판별 키: (정규화 상표명, 이미지 키)
+    - 이미지 키: 지각 해시(dHash, 재인코딩 이미지도 동일 처리), 저장된 해시가 없으면 이미지에서 계산
+      (백필 전후 행이 섞여도 동일 이미지는 같은 키), 해시 계산 불가(손상 이미지 등)일 때만 SHA-256 다이제스트
+    """
+    c_hash = c_tm.c_trademark_dhash
+    if c_hash is None:
+        c_hash = cached_dhash(c_tm.c_trademark_image)
+    if c_hash is not None:
+        image_key = f"dhash:{c_hash}"
+    else:
+        image_key = image_digest(c_tm.c_trademark_image)
+    return normalize_trademark_name(c_tm.c_trademark_name), image_key
+
+def cluster_collected_trademarks(c_tm_list: List[CollectedTrademarkInfo]) -> List[List[CollectedTrademarkInfo]]:
+    """
+    동일 상표명 + 동일 이미지의 수집 상표를 클러스터로 묶음
+    - 각 클러스터의 첫 번째 항목이 대표 상표 (Graph 1회 실행 대상)
+    - 클러스터 순서 및 클러스터 내 순서는 입력 순서 유지
+    """
+    clusters: Dict[Tuple[str, str], List[CollectedTrademarkInfo]] = {}
+    
+    for c_tm in c_tm_list:
+        clusters.setdefault(collected_cluster_key(c_tm), []).append(c_tm)
+    
+    result = list(clusters.values())
+    
+    if len(result) < len(c_tm_list):
+        logger.info(f"[중복 제거] 수집 상표 {len(c_tm_list)}건 -> 클러스터 {len(result)}개")
+    
+    return result
@@ -2,10 +2,10 @@ from src.model.schema import InfringementRisk, ProtectionTrademarkInfo, Collecte
 from langchain_openai import AzureChatOpenAI
 from src.configs import get_system_prompt, get_user_prompt, get_detail_prompt, render_user_prompt, model_config
 from src.container import Container
-from src.utils.llm import generate_text
+from src.utils.llm import agenerate_text
 from src.utils.format import clean_json
 from src.utils.logger import get_logger
-from typing import List, Tuple, Dict
+from typing import List, Tuple, Dict, Any, Optional
 import json
 import math
 
@@ -36,7 +36,7 @@ async def calculate_risk(protection_trademark: ProtectionTrademarkInfo,
         
         # 보호 상표 이미지 -> GPT-5.1-chat -> 관념 묘사문
         logger.info("[앙상블] 보호 상표 시각적 묘사 생성 시작")
-        visual_description = generate_text(model, get_system_prompt("risk_visual_description"), 
+        visual_description = await agenerate_text(model, get_system_prompt("risk_visual_description"), 
                                                                     get_user_prompt("risk_visual_description"), 
                                                                     get_detail_prompt("risk_visual_description"),
                                                                     protection_trademark.p_trademark_image)
@@ -47,7 +47,7 @@ async def calculate_risk(protection_trademark: ProtectionTrademarkInfo,
         
         try:        
             # JSON 형식 정제
-            search_query = _generate_search_query(model, protection_trademark.p_trademark_name, protection_trademark.p_product_kinds, visual_description, conceptual_description)
+            search_query = await _generate_search_query(model, protection_trademark.p_trademark_name, protection_trademark.p_product_kinds, visual_description, conceptual_description)
             parsed_json = json.loads(search_query)
             queries = parsed_json.get("queries", [])
             logger.info(f"[앙상블] 거절 사유 검색 쿼리 생성: {len(queries)}개")
@@ -65,106 +65,32 @@ async def calculate_risk(protection_trademark: ProtectionTrademarkInfo,
         
         # 거절 사유 조회
         logger.info("[앙상블] 거절 사유 DB 조회 시작")
-        formatted_contexts_str = await _search_reason_trademark(queries) 
+        formatted_contexts_str = await _search_reason_trademark(queries, protection_trademark.p_trademark_reg_no)
         logger.info(f"[앙상블] 거절 사유 DB 조회 완료 (길이: {len(formatted_contexts_str)})")
         
         # 식별력 평가
         logger.info("[앙상블] 식별력 평가 시작")
-        risk_identification_evaluation_json = _evaluate_identification(model, cal_vis, cal_pho, cal_sem, protection_trademark.p_trademark_name, protection_trademark.p_product_kinds, visual_description, conceptual_description, formatted_contexts_str)
+        risk_identification_evaluation_json = await _evaluate_identification(model, cal_vis, cal_pho, cal_sem, protection_trademark.p_trademark_name, protection_trademark.p_product_kinds, visual_description, conceptual_description, formatted_contexts_str)
         logger.info("[앙상블] 식별력 평가 완료")
         
-        # 동적 가중치 저장
-        dynamic_weights: Dict[str, float] = {}
-        default_weight = model_config.get("risk").get("default_weight") # 기본 가중치
+        # 식별력 등급 추출
+        identification_grades = _extract_identification_grades(risk_identification_evaluation_json)
         
-        # 필수 키 검증
-        required_keys = ["visual", "phonetic", "semantic"]
-        if not all(key in risk_identification_evaluation_json for key in required_keys):
-            logger.warning("[앙상블] 식별력 평가 결과 키 누락. 기본 가중치 적용")
-            dynamic_weights = {
-                "visual": default_weight,
-                "phonetic": default_weight,
-                "semantic": default_weight
-            }
-        
-        for key in required_keys:
-            # 각 요소의 분석 결과
-            analysis_item = risk_identification_evaluation_json.get(key, {})
-            
-            # grade_score 추출 (기본값: 3)
-            # LLM이 3.0(float)이나 "3"(str)을 줄 수도 있으므로 안전하게 int 변환 시도
-            raw_grade = analysis_item.get("grade_score", 3)
-            
-            try:
-                grade_int = int(raw_grade)
-            except (ValueError, TypeError):
-                grade_int = 3 # 변환 실패 시 중간값
-                
-            # 가중치 매핑 테이블 조회 (1~5 범위를 벗어나면 기본값 처리)
-            grade_weight = model_config.get("risk").get("grade_weight")
-            weight = grade_weight.get(grade_int, default_weight)
-            
-            dynamic_weights[key] = weight   
+        # 보정 -> 동적 가중치 -> 위험도 결정
+        ensemble_scores = compute_ensemble_score(
+            {
+                "visual": visual_similarity_score,
+                "phonetic": phonetic_similarity_score,
+                "semantic": conceptual_similarity_score,
+            },
+            identification_grades,
+        )
+        dynamic_weights = ensemble_scores["weights"]
+        final_score = ensemble_scores["total_score"]
+        risk_level = ensemble_scores["risk_level"]
         
         logger.info(f"[앙상블] 동적 가중치 산출: {dynamic_weights}")
 
-        # 임계값 설정
-        threshold_weight = model_config.get("risk").get("threshold_weight")
-        threshold_score = model_config.get("risk").get("threshold_score")
-        
-        
-        # 식별력이 강하고, 유사도가 높은 요소 추출
-        dominant_factors_scores = []
-        if dynamic_weights["visual"] >= threshold_weight and cal_vis >= threshold_score:
-            dominant_factors_scores.append(cal_vis)
-        if dynamic_weights["phonetic"] >= threshold_weight and cal_pho >= threshold_score:
-            dominant_factors_scores.append(cal_pho)
-        if dynamic_weights["semantic"] >= threshold_weight and cal_sem >= threshold_score:
-            dominant_factors_scores.append(cal_sem)
-        
-        final_score = 0.0
-        
-        score_dict = {
-            "visual": cal_vis,
-            "phonetic": cal_pho,
-            "semantic": cal_sem
-        }
-        
-        # 
-        if dominant_factors_scores:
-            # [Case A] Dominant Part Rule (요부 관찰)
-            # "하나만 걸려도 아웃이다"
-            logger.info("[앙상블] 요부 관찰(Dominant Part Rule) 적용")
-            
-            # 요부 조건을 만족하는 항목들 중 가장 높은 유사도 점수를 채택
-            final_score = max(dominant_factors_scores)
-        else:
-            # [Case B] Overall Observation Rule (전체 관찰)
-            # "전체적인 인상을 종합적으로 본다"
-            logger.info("[앙상블] 전체 관찰(Overall Observation Rule) 적용")
-            
-            final_score = _calculate_weighted_rms(score_dict, dynamic_weights)
-            
-            # 관념 점수가 높고, 외관/호칭 점수가 낮은 경우 관념 점수만 20% 감점
-            is_semantic_high = (score_dict["semantic"] >= 0.8 and score_dict["semantic"] >= final_score)
-            
-            valid_others = [cal_vis, cal_pho]
-            
-            # 외관/호칭 점수가 낮은 경우
-            if valid_others and all(s < 0.3 for s in valid_others):
-                is_others_low = True
-            else:
-                is_others_low = False
-
-            # 관념 점수가 높고, 외관/호칭 점수가 낮은 경우 관념 점수만 20% 감점
-            if is_semantic_high and is_others_low:
-                score_dict["semantic"] *= 0.8 
-                
-                final_score = _calculate_weighted_rms(score_dict, dynamic_weights)
-        
-        final_score = round(final_score, 4)
-        risk_level = _determine_risk_level(final_score)
-
         risk_level_ko_dict = {
             "H": "고위험",
             "M": "중위험",
@@ -182,7 +108,13 @@ async def calculate_risk(protection_trademark: ProtectionTrademarkInfo,
             total_score=final_score,
             risk_level=risk_level,
             risk_level_ko=risk_level_ko,
-            visual_description=visual_description
+            visual_description=visual_description,
+            visual_raw_score=visual_similarity_score,
+            phonetic_raw_score=phonetic_similarity_score,
+            conceptual_raw_score=conceptual_similarity_score,
+            visual_grade=identification_grades["visual"],
+            phonetic_grade=identification_grades["phonetic"],
+            conceptual_grade=identification_grades["semantic"]
         )
 
     except Exception as e:
@@ -196,7 +128,116 @@ async def calculate_risk(protection_trademark: ProtectionTrademarkInfo,
         )
     
 
-def _generate_search_query(model : AzureChatOpenAI, p_trademark_name: str, p_product_kinds: str, visual_description: str, conceptual_description: str) -> str:
+def compute_ensemble_score(raw_scores: Dict[str, float], grades: Dict[str, int], risk_config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    원본 유사도 점수와 식별력 등급으로 최종 점수 및 위험도 산출 (LLM 호출 없음)
+    - raw_scores: visual / phonetic / semantic 보정 전 유사도 점수
+    - grades: visual / phonetic / semantic 식별력 등급 (1~5)
+    - risk_config: 미지정 시 model_config의 risk 설정 사용 (재채점 시 다른 설정 주입 가능)
+    """
+    risk_config = risk_config or model_config.get("risk")
+    anchors = risk_config.get("anchors")
+    
+    # 보간법 적용
+    cal_vis = _score_calibrator(raw_scores.get("visual", 0.0), anchors.get("visual"))
+    cal_pho = _score_calibrator(raw_scores.get("phonetic", 0.0), anchors.get("phonetic"))
+    cal_sem = _score_calibrator(raw_scores.get("semantic", 0.0), anchors.get("conceptual"))
+    
+    # 식별력 등급 -> 동적 가중치
+    default_weight = risk_config.get("default_weight")
+    grade_weight = risk_config.get("grade_weight")
+    dynamic_weights: Dict[str, float] = {
+        key: grade_weight.get(grades.get(key, 3), default_weight)
+        for key in ["visual", "phonetic", "semantic"]
+    }
+    
+    # 임계값 설정
+    threshold_weight = risk_config.get("threshold_weight")
+    threshold_score = risk_config.get("threshold_score")
+    
+    # 식별력이 강하고, 유사도가 높은 요소 추출
+    dominant_factors_scores = []
+    if dynamic_weights["visual"] >= threshold_weight and cal_vis >= threshold_score:
+        dominant_factors_scores.append(cal_vis)
+    if dynamic_weights["phonetic"] >= threshold_weight and cal_pho >= threshold_score:
+        dominant_factors_scores.append(cal_pho)
+    if dynamic_weights["semantic"] >= threshold_weight and cal_sem >= threshold_score:
+        dominant_factors_scores.append(cal_sem)
+    
+    final_score = 0.0
+    
+    score_dict = {
+        "visual": cal_vis,
+        "phonetic": cal_pho,
+        "semantic": cal_sem
+    }
+    
+    if dominant_factors_scores:
+        # [Case A] Dominant Part Rule (요부 관찰)
+        # "하나만 걸려도 아웃이다"
+        logger.debug("[앙상블] 요부 관찰(Dominant Part Rule) 적용")
+        
+        # 요부 조건을 만족하는 항목들 중 가장 높은 유사도 점수를 채택
+        final_score = max(dominant_factors_scores)
+    else:
+        # [Case B] Overall Observation Rule (전체 관찰)
+        # "전체적인 인상을 종합적으로 본다"
+        logger.debug("[앙상블] 전체 관찰(Overall Observation Rule) 적용")
+        
+        final_score = _calculate_weighted_rms(score_dict, dynamic_weights)
+        
+        # 관념 점수가 높고, 외관/호칭 점수가 낮은 경우 관념 점수만 20% 감점
+        is_semantic_high = (score_dict["semantic"] >= 0.8 and score_dict["semantic"] >= final_score)
+        
+        valid_others = [cal_vis, cal_pho]
+        
+        # 외관/호칭 점수가 낮은 경우
+        if valid_others and all(s < 0.3 for s in valid_others):
+            is_others_low = True
+        else:
+            is_others_low = False
+
+        # 관념 점수가 높고, 외관/호칭 점수가 낮은 경우 관념 점수만 20% 감점
+        if is_semantic_high and is_others_low:
+            score_dict["semantic"] *= 0.8 
+            
+            final_score = _calculate_weighted_rms(score_dict, dynamic_weights)
+    
+    final_score = round(final_score, 4)
+    
+    return {
+        "calibrated_scores": {"visual": cal_vis, "phonetic": cal_pho, "semantic": cal_sem},
+        "weights": dynamic_weights,
+        "total_score": final_score,
+        "risk_level": _determine_risk_level(final_score, risk_config.get("risk_threshold")),
+    }
+
+def _extract_identification_grades(risk_identification_evaluation_json: Dict[str, Any]) -> Dict[str, int]:
+    """식별력 평가 결과(JSON)에서 요소별 등급(1~5) 추출"""
+    grades: Dict[str, int] = {}
+    
+    # 필수 키 검증
+    required_keys = ["visual", "phonetic", "semantic"]
+    if not all(key in risk_identification_evaluation_json for key in required_keys):
+        logger.warning("[앙상블] 식별력 평가 결과 키 누락. 기본 등급 적용")
+    
+    for key in required_keys:
+        # 각 요소의 분석 결과
+        analysis_item = risk_identification_evaluation_json.get(key, {})
+        
+        # grade_score 추출 (기본값: 3)
+        # LLM이 3.0(float)이나 "3"(str)을 줄 수도 있으므로 안전하게 int 변환 시도
+        raw_grade = analysis_item.get("grade_score", 3)
+        
+        try:
+            grades[key] = int(raw_grade)
+        except (ValueError, TypeError):
+            grades[key] = 3 # 변환 실패 시 중간값
+    
+    logger.info(f"[앙상블] 식별력 등급 산출: {grades}")
+    return grades
+
+async def _generate_search_query(model : AzureChatOpenAI, p_trademark_name: str, p_product_kinds: str, visual_description: str, conceptual_description: str) -> str:
     model_gpt4o_mini = Container.get_gpt4o_mini()
         
     # User Prompt 생성
@@ -211,7 +252,7 @@ def _generate_search_query(model : AzureChatOpenAI, p_trademark_name: str, p_pro
     
     # 검색 쿼리 생성
     try:
-        search_query = generate_text(model_gpt4o_mini, get_system_prompt("risk_query_generation"), 
+        search_query = await agenerate_text(model_gpt4o_mini, get_system_prompt("risk_query_generation"), 
                                                                 user_prompt, 
                                                                 "")
         
@@ -223,36 +264,35 @@ def _generate_search_query(model : AzureChatOpenAI, p_trademark_name: str, p_pro
         logger.error(f"[앙상블] 검색 쿼리 생성 실패: {e}", exc_info=True)
         return ""
 
-async def _search_reason_trademark(queries: List[str]) -> List[str]:
+async def _search_reason_trademark(queries: List[str], p_trademark_reg_no: Optional[str] = None) -> str:
+    """
+    거절 사유 검색 (쿼리 일괄 임베딩 + 단일 SQL 조회)
+    - 보호상표 + 쿼리 집합 단위로 결과 캐시 (동일 보호상표의 다른 수집상표 쌍에서 재사용)
+    """
+    queries = [q for q in dict.fromkeys(q.strip() for q in queries if q) if q]
+    if not queries:
+        return ""
+    
+    cache_key = (p_trademark_reg_no, tuple(sorted(queries)))
+    try:
+        return await Container.get_reason_trademark_cache().get_or_compute(
+            cache_key, lambda: _fetch_reason_trademark(queries)
+        )
+    except Exception as e:
+        # 오류 결과는 캐시하지 않음
+        logger.warning(f"[앙상블] 거절 사유 검색 중 오류 (쿼리 {len(queries)}건): {e}")
+        return ""
+
+async def _fetch_reason_trademark(queries: List[str]) -> str:
     text_embedding_model = Container.get_text_embedding_model()
     vector_store = Container.get_vector_store()
     
-    reason_trademarks_list = []
-    unique_patent_ids = set()
-    
-    for query in queries:
-        try:
-            # 쿼리 임베딩
-            query_vec = await text_embedding_model.aembed_query(query)
-            reason_trademark_threshold = model_config.get("risk").get("reason_trademark_threshold")
-            
-            # 거절 사유 조회
-            reason_trademarks = await vector_store.search_reason_trademark(query_vec, reason_trademark_threshold)
-            
-            # 중복 제거
-            for row in reason_trademarks:
-                if row.patent_id not in unique_patent_ids:
-                    unique_patent_ids.add(row.patent_id)
-                    reason_trademarks_list.append(row)
-        except Exception as e:
-            logger.warning(f"[앙상블] 거절 사유 검색 중 오류 (쿼리: {query}): {e}")
-            continue
-                
-    # 코사인 유사도 기준 내림차순
-    reason_trademarks_list.sort(key=lambda x: x.similarity_score, reverse=True)
+    # 쿼리 일괄 임베딩
+    query_vecs = await text_embedding_model.aembed_documents(queries)
+    reason_trademark_threshold = model_config.get("risk").get("reason_trademark_threshold")
     
-    # 상위 10개 선택
-    reason_trademarks_list = reason_trademarks_list[:10]
+    # 거절 사유 조회 (patent_id 중복 제거, 코사인 유사도 내림차순 상위 10개)
+    reason_trademarks_list = await vector_store.search_reason_trademarks_batch(query_vecs, reason_trademark_threshold, 10)
     
     # 결과 포맷팅
     formatted_contexts = []
@@ -270,7 +310,7 @@ async def _search_reason_trademark(queries: List[str]) -> List[str]:
     return "\n\n".join(formatted_contexts)
 
 
-def _evaluate_identification(model : AzureChatOpenAI, cal_vis: float, cal_pho: float, cal_sem: float, p_trademark_name: str, p_product_kinds: str, visual_description: str, conceptual_description: str, formatted_contexts_str: str) : 
+async def _evaluate_identification(model : AzureChatOpenAI, cal_vis: float, cal_pho: float, cal_sem: float, p_trademark_name: str, p_product_kinds: str, visual_description: str, conceptual_description: str, formatted_contexts_str: str) : 
     try:
         score_summary = (
             f"- Visual Similarity Score: {cal_vis:.2f}\n"
@@ -289,7 +329,7 @@ def _evaluate_identification(model : AzureChatOpenAI, cal_vis: float, cal_pho: f
         
         user_prompt = render_user_prompt("risk_Identification_evaluation", **context)
         
-        risk_identification_evaluation = generate_text(model, get_system_prompt("risk_Identification_evaluation"), 
+        risk_identification_evaluation = await agenerate_text(model, get_system_prompt("risk_Identification_evaluation"), 
                                                                     user_prompt, 
                                                                     "",
                                                                     )
@@ -359,7 +399,7 @@ def _calculate_weighted_rms(scores: Dict[str, float], weights: Dict[str, float])
         logger.error(f"[앙상블] 가중 RMS 계산 오류: {e}")
         return 0.0
 
-def _determine_risk_level(score: float) -> str:
+def _determine_risk_level(score: float, risk_thresholds: Optional[Dict[str, float]] = None) -> str:
     """
     최종 점수에 따른 위험 등급 결정 (Revised Logic)
     - 0.85 이상: High (고위험)
@@ -368,7 +408,7 @@ def _determine_risk_level(score: float) -> str:
     - 0.55 미만: Safe (비유사 - 보고서 제외)
     """
     try:
-        risk_thresholds = model_config.get("risk").get("risk_threshold")
+        risk_thresholds = risk_thresholds or model_config.get("risk").get("risk_threshold")
         if score >= risk_thresholds["H"]:
             return "H"
         elif score >= risk_thresholds["M"]:
@@ -6,15 +6,56 @@ from src.model.schema import Precedent, JudgeDecision
 from src.utils.llm import generate_text
 from src.utils.format import clean_json, score_to_hml
 from src.utils.logger import get_logger
+from src.utils.prompt_budget import fit_precedent_context
+from src.tools.precedent_index import BM25Index, KoreanTokenizer
 from langchain_core.messages import SystemMessage, HumanMessage
 
-from typing import List, Dict, Any
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple
+import numpy as np
+import asyncio
 import json
 
 logger = get_logger(__name__)
 
-def generate_query(p_trademark_name: str, p_product_kinds: str, visual_description: str, weights: Dict[str, float], scores: Dict[str, float]) -> str:
+def risk_profile_key(state: GraphState) -> Tuple:
+    """
+    판례 RAG 메모 키 (보호상표, HML 패턴, 구간화 가중치)
+    - 동일 보호상표의 다른 수집상표 쌍이 같은 위험 프로파일이면 쿼리 생성/판례 검증 결과 재사용
+    """
+    bucket = float(model_config.get('precedent', {}).get('memo', {}).get('weight_bucket', 0.1))
+    scores = {
+        "visual": state["visual_similarity_score"],
+        "phonetic": state["phonetic_similarity_score"],
+        "conceptual": state["conceptual_similarity_score"],
+    }
+    weights = tuple(
+        round(round(state[k] / bucket) * bucket, 6) if bucket > 0 else state[k]
+        for k in ("visual_weight", "phonetic_weight", "conceptual_weight")
+    )
+    return (state["protection_trademark"].p_trademark_reg_no, score_to_hml(scores), weights)
+
+def precedent_memo_key(state: GraphState, *extra) -> Optional[Tuple]:
+    """
+    쿼리 생성/판례 검증 메모 키 (risk_profile_key + extra)
+    - 보고서 평가 미달(evaluation_decision=regenerate)로 재진입한 경로는 None -> 메모 미사용 (새 쿼리/판정 생성)
+    """
+    if state.get("evaluation_decision") == "regenerate":
+        return None
+    return risk_profile_key(state) + extra
+
+def _memo_enabled() -> bool:
+    return bool(model_config.get('precedent', {}).get('memo', {}).get('enabled', False))
+
+def generate_query(p_trademark_name: str, p_product_kinds: str, visual_description: str, weights: Dict[str, float], scores: Dict[str, float], memo_key: Optional[Tuple] = None) -> str:
     try:
+        # 동일 위험 프로파일 쌍에서 생성한 쿼리 재사용
+        if memo_key is not None and _memo_enabled():
+            cached = Container.get_query_memo().get(memo_key)
+            if cached is not None:
+                logger.info(f"[판례 검색] 쿼리 메모 적중: {memo_key}")
+                return cached
+        
         gpt_model = Container.get_gpt4o()
         
         context = {**{
@@ -40,7 +81,11 @@ def generate_query(p_trademark_name: str, p_product_kinds: str, visual_descripti
         
         querys_json = clean_json(querys_json)  
         
-        return json.loads(querys_json)
+        querys = json.loads(querys_json)
+        if memo_key is not None and _memo_enabled():
+            Container.get_query_memo().set(memo_key, querys)
+        
+        return querys
     except Exception as e:
         logger.error(f"[판례 검색] 쿼리 생성 중 오류: {e}", exc_info=True)
         return {"queries": [p_trademark_name]}
@@ -58,26 +103,30 @@ async def retrieve_precedents(search_querys: List[str], scores: Dict[str, float]
         # 법리, 본문 비율 계산
         l_limit, f_limit = int(20 * legal_ratio), 20 - int(20 * legal_ratio)
         
-        precedents = []
+        if not search_querys:
+            logger.warning("[판례 검색] 검색 쿼리가 없습니다.")
+            return []
         
-        for query in search_querys:
-            # 쿼리 임베딩
-            # (주의: embed_query는 동기 함수이므로 블로킹 가능성 있음. 향후 aembed_query로 교체 권장)
-            q_vec = await embedding_model.aembed_query(query)
-            
-            # 판례 검색 (단수형 메서드 호출로 수정)
-            search_precedents = await vector_store.search_precedent(q_vec, target_hml, l_limit, f_limit)
-            
-            # 리스트 확장 (append -> extend 수정)
-            precedents.extend(search_precedents)
+        # 쿼리 일괄 임베딩 (1회 호출)
+        q_vecs = await embedding_model.aembed_documents(list(search_querys))
         
-        logger.info(f"[판례 검색] 초기 검색 결과: {len(precedents)}건")
-
-        # 중복 제거
-        unique_results = {res["unique_key"]: res for res in precedents}.values()
+        # 판례 일괄 검색 (쿼리별 주제 비율 적용, case_id_chunk_index 중복 제거 및 점수 정렬 포함)
+        precedent_index = None
+        if model_config.get('precedent').get('index', {}).get('enabled', False):
+            precedent_index = await Container.get_precedent_index().get()
+        
+        if precedent_index is not None:
+            precedent_config = model_config.get('precedent')
+            sorted_res = precedent_index.search_batch(
+                q_vecs, list(search_querys), target_hml, l_limit, f_limit,
+                oversample=int(precedent_config.get('oversample', 3)),
+                hml_boost=precedent_config.get('hml_boost', 1.2),
+                citation_penalty=precedent_config.get('citation_penalty', 0.5),
+            )
+        else:
+            sorted_res = await vector_store.search_precedents_batch(q_vecs, target_hml, l_limit, f_limit)
         
-        # 정렬 후 Precedent 객체 생성
-        sorted_res = sorted(unique_results, key=lambda x: x['score'], reverse=True)
+        logger.info(f"[판례 검색] 쿼리 {len(search_querys)}건 일괄 검색 결과: {len(sorted_res)}건 (중복 제거)")
         
         precedents_obj = [Precedent(
             precedent_no = str(row["precedent_no"]), # 판례 번호
@@ -86,7 +135,9 @@ async def retrieve_precedents(search_querys: List[str], scores: Dict[str, float]
             start_page = row["start_page"],          # 판례 시작 페이지
             content    = row["content"],             # 판례 내용,
             # hml_pattern = row["hml_pattern"],       # 판례 HML 패턴 (Schema에 필드 추가 필요, 현재는 생략)
-            is_relevant= False                       # 적합성 여부 (초기값 False)
+            is_relevant= False,                      # 적합성 여부 (초기값 False)
+            score      = row["score"],               # 검색 점수 (HML 가중치, 인용 감점 반영)
+            retrieval_score = row["similarity"],     # 검색 유사도 원점수 (HML/인용 보정 전, 사전 필터 이후에도 유지)
         ) for row in sorted_res]
         
         top_k = model_config.get('precedent').get('top_k')
@@ -100,7 +151,155 @@ async def retrieve_precedents(search_querys: List[str], scores: Dict[str, float]
         logger.error(f"[판례 검색] DB 조회 중 오류: {e}", exc_info=True)
         return []
 
-def grade_precedents(state: GraphState) -> Dict[str, Any]:
+def _prefilter_context(state: GraphState) -> str:
+    """사전 필터 기준 텍스트 (보호/수집 상표, 지정상품, 시각 묘사, 검색 쿼리)"""
+    p_tm = state["protection_trademark"]
+    c_tm = state["current_collected_trademark"]
+    ensemble = state.get("ensemble_result")
+    parts = [
+        p_tm.p_trademark_name,
+        p_tm.p_product_kinds,
+        c_tm.c_trademark_name,
+        ensemble.visual_description if ensemble else "",
+        *state.get("search_querys", []),
+    ]
+    return " ".join(p for p in parts if p)
+
+def _cross_encoder_scores(model_name: str, context: str, precedents: List[Precedent]) -> Optional[List[float]]:
+    """CPU Cross-Encoder 점수 (sentence-transformers 미설치/로드 실패 시 None)"""
+    try:
+        from sentence_transformers import CrossEncoder
+    except ImportError:
+        logger.warning("[판례 사전 필터] sentence-transformers 모듈을 찾을 수 없어 하이브리드 점수를 사용합니다.")
+        return None
+    
+    try:
+        model = _load_cross_encoder(CrossEncoder, model_name)
+        return [float(s) for s in model.predict([(context, p.content) for p in precedents])]
+    except Exception as e:
+        logger.warning(f"[판례 사전 필터] Cross-Encoder 점수 계산 실패 (하이브리드 점수 사용): {e}")
+        return None
+
+@lru_cache(maxsize=1)
+def _tokenizer() -> KoreanTokenizer:
+    return KoreanTokenizer()
+
+@lru_cache(maxsize=1)
+def _load_cross_encoder(cross_encoder_cls, model_name: str):
+    return cross_encoder_cls(model_name, device="cpu")
+
+def prefilter_precedents(state: GraphState) -> List[Precedent]:
+    """
+    LLM 판례 검증 전 로컬 사전 필터 (상위 precedent.prefilter.top_k건만 통과)
+    - 하이브리드 점수 = (1 - lexical_weight) x 검색 점수(최대값 정규화) + lexical_weight x BM25(상표 컨텍스트 기준, 최대값 정규화)
+    - precedent.prefilter.cross_encoder 지정 시 Cross-Encoder 점수 사용
+    - 반환 판례는 사전 필터 점수 내림차순 (score 갱신)
+    """
+    precedents = state.get("retrieved_precedents", [])
+    prefilter_config = model_config.get('precedent', {}).get('prefilter', {})
+    top_k = int(prefilter_config.get('top_k', 15))
+    
+    if not prefilter_config.get('enabled', False) or len(precedents) <= top_k:
+        return precedents
+    
+    context = _prefilter_context(state)
+    
+    scores = None
+    if prefilter_config.get('cross_encoder'):
+        scores = _cross_encoder_scores(prefilter_config['cross_encoder'], context, precedents)
+    
+    if scores is None:
+        lexical_weight = float(prefilter_config.get('lexical_weight', 0.5))
+        tokenizer = _tokenizer()
+        
+        retrieval = np.array([p.score or 0.0 for p in precedents], dtype=np.float32)
+        lexical = BM25Index([tokenizer(p.content) for p in precedents]).scores(tokenizer(context))
+        if retrieval.max() > 0:
+            retrieval = retrieval / retrieval.max()
+        if lexical.max() > 0:
+            lexical = lexical / lexical.max()
+        
+        scores = ((1 - lexical_weight) * retrieval + lexical_weight * lexical).tolist()
+    
+    # 동점 시 기존 검색 순서 유지
+    order = sorted(range(len(precedents)), key=lambda i: (-scores[i], i))[:top_k]
+    kept = [precedents[i].model_copy(update={"score": scores[i]}) for i in order]
+    
+    logger.info(f"[판례 사전 필터] {len(kept)}/{len(precedents)}건 통과 ({len(kept) / len(precedents):.0%}), "
+                f"검색 순위 유지 {sum(1 for i in order if i < top_k)}/{len(kept)}건")
+    return kept
+
+def _grading_messages(context: Dict[str, Any]) -> list:
+    return [
+        SystemMessage(content=get_system_prompt("precedent_grading")),
+        HumanMessage(content=render_user_prompt("precedent_grading", **context)),
+    ]
+
+async def _grade_in_chunks(structured_llm, context: Dict[str, Any], chunk_size: int, min_relevant: int) -> JudgeDecision:
+    """
+    판례 목록을 chunk_size 단위로 나눠 동시 검증 후 결정 병합
+    - 각 청크의 relevant_indices 는 원래 목록 인덱스로 변환
+    - 실패한 청크는 적합 판례 없음으로 처리 (전 청크 실패 시 예외)
+    """
+    precedents = context["precedents"]
+    offsets = list(range(0, len(precedents), chunk_size))
+    
+    logger.info(f"[판례 검증] 청크 병렬 평가 요청: {len(precedents)}건 -> {len(offsets)}개 청크 (청크당 {chunk_size}건)")
+    results = await asyncio.gather(
+        *(structured_llm.ainvoke(_grading_messages({**context, "precedents": precedents[o:o + chunk_size]})) for o in offsets),
+        return_exceptions=True,
+    )
+    
+    chunk_results = []
+    for offset, result in zip(offsets, results):
+        if isinstance(result, Exception):
+            logger.warning(f"[판례 검증] 청크 평가 실패 (시작 인덱스 {offset}): {result}")
+            continue
+        size = len(precedents[offset:offset + chunk_size])
+        chunk_results.append((offset, size, result))
+    
+    if not chunk_results:
+        raise RuntimeError("모든 청크 평가 실패")
+    
+    return merge_chunk_decisions(chunk_results, min_relevant)
+
+def merge_chunk_decisions(chunk_results: List[Tuple[int, int, JudgeDecision]], min_relevant: int = 1) -> JudgeDecision:
+    """
+    청크별 검증 결과 병합 (결정적 규칙)
+    1. 청크 approve 의 적합 판례(원래 인덱스) 합계가 min_relevant 이상이면 approve
+    2. 아니면 rewrite 청크가 있으면 rewrite (청크 순서상 첫 피드백)
+    3. 아니면 web_search 청크가 있으면 web_search (청크 순서상 첫 키워드)
+    4. 그 외 (승인했으나 유효 인덱스 없음) approve + 빈 인덱스 -> 호출부에서 재검색 유도
+    """
+    relevant_indices, reasoning = [], []
+    rewrite_feedback, web_keywords = [], []
+    
+    for offset, size, result in sorted(chunk_results, key=lambda r: r[0]):
+        if result.decision == "approve":
+            for i, reason in _pair_reasoning(result.relevant_indices, result.reasoning):
+                if 0 <= i < size:
+                    relevant_indices.append(offset + i)
+                    reasoning.append(reason)
+        elif result.decision == "rewrite":
+            rewrite_feedback.append(result.feedback_or_query)
+        elif result.decision == "web_search" and result.feedback_or_query:
+            web_keywords.append(result.feedback_or_query)
+    
+    logger.info(f"[판례 검증] 청크 결정 병합: 적합 {len(relevant_indices)}건, rewrite {len(rewrite_feedback)}개, web_search {len(web_keywords)}개 청크")
+    
+    if relevant_indices and len(relevant_indices) >= min_relevant:
+        return JudgeDecision(decision="approve", reasoning=reasoning, relevant_indices=relevant_indices)
+    if rewrite_feedback:
+        return JudgeDecision(decision="rewrite", reasoning=[], feedback_or_query=next((f for f in rewrite_feedback if f), None))
+    if web_keywords:
+        return JudgeDecision(decision="web_search", reasoning=[], feedback_or_query=web_keywords[0])
+    return JudgeDecision(decision="approve", reasoning=[], relevant_indices=[])
+
+def _pair_reasoning(indices: List[int], reasoning: List[str]):
+    """적합 인덱스와 근거 목록 짝짓기 (근거 누락 시 빈 문자열)"""
+    return ((i, reasoning[n] if n < len(reasoning) else "") for n, i in enumerate(indices))
+
+async def grade_precedents(state: GraphState) -> Dict[str, Any]:
     try:
         precedents = state.get("retrieved_precedents", [])                          # 검색 판례 목록
         rewrite_count = state.get("rewrite_count", 0)                               # 쿼리 재생성 시도 횟수
@@ -153,15 +352,21 @@ def grade_precedents(state: GraphState) -> Dict[str, Any]:
         structured_llm = llm_judge.with_structured_output(JudgeDecision)
         
         # 컨텍스트 추출
-        context = {**extract_common_context(state), **extract_precedent_context(state)}
+        context = fit_precedent_context({**extract_common_context(state), **extract_precedent_context(state)}, "precedent_grading")
         
-        messages = [
-            SystemMessage(content=get_system_prompt("precedent_grading")),
-            HumanMessage(content=render_user_prompt("precedent_grading", **context)),
-        ]
-
-        logger.info("[판례 검증] LLM 평가 요청")
-        result: JudgeDecision = structured_llm.invoke(messages)
+        async def judge() -> JudgeDecision:
+            chunk_size = int(precedent_config.get("grading_chunk_size", 0) or 0)
+            if 0 < chunk_size < len(context["precedents"]):
+                return await _grade_in_chunks(structured_llm, context, chunk_size, int(precedent_config.get("grading_min_relevant", 1)))
+            logger.info("[판례 검증] LLM 평가 요청")
+            return await structured_llm.ainvoke(_grading_messages(context))
+        
+        # 동일 위험 프로파일 + 동일 판례 목록(프롬프트 전달분)이면 검증 결정 재사용
+        memo_key = precedent_memo_key(state, tuple(f"{p['case_id']}:{p['start_page']}" for p in context["precedents"]))
+        if _memo_enabled() and memo_key is not None:
+            result: JudgeDecision = await Container.get_grading_memo().get_or_compute(memo_key, judge)
+        else:
+            result: JudgeDecision = await judge()
 
         # 결과 로깅
         logger.info(f"[판례 검증] LLM 결정: {result.decision} | 선택된 인덱스: {result.relevant_indices}")
@@ -172,6 +377,10 @@ def grade_precedents(state: GraphState) -> Dict[str, Any]:
             
             valid_indices = [i for i in indices if 0 <= i < len(precedents)]
             
+            # 사전 필터 효과 확인용: 적합 판례의 사전 필터 순위 (상위 K 경계에 몰리면 K 확대 검토)
+            if model_config.get('precedent', {}).get('prefilter', {}).get('enabled', False):
+                logger.info(f"[판례 검증] 적합 판례 사전 필터 순위: {sorted(valid_indices)} / {len(precedents)}건")
+            
             # 적합한 판례 인덱스가 없으면 쿼리 재생성으로 처리
             if not valid_indices:
                 logger.warning("[판례 검증] 승인되었으나 유효한 인덱스가 없음 -> 재검색 유도")
@@ -1,37 +1,93 @@
+import asyncio
+from typing import List, Optional
 from src.configs import get_system_prompt, render_user_prompt, model_config
 from src.container import Container
 from src.utils.format import clean_qwen_response
 from src.utils.llm import generate_text
+from src.utils.prompt_budget import completion_token_limit, count_tokens, fit_precedent_context
+from src.utils.logger import get_logger
 from src.model.schema import EvaluationResult
 from langchain_core.messages import SystemMessage, HumanMessage
 
+logger = get_logger(__name__)
 
-def generate_report(context: dict) -> str:
+
+def _report_request(context: dict) -> dict:
+    """보고서 생성 요청 파라미터 (판례 토큰 예산, 생성 토큰 한도 적용)"""
+    # 판례 컨텍스트 토큰 예산 적용 (순위 상위부터 유지)
+    context = fit_precedent_context(context, "report_generation")
+    
     system_prompt = get_system_prompt("report_generation")
     user_prompt = render_user_prompt("report_generation", **context)
     
     # 모델 파라미터 로드
     qwen_config = model_config.get('models', {}).get('qwen_reporter', {})
     
-    # Container에서 vLLM 클라이언트 가져오기
-    aclient = Container.get_vllm_client()
+    # 생성 토큰 한도: 컨텍스트 윈도우 - 프롬프트 토큰 (추정치, max_tokens 상한)
+    max_tokens = completion_token_limit(
+        count_tokens(system_prompt) + count_tokens(user_prompt),
+        qwen_config.get('max_tokens'),
+        qwen_config.get('context_window'),
+    )
     
-    response = aclient.chat.completions.create(
+    return dict(
         model="trademark-analysis",
         messages=[
             {"role": "system", "content": system_prompt},
             {"role": "user", "content": user_prompt}
         ],
         temperature=qwen_config.get('temperature'),
-        max_tokens=qwen_config.get('max_tokens'),
+        max_tokens=max_tokens,
         top_p=qwen_config.get('top_p'),
         presence_penalty=1.0
     )
+
+
+async def generate_report(context: dict) -> str:
+    request = _report_request(context)
+    
+    # Container에서 vLLM 클라이언트 가져오기
+    aclient = Container.get_vllm_client()
+    
+    # 동시 요청 상한 내에서 비동기 호출 (여러 쌍의 요청을 vLLM continuous batching 으로 처리)
+    async with Container.get_vllm_semaphore():
+        response = await aclient.chat.completions.create(**request)
     
     raw_content = response.choices[0].message.content
     cleaned_content = clean_qwen_response(raw_content)
     
     return cleaned_content
+
+
+async def generate_report_candidates(context: dict, n: int, use_n_param: bool = True, temperature: Optional[float] = None) -> List[str]:
+    """
+    Best-of-N 후보 보고서 생성
+    - use_n_param: vLLM n 파라미터로 1회 요청 (프롬프트 prefill 1회 공유), False 이면 병렬 요청 N회
+    - temperature: 후보 다양성을 위한 샘플링 온도 (None 이면 qwen_reporter.temperature)
+    - 병렬 요청 중 실패한 후보는 제외 (전부 실패 시 예외)
+    """
+    request = _report_request(context)
+    if temperature is not None:
+        request["temperature"] = temperature
+    aclient = Container.get_vllm_client()
+    
+    if use_n_param:
+        async with Container.get_vllm_semaphore():
+            response = await aclient.chat.completions.create(n=n, **request)
+        return [clean_qwen_response(choice.message.content) for choice in response.choices]
+    
+    async def sample():
+        async with Container.get_vllm_semaphore():
+            response = await aclient.chat.completions.create(**request)
+        return clean_qwen_response(response.choices[0].message.content)
+    
+    results = await asyncio.gather(*(sample() for _ in range(n)), return_exceptions=True)
+    candidates = [r for r in results if not isinstance(r, BaseException)]
+    if not candidates:
+        raise results[0]
+    if len(candidates) < n:
+        logger.warning(f"[보고서 생성] 후보 {n - len(candidates)}/{n}건 생성 실패: {next(r for r in results if isinstance(r, BaseException))}")
+    return candidates
     
 # def generate_report(context: dict) -> str:
 #     model = Container.get_gpt51_chat()
@@ -44,8 +100,9 @@ def generate_report(context: dict) -> str:
 #     return report_content
 
 
-def evaluate_report(context: dict, report_content: str) -> EvaluationResult:
-    base_context = render_user_prompt("precedent_grading", **context)
+async def evaluate_report(context: dict, report_content: str) -> EvaluationResult:
+    # 판례 검증과 동일한 예산으로 입력 컨텍스트 구성
+    base_context = render_user_prompt("precedent_grading", **fit_precedent_context(context, "precedent_grading"))
         
     # 평가용 프롬프트 렌더링
     eval_context = render_user_prompt("report_evaluation", 
@@ -61,9 +118,35 @@ def evaluate_report(context: dict, report_content: str) -> EvaluationResult:
     
     eval_system_prompt = get_system_prompt("report_evaluation")
     
-    result: EvaluationResult = structured_llm.invoke([
+    result: EvaluationResult = await structured_llm.ainvoke([
         SystemMessage(content=eval_system_prompt),
         HumanMessage(content=eval_context)
     ])
     
-    return result
\ No newline at end of file
+    return result
+
+
+async def evaluate_report_candidates(context: dict, candidates: List[str]) -> List[Optional[EvaluationResult]]:
+    """후보 보고서 동시 평가 (평가 실패 후보는 None)"""
+    results = await asyncio.gather(*(evaluate_report(context, c) for c in candidates), return_exceptions=True)
+    evaluations = []
+    for i, r in enumerate(results):
+        if isinstance(r, BaseException):
+            logger.warning(f"[보고서 평가] 후보 #{i} 평가 실패: {r}")
+            evaluations.append(None)
+        else:
+            evaluations.append(r)
+    return evaluations
+
+
+def select_best_report(evaluations: List[Optional[EvaluationResult]], threshold: float) -> Optional[int]:
+    """
+    평가 결과 중 최선 후보 인덱스
+    - 통과(approved 또는 score >= threshold) 후보 중 최고점, 없으면 전체 최고점 (재생성 루프로 진행)
+    - 평가 결과가 모두 없으면 None
+    """
+    scored = [(i, e) for i, e in enumerate(evaluations) if e is not None]
+    if not scored:
+        return None
+    passed = [(i, e) for i, e in scored if e.decision == "approved" or e.score >= threshold]
+    return max(passed or scored, key=lambda x: x[1].score)[0]
\ No newline at end of file
@@ -59,6 +59,14 @@ def _build_email_body(approved_reports: list[ApprovedReport], p_trademark_name:
                         style="width:300px; height: auto; border: 1px solid #eee;"/>
             </div>
             """
+            # 동일 상표 (상표명, 이미지) 판매 페이지 목록
+            duplicate_html = ""
+            if report.duplicate_page_urls:
+                duplicate_links = "".join(f'<li><a href="{url}">{url}</a></li>' for url in report.duplicate_page_urls)
+                duplicate_html = f"""
+                <p>동일 상표 판매 페이지 <strong>{len(report.duplicate_page_urls)}건</strong> 추가 발견</p>
+                <ul>{duplicate_links}</ul>
+                """
             formatted_content = report.report_content.replace("\n", "<br>")
             reports_html += f"""
             <div style="margin-bottom: 30px; border: 1px solid #ddd; padding: 15px; border-radius: 5px;">
@@ -67,6 +75,7 @@ def _build_email_body(approved_reports: list[ApprovedReport], p_trademark_name:
                     <strong style="color: {report.risk_level=="H" and "red" or report.risk_level=="M" and "orange" or "green"};">{report.risk_level=="H" and "고위험" or report.risk_level=="M" and "중위험" or "저위험"}</strong>
                     | 종합 점수: <strong>{report.total_score * 100:.2f}점</strong></p>
                 {collect_image_tag}
+                {duplicate_html}
                 <hr/>
                 <div style="background-color: #f9f9f9; padding: 10px; font-family: monospace;">
                     {formatted_content}
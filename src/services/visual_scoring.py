@@ -1,4 +1,7 @@
 from typing import List
+from src.model.schema import ProtectionTrademarkInfo, CollectedTrademarkInfo
+from src.configs import model_config
+from src.utils.image_hash import cached_dhash, hamming_distance
 from src.utils.logger import get_logger
 import numpy as np
 
@@ -29,3 +32,32 @@ def calculate_visual_similarity(p_trademark_image_vec: List[float], c_trademark_
     except Exception as e:
         logger.error(f"[외관 유사도] 계산 중 오류 발생: {e}", exc_info=True)
         return 0.0
+
+
+def is_near_duplicate_image(protection_trademark: ProtectionTrademarkInfo, 
+                            current_collected_trademark: CollectedTrademarkInfo) -> bool:
+    """
+    지각 해시(dHash) 해밍 거리로 근사 동일 이미지 여부 판별
+    - DB에 저장된 해시가 없으면 이미지에서 계산 (다이제스트 기준 캐시, 동시 클러스터가 공유하는 객체는 변경하지 않음)
+    """
+    try:
+        hash_config = model_config.get('image_hash', {})
+        if not hash_config.get('enabled', False):
+            return False
+        
+        p_hash = protection_trademark.p_trademark_dhash
+        if p_hash is None:
+            p_hash = cached_dhash(protection_trademark.p_trademark_image)
+        c_hash = current_collected_trademark.c_trademark_dhash
+        if c_hash is None:
+            c_hash = cached_dhash(current_collected_trademark.c_trademark_image)
+        if p_hash is None or c_hash is None:
+            return False
+        
+        distance = hamming_distance(p_hash, c_hash)
+        logger.debug(f"[이미지 해시] 해밍 거리: {distance}")
+        
+        return distance <= hash_config.get('near_duplicate_distance', 4)
+    except Exception as e:
+        logger.error(f"[이미지 해시] 근사 동일 이미지 판별 중 오류 발생: {e}", exc_info=True)
+        return False
@@ -0,0 +1,173 @@
+import argparse
+import asyncio
+from src.configs import model_config
+from src.utils.db import Database
+from src.utils.image_hash import dhash
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 테이블별 (키 컬럼, 이미지 컬럼, 해시 컬럼)
+_DHASH_TARGETS = {
+    "tbl_protection_trademark": ("p_trademark_reg_no", "p_trademark_image", "p_trademark_dhash"),
+    "tbl_collect_trademark": ("c_trademark_no", "c_trademark_image", "c_trademark_dhash"),
+}
+
+async def backfill_dhash(batch_size: int = 500) -> int:
+    """이미지 지각 해시(dHash)가 비어 있는 상표의 해시 계산 및 저장 (키 기준 배치 순회)"""
+    pool = await Database.get_pool()
+    total = 0
+    
+    for table, (key_col, image_col, hash_col) in _DHASH_TARGETS.items():
+        last_key = None
+        
+        while True:
+            async with pool.acquire() as conn:
+                if last_key is None:
+                    rows = await conn.fetch(
+                        f"SELECT {key_col} AS key, {image_col} AS image FROM {table} "
+                        f"WHERE {hash_col} is null and {image_col} is not null ORDER BY {key_col} LIMIT $1",
+                        batch_size)
+                else:
+                    rows = await conn.fetch(
+                        f"SELECT {key_col} AS key, {image_col} AS image FROM {table} "
+                        f"WHERE {hash_col} is null and {image_col} is not null and {key_col} > $2 ORDER BY {key_col} LIMIT $1",
+                        batch_size, last_key)
+            
+            if not rows:
+                break
+            last_key = rows[-1]["key"]
+            
+            # 해시 계산 실패(손상 이미지 등)는 건너뜀
+            updates = [(value, r["key"]) for r in rows if (value := dhash(r["image"])) is not None]
+            
+            if updates:
+                async with pool.acquire() as conn:
+                    await conn.executemany(f"UPDATE {table} SET {hash_col} = $1 WHERE {key_col} = $2", updates)
+            
+            total += len(updates)
+            logger.info(f"[백필] {table}.{hash_col}: {len(updates)}/{len(rows)}건 저장 (누적 {total}건)")
+    
+    return total
+
+# 테이블별 (키 컬럼, 상품류 코드 문자열 컬럼, 상품류 코드 배열 컬럼)
+_CLASS_CODE_TARGETS = {
+    "tbl_protection_trademark": ("p_trademark_reg_no", "p_trademark_class_code", "p_trademark_class_codes"),
+    "tbl_collect_trademark": ("c_trademark_no", "c_trademark_class_code", "c_trademark_class_codes"),
+}
+
+async def backfill_class_codes(batch_size: int = 5000) -> int:
+    """상품류 코드 배열이 비어 있는 상표의 배열 컬럼 채우기 (DB 함수 class_code_array, 키 기준 배치 순회)"""
+    pool = await Database.get_pool()
+    total = 0
+    
+    for table, (key_col, code_col, codes_col) in _CLASS_CODE_TARGETS.items():
+        while True:
+            # 갱신된 행은 조건(is null)에서 빠지므로 매 배치 처음부터 조회
+            async with pool.acquire() as conn:
+                status = await conn.execute(
+                    f"UPDATE {table} SET {codes_col} = class_code_array({code_col}) "
+                    f"WHERE {key_col} IN (SELECT {key_col} FROM {table} WHERE {codes_col} is null ORDER BY {key_col} LIMIT $1)",
+                    batch_size)
+            
+            updated = int(status.split()[-1])
+            if updated == 0:
+                break
+            
+            total += updated
+            logger.info(f"[백필] {table}.{codes_col}: {updated}건 저장 (누적 {total}건)")
+    
+    return total
+
+# 다이제스트 백필 테이블별 키 컬럼 (두 테이블 모두 c_trademark_name / c_trademark_image 기준)
+_DIGEST_TARGETS = {
+    "tbl_collect_trademark": "c_trademark_no",
+    "tbl_infringe_risk": "risk_no",
+}
+
+async def backfill_digests(batch_size: int = 5000) -> int:
+    """상표명/이미지 다이제스트 채우기 (DB 함수 trademark_name_digest / trademark_image_digest, 키 기준 배치 순회)"""
+    pool = await Database.get_pool()
+    total = 0
+    
+    for table, key_col in _DIGEST_TARGETS.items():
+        while True:
+            # 상표명/이미지가 모두 없는 행은 다이제스트가 NULL로 남으므로 대상에서 제외
+            async with pool.acquire() as conn:
+                status = await conn.execute(
+                    f"UPDATE {table} SET c_name_digest = trademark_name_digest(c_trademark_name), "
+                    f"c_image_digest = trademark_image_digest(c_trademark_image) "
+                    f"WHERE {key_col} IN (SELECT {key_col} FROM {table} "
+                    f"WHERE c_name_digest is null and c_image_digest is null "
+                    f"and (c_trademark_name is not null or c_trademark_image is not null) ORDER BY {key_col} LIMIT $1)",
+                    batch_size)
+            
+            updated = int(status.split()[-1])
+            if updated == 0:
+                break
+            
+            total += updated
+            logger.info(f"[백필] {table} 다이제스트: {updated}건 저장 (누적 {total}건)")
+    
+    return total
+
+async def backfill_reference_copies(batch_size: int = 5000) -> int:
+    """
+    참조 저장 전환: 수집 상표와 연결된 위험군 행의 복사본(이미지, 벡터) 제거 (migrations/006 적용 후)
+    - db.risk_storage: reference 가 아니면 실행 거부 (copy 모드 데이터 보호)
+    - 다이제스트가 없는 행은 제거 후 재계산할 수 없으므로 제외 (트리거가 기존 다이제스트 유지)
+    """
+    risk_storage = model_config.get('db', {}).get('risk_storage', 'copy')
+    if risk_storage != 'reference':
+        raise ValueError(f"db.risk_storage 가 reference 가 아니므로 복사본을 제거하지 않습니다 (현재: {risk_storage})")
+    
+    pool = await Database.get_pool()
+    total = 0
+    
+    while True:
+        # 갱신된 행은 조건(복사본 존재)에서 빠지므로 매 배치 처음부터 조회
+        async with pool.acquire() as conn:
+            status = await conn.execute(
+                "UPDATE tbl_infringe_risk SET c_trademark_image = NULL, c_trademark_name_vec = NULL, c_trademark_image_vec = NULL "
+                "WHERE risk_no IN (SELECT risk_no FROM tbl_infringe_risk "
+                "WHERE c_trademark_no is not null and c_name_digest is not null and c_image_digest is not null "
+                "and (c_trademark_image is not null or c_trademark_name_vec is not null or c_trademark_image_vec is not null) "
+                "ORDER BY risk_no LIMIT $1)",
+                batch_size)
+        
+        updated = int(status.split()[-1])
+        if updated == 0:
+            break
+        
+        total += updated
+        logger.info(f"[백필] tbl_infringe_risk 복사본 제거: {updated}건 (누적 {total}건)")
+    
+    return total
+
+async def main(target: str, batch_size: int):
+    """DB 컬럼 백필 유틸리티 (migrations/ 적용 후 기존 데이터 채우기)"""
+    await Database.get_pool()
+    
+    try:
+        if target == "dhash":
+            total = await backfill_dhash(batch_size)
+        elif target == "class_codes":
+            total = await backfill_class_codes(batch_size)
+        elif target == "digests":
+            total = await backfill_digests(batch_size)
+        elif target == "reference_copies":
+            total = await backfill_reference_copies(batch_size)
+        else:
+            raise ValueError(f"지원하지 않는 백필 대상: {target}")
+        
+        logger.info(f"🏁 백필 완료 ({target}): 총 {total}건")
+    finally:
+        await Database.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="DB 컬럼 백필 유틸리티")
+    parser.add_argument("target", choices=["dhash", "class_codes", "digests", "reference_copies"], help="백필 대상")
+    parser.add_argument("--batch-size", type=int, default=500, help="배치 크기")
+    args = parser.parse_args()
+    
+    asyncio.run(main(args.target, args.batch_size))
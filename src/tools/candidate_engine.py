@@ -0,0 +1,229 @@
+import json
+import os
+import re
+import shutil
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+import numpy as np
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 스냅샷 구성 파일 (CollectedCatalog 속성명과 동일) / 메타 / 현재 세대 링크
+SNAPSHOT_ARRAYS = ("ids", "name_matrix", "name_inv_norms", "image_matrix", "image_inv_norms", "class_masks")
+SNAPSHOT_META = "meta.json"
+SNAPSHOT_CURRENT = "current"
+
+def parse_class_codes(class_code: Optional[str]) -> List[int]:
+    """
+    '|' 구분 상품류 코드 -> 정렬된 정수 목록
+    DB 측 class_code_array() (migrations/004) 와 동일 규칙: 1~2자리 숫자만 사용
+    """
+    if not class_code:
+        return []
+    return sorted({int(code.strip()) for code in class_code.split('|') if re.fullmatch(r'[0-9]{1,2}', code.strip())})
+
+def class_codes_to_mask(class_codes: Optional[Iterable[int]]) -> int:
+    """상품류 코드 목록 -> 비트마스크 (1~45류 -> bit 0~44)"""
+    mask = 0
+    for code in class_codes or ():
+        if 1 <= code <= 63:
+            mask |= 1 << (code - 1)
+    return mask
+
+def parse_class_mask(class_code: Optional[str]) -> int:
+    """'|' 구분 상품류 코드 -> 비트마스크"""
+    return class_codes_to_mask(parse_class_codes(class_code))
+
+def vectors_to_matrix(vectors: Sequence[Optional[Sequence[float]]], dim: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    벡터 리스트 -> 원본 float32 행렬 + 역노름 (1 / L2 norm)
+    - 벡터 없음(None/빈 리스트), 차원 불일치, 노름 0인 행은 0벡터 + 역노름 0 (유효하지 않음)
+    - pgvector(vector) 값은 float32 이므로 원본 그대로 보존됨
+    """
+    if dim is None:
+        dim = next((len(v) for v in vectors if v is not None and len(v) > 0), 0)
+
+    matrix = np.zeros((len(vectors), dim), dtype=np.float32)
+    for i, v in enumerate(vectors):
+        if v is not None and len(v) == dim and dim > 0:
+            matrix[i] = v
+
+    norms = np.linalg.norm(matrix, axis=1)
+    inv_norms = np.zeros(len(vectors), dtype=np.float32)
+    np.divide(1.0, norms, out=inv_norms, where=norms > 0)
+    return matrix, inv_norms
+
+def normalize_rows(vectors: Sequence[Optional[Sequence[float]]], dim: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """벡터 리스트 -> L2 정규화 float32 행렬 + 유효 행 마스크"""
+    matrix, inv_norms = vectors_to_matrix(vectors, dim)
+    return matrix * inv_norms[:, None], inv_norms > 0
+
+class CollectedCatalog:
+    """
+    수집 상표 벡터 카탈로그 (행렬 연산용, c_trademark_no 오름차순)
+    - ids: c_trademark_no (N,)
+    - name_matrix / image_matrix: 원본 float32 (N, D) - 스냅샷 파일을 메모리 매핑한 배열일 수 있음
+    - name_inv_norms / image_inv_norms: 역노름 (N,), 0이면 벡터 없음
+    - class_masks: 상품류 비트마스크 (N,)
+    """
+
+    def __init__(self,
+                 ids: np.ndarray,
+                 name_matrix: np.ndarray, name_inv_norms: np.ndarray,
+                 image_matrix: np.ndarray, image_inv_norms: np.ndarray,
+                 class_masks: np.ndarray):
+        self.ids = ids
+        self.name_matrix = name_matrix
+        self.name_inv_norms = name_inv_norms
+        self.image_matrix = image_matrix
+        self.image_inv_norms = image_inv_norms
+        self.class_masks = class_masks
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def rows_of(self, c_trademark_nos: Iterable[int]) -> np.ndarray:
+        """c_trademark_no 목록 -> 카탈로그 행 인덱스 (카탈로그에 없는 번호는 무시)"""
+        c_nos = np.fromiter(c_trademark_nos, dtype=np.int64)
+        if len(self.ids) == 0 or len(c_nos) == 0:
+            return np.empty(0, dtype=np.int64)
+        rows = np.searchsorted(self.ids, c_nos)
+        rows = np.minimum(rows, len(self.ids) - 1)
+        return np.unique(rows[self.ids[rows] == c_nos])
+
+    def name_vector(self, row: int) -> List[float]:
+        return self.name_matrix[row].tolist() if self.name_inv_norms[row] > 0 else []
+
+    def image_vector(self, row: int) -> List[float]:
+        return self.image_matrix[row].tolist() if self.image_inv_norms[row] > 0 else []
+
+def merge_catalogs(base: CollectedCatalog, delta: CollectedCatalog) -> CollectedCatalog:
+    """기존 카탈로그 + 증분 카탈로그 병합 (동일 c_trademark_no는 증분 쪽으로 대체, c_trademark_no 오름차순)"""
+    keep = np.ones(len(base), dtype=bool)
+    keep[base.rows_of(delta.ids)] = False
+    arrays = {name: np.concatenate([np.asarray(getattr(base, name))[keep], getattr(delta, name)]) for name in SNAPSHOT_ARRAYS}
+    order = np.argsort(arrays["ids"], kind="stable")
+    return CollectedCatalog(**{name: array[order] for name, array in arrays.items()})
+
+def save_catalog(directory: str, catalog: CollectedCatalog, meta: Dict[str, Any], keep_generations: int = 2) -> str:
+    """
+    카탈로그를 .npy 스냅샷으로 저장
+    - 세대 디렉터리(gen-YYYYmmddHHMMSSffffff)에 기록 후 current 심볼릭 링크를 원자적으로 교체
+    - 이전 세대는 keep_generations개까지 보존 (이미 매핑 중인 프로세스 보호)
+    """
+    os.makedirs(directory, exist_ok=True)
+    generation = f"gen-{datetime.now().strftime('%Y%m%d%H%M%S%f')}"
+    generation_dir = os.path.join(directory, generation)
+    os.makedirs(generation_dir)
+
+    for name in SNAPSHOT_ARRAYS:
+        np.save(os.path.join(generation_dir, f"{name}.npy"), np.ascontiguousarray(getattr(catalog, name)))
+    with open(os.path.join(generation_dir, SNAPSHOT_META), 'w', encoding='utf-8') as f:
+        json.dump({**meta, "count": len(catalog), "generation": generation}, f, ensure_ascii=False, indent=2)
+
+    tmp_link = os.path.join(directory, f".{SNAPSHOT_CURRENT}.tmp")
+    if os.path.lexists(tmp_link):
+        os.remove(tmp_link)
+    os.symlink(generation, tmp_link)
+    os.replace(tmp_link, os.path.join(directory, SNAPSHOT_CURRENT))
+
+    generations = sorted(d for d in os.listdir(directory) if d.startswith("gen-") and d != generation)
+    for old in generations[:max(len(generations) - (keep_generations - 1), 0)]:
+        shutil.rmtree(os.path.join(directory, old), ignore_errors=True)
+
+    return generation_dir
+
+def load_catalog(directory: str) -> Optional[Tuple[CollectedCatalog, Dict[str, Any]]]:
+    """
+    현재 세대 스냅샷을 메모리 매핑으로 로드 (복사 없음, 여러 프로세스가 페이지 캐시 공유)
+    - 스냅샷이 없거나 손상된 경우 None
+    """
+    current = os.path.join(directory, SNAPSHOT_CURRENT)
+    if not os.path.exists(current):
+        return None
+
+    try:
+        # 링크를 먼저 해석해 로드 도중 세대가 교체되어도 같은 세대의 파일을 읽도록 함
+        generation_dir = os.path.realpath(current)
+        with open(os.path.join(generation_dir, SNAPSHOT_META), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        arrays = {name: np.load(os.path.join(generation_dir, f"{name}.npy"), mmap_mode='r') for name in SNAPSHOT_ARRAYS}
+        return CollectedCatalog(**arrays), meta
+    except Exception as e:
+        logger.error(f"[스냅샷] 로드 실패 ({directory}): {e}", exc_info=True)
+        return None
+
+def search_candidates(catalog: CollectedCatalog,
+                      p_name_matrix: np.ndarray, p_name_valid: np.ndarray,
+                      p_image_matrix: np.ndarray, p_image_valid: np.ndarray,
+                      p_class_masks: np.ndarray,
+                      p_excluded_rows: List[np.ndarray],
+                      threshold: float,
+                      top_k: int,
+                      block_size: int = 8192,
+                      excluded_rows: Optional[np.ndarray] = None) -> List[List[Tuple[int, float]]]:
+    """
+    보호 상표 M건 x 수집 상표 N건 전수 유사 후보 검색 (블록 단위 행렬 곱)
+    - 후보 조건: (상표명 코사인 유사도 >= threshold OR 이미지 코사인 유사도 >= threshold)
+                 AND 상품류 교집합 존재 (보호 상표 상품류가 없으면 조건 없음)
+                 AND 제외 대상 아님 (p_excluded_rows: 보호 상표별, excluded_rows: 전체 공통)
+    - 보호 상표 행렬은 정규화된 상태로 전달, 수집 상표는 역노름으로 보정
+    - 보호 상표별 max(상표명, 이미지) 유사도 내림차순 상위 top_k 반환: [(수집 상표 행 인덱스, 유사도), ...]
+    - 메모리 사용량은 block_size x M 유사도 행렬로 제한
+    """
+    n_protection = p_name_matrix.shape[0]
+    best_rows: List[np.ndarray] = [np.empty(0, dtype=np.int64) for _ in range(n_protection)]
+    best_scores: List[np.ndarray] = [np.empty(0, dtype=np.float32) for _ in range(n_protection)]
+
+    p_has_class = p_class_masks != 0
+    neg_inf = np.float32(-np.inf)
+
+    for start in range(0, len(catalog), block_size):
+        end = min(start + block_size, len(catalog))
+
+        # (B, M) 유사도: 벡터가 없는 쪽은 -inf
+        sims = np.full((end - start, n_protection), neg_inf, dtype=np.float32)
+        if p_name_matrix.shape[1] and catalog.name_matrix.shape[1]:
+            inv_norms = catalog.name_inv_norms[start:end]
+            name_sims = (catalog.name_matrix[start:end] @ p_name_matrix.T) * inv_norms[:, None]
+            name_ok = (inv_norms > 0)[:, None] & p_name_valid[None, :]
+            sims = np.where(name_ok, name_sims, sims)
+        if p_image_matrix.shape[1] and catalog.image_matrix.shape[1]:
+            inv_norms = catalog.image_inv_norms[start:end]
+            image_sims = (catalog.image_matrix[start:end] @ p_image_matrix.T) * inv_norms[:, None]
+            image_ok = (inv_norms > 0)[:, None] & p_image_valid[None, :]
+            sims = np.maximum(sims, np.where(image_ok, image_sims, neg_inf))
+
+        # 상품류 교집합 마스크
+        class_ok = ((catalog.class_masks[start:end, None] & p_class_masks[None, :]) != 0) | ~p_has_class[None, :]
+        qualified = (sims >= threshold) & class_ok
+
+        # 공통 제외 대상 (예: 스냅샷 이후 갱신되어 DB 최신본으로 대체되는 행)
+        if excluded_rows is not None and len(excluded_rows):
+            qualified[excluded_rows[(excluded_rows >= start) & (excluded_rows < end)] - start, :] = False
+
+        for j in np.flatnonzero(qualified.any(axis=0)):
+            rows = np.flatnonzero(qualified[:, j]) + start
+            scores = sims[rows - start, j]
+
+            # 제외 대상 (침해 위험군 / 판정 이력)
+            if len(p_excluded_rows[j]):
+                keep = ~np.isin(rows, p_excluded_rows[j])
+                rows, scores = rows[keep], scores[keep]
+
+            rows = np.concatenate([best_rows[j], rows])
+            scores = np.concatenate([best_scores[j], scores])
+
+            # 상위 top_k 유지
+            if len(rows) > top_k:
+                top = np.argpartition(-scores, top_k - 1)[:top_k]
+                rows, scores = rows[top], scores[top]
+            best_rows[j], best_scores[j] = rows, scores
+
+    results = []
+    for rows, scores in zip(best_rows, best_scores):
+        # 유사도 내림차순, 동률은 행 인덱스(= c_trademark_no 순) 오름차순
+        order = np.lexsort((rows, -scores))
+        results.append([(int(rows[i]), float(scores[i])) for i in order])
+    return results
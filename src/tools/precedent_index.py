@@ -0,0 +1,172 @@
+import asyncio
+import math
+import re
+from typing import Any, Callable, Dict, List, Optional, Sequence
+import numpy as np
+from src.tools.candidate_engine import normalize_rows
+from src.utils.ranking import dedupe_precedents, rerank_precedents
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+TOPICS = ("법리", "본문")
+
+_FALLBACK_TOKEN_PATTERN = re.compile(r'[가-힣]+|[A-Za-z]+|[0-9]+')
+
+def _load_mecab() -> Optional[Callable[[str], List[str]]]:
+    try:
+        import mecab
+        return mecab.MeCab().morphs
+    except Exception as e:
+        logger.warning(f"[판례 인덱스] MeCab 로드 실패 (정규식 토크나이저 사용): {e}")
+        return None
+
+class KoreanTokenizer:
+    """MeCab 형태소 토크나이저 (미설치 시 한글/영문/숫자 연속열 분리로 대체)"""
+
+    def __init__(self, morphs: Optional[Callable[[str], List[str]]] = None, use_mecab: bool = True):
+        self._morphs = morphs if morphs is not None else (_load_mecab() if use_mecab else None)
+
+    def __call__(self, text: Optional[str]) -> List[str]:
+        if not text:
+            return []
+        if self._morphs is not None:
+            tokens = self._morphs(text)
+        else:
+            tokens = _FALLBACK_TOKEN_PATTERN.findall(text)
+        return [t.lower() for t in tokens if _FALLBACK_TOKEN_PATTERN.search(t)]
+
+class BM25Index:
+    """Okapi BM25 역색인 (문서 토큰 리스트 -> 질의별 전체 문서 점수 벡터)"""
+
+    def __init__(self, documents: Sequence[Sequence[str]], k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.doc_count = len(documents)
+        doc_lens = np.array([len(d) for d in documents], dtype=np.float32)
+        avg_len = float(doc_lens.mean()) if self.doc_count and doc_lens.sum() > 0 else 1.0
+        self._len_norm = k1 * (1 - b + b * doc_lens / avg_len)
+
+        postings: Dict[str, Dict[int, int]] = {}
+        for doc_no, tokens in enumerate(documents):
+            for token in tokens:
+                tf = postings.setdefault(token, {})
+                tf[doc_no] = tf.get(doc_no, 0) + 1
+
+        self._postings = {
+            token: (np.fromiter(tf.keys(), dtype=np.int64, count=len(tf)),
+                    np.fromiter(tf.values(), dtype=np.float32, count=len(tf)))
+            for token, tf in postings.items()
+        }
+
+    def idf(self, token: str) -> float:
+        posting = self._postings.get(token)
+        df = 0 if posting is None else len(posting[0])
+        return math.log(1 + (self.doc_count - df + 0.5) / (df + 0.5))
+
+    def scores(self, query_tokens: Sequence[str]) -> np.ndarray:
+        scores = np.zeros(self.doc_count, dtype=np.float32)
+        for token in set(query_tokens):
+            posting = self._postings.get(token)
+            if posting is None:
+                continue
+            doc_nos, tf = posting
+            scores[doc_nos] += self.idf(token) * tf * (self.k1 + 1) / (tf + self._len_norm[doc_nos])
+        return scores
+
+class PrecedentIndex:
+    """
+    프로세스 내 판례 코퍼스 인덱스 (tbl_precedent 1회 적재)
+    - 정규화 content_vec float32 행렬 + 본문 BM25 (MeCab 토큰)
+    - 하이브리드 유사도 = (1 - lexical_weight) x 코사인 + lexical_weight x (BM25 / 질의별 최대 BM25)
+    - 주제 분리, HML 가중치, 인용 감점, 중복 제거는 search_precedents_batch 와 동일 (utils.ranking)
+    """
+
+    def __init__(self,
+                 rows: List[Dict[str, Any]],
+                 vectors: Sequence[Optional[Sequence[float]]],
+                 tokenizer: Optional[Callable[[str], List[str]]] = None,
+                 lexical_weight: float = 0.3,
+                 k1: float = 1.5,
+                 b: float = 0.75):
+        self.rows = rows
+        self.tokenizer = tokenizer or KoreanTokenizer()
+        self.lexical_weight = lexical_weight
+        self.matrix, self.valid = normalize_rows(vectors)
+        self.topics = np.array([r.get("topic") for r in rows], dtype=object)
+        self.bm25 = BM25Index([self.tokenizer(r.get("content")) for r in rows], k1=k1, b=b)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def hybrid_similarity(self, query_vec: Sequence[float], query: str) -> np.ndarray:
+        """질의 1건의 전체 판례 하이브리드 유사도 (벡터 없는 판례는 -inf)"""
+        q_matrix, q_valid = normalize_rows([query_vec], dim=self.matrix.shape[1])
+        cosine = self.matrix @ q_matrix[0] if q_valid[0] else np.zeros(len(self.rows), dtype=np.float32)
+
+        lexical = self.bm25.scores(self.tokenizer(query))
+        max_lexical = float(lexical.max()) if len(lexical) else 0.0
+        if max_lexical > 0:
+            lexical = lexical / max_lexical
+
+        similarity = (1 - self.lexical_weight) * cosine + self.lexical_weight * lexical
+        similarity[~self.valid] = -np.inf
+        return similarity
+
+    def search_batch(self,
+                     query_vecs: List[List[float]],
+                     queries: List[str],
+                     target_hml: str,
+                     l_limit: int,
+                     f_limit: int,
+                     oversample: int = 3,
+                     hml_boost: float = 1.2,
+                     citation_penalty: float = 0.5) -> List[Dict[str, Any]]:
+        """복수 쿼리 판례 검색 (VectorStore.search_precedents_batch 와 동일한 반환 형식)"""
+        reranked = []
+        for query_vec, query in zip(query_vecs, queries):
+            similarity = self.hybrid_similarity(query_vec, query)
+
+            candidates = []
+            for topic, limit in zip(TOPICS, (l_limit, f_limit)):
+                rows = np.flatnonzero((self.topics == topic) & np.isfinite(similarity))
+                k = min(limit * oversample, len(rows))
+                if k <= 0:
+                    continue
+                top = rows[np.argpartition(-similarity[rows], k - 1)[:k]]
+                candidates.extend({**self.rows[i], "similarity": float(similarity[i])} for i in top)
+
+            reranked.extend(rerank_precedents(candidates, target_hml, l_limit, f_limit,
+                                              hml_boost=hml_boost, citation_penalty=citation_penalty))
+
+        return dedupe_precedents([{**r, "unique_key": f"{r['case_id']}_{r['chunk_index']}"} for r in reranked])
+
+class PrecedentIndexLoader:
+    """실행당 1회 판례 인덱스 적재 (동시 요청은 단일 적재 작업 공유, 실패 시 None)"""
+
+    def __init__(self, vector_store: Any, lexical_weight: float = 0.3, k1: float = 1.5, b: float = 0.75):
+        self.vector_store = vector_store
+        self.lexical_weight = lexical_weight
+        self.k1 = k1
+        self.b = b
+        self._index: Optional[PrecedentIndex] = None
+        self._failed = False
+        self._lock = asyncio.Lock()
+
+    async def get(self) -> Optional[PrecedentIndex]:
+        if self._index is not None or self._failed:
+            return self._index
+
+        async with self._lock:
+            if self._index is None and not self._failed:
+                try:
+                    rows, vectors = await self.vector_store.fetch_precedent_corpus()
+                    # 토큰화/색인은 CPU 작업이므로 이벤트 루프 외부에서 수행
+                    self._index = await asyncio.to_thread(
+                        PrecedentIndex, rows, vectors, None, self.lexical_weight, self.k1, self.b
+                    )
+                    logger.info(f"[판례 인덱스] {len(self._index)}건 적재 완료")
+                except Exception as e:
+                    self._failed = True
+                    logger.error(f"[판례 인덱스] 적재 실패 (DB 검색 사용): {e}", exc_info=True)
+        return self._index
@@ -0,0 +1,107 @@
+import asyncio
+import re
+from typing import Any, Dict, List, Optional, Set
+from src.model.schema import Precedent
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_SENTENCE_END = re.compile(r'(?<=[.!?다])\s+')
+
+def chunk_text(text: str, chunk_chars: int = 800, overlap: int = 100) -> List[str]:
+    """
+    본문 청크 분할 (문장 경계 우선, 최대 chunk_chars자, 청크 간 overlap자 중복)
+    - 한 문장이 chunk_chars 를 넘으면 문자 단위로 분할
+    """
+    text = (text or "").strip()
+    if not text:
+        return []
+    if len(text) <= chunk_chars:
+        return [text]
+
+    sentences = []
+    for sentence in _SENTENCE_END.split(text):
+        while len(sentence) > chunk_chars:
+            sentences.append(sentence[:chunk_chars])
+            sentence = sentence[chunk_chars:]
+        if sentence:
+            sentences.append(sentence)
+
+    chunks, current = [], ""
+    for sentence in sentences:
+        if current and len(current) + 1 + len(sentence) > chunk_chars:
+            chunks.append(current)
+            tail = current[-overlap:] if overlap > 0 else ""
+            current = tail + " " + sentence if tail and len(tail) + 1 + len(sentence) <= chunk_chars else sentence
+        else:
+            current = f"{current} {sentence}" if current else sentence
+    if current:
+        chunks.append(current)
+    return chunks
+
+class PrecedentIngestor:
+    """
+    웹 검색 판례 tbl_precedent 적재 (백그라운드)
+    - submit(): 적재 작업 예약 후 즉시 반환 (그래프 실행 지연 없음)
+    - 사건번호 기준 중복 제외 (실행 내 적재 이력 + DB 존재 확인)
+    - 신규 판례 청크 일괄 임베딩 (aembed_documents 1회) 후 사건번호 단위 저장
+    - close(): 진행 중 적재 완료 대기 (main 종료 시 호출)
+    """
+
+    def __init__(self, vector_store: Any, embedding_model: Any, chunk_chars: int = 800, overlap: int = 100):
+        self.vector_store = vector_store
+        self.embedding_model = embedding_model
+        self.chunk_chars = chunk_chars
+        self.overlap = overlap
+        self.ingested = 0
+        self._seen: Set[str] = set()
+        self._pending: Set[asyncio.Task] = set()
+
+    def submit(self, precedents: List[Precedent], hml_pattern: Optional[str]):
+        new = [p for p in precedents if p.case_id and p.case_id != "Unknown" and p.case_id not in self._seen]
+        if not new:
+            return
+        self._seen.update(p.case_id for p in new)
+
+        task = asyncio.create_task(self._ingest(new, hml_pattern))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _ingest(self, precedents: List[Precedent], hml_pattern: Optional[str]):
+        try:
+            existing = await self.vector_store.fetch_existing_precedent_case_ids([p.case_id for p in precedents])
+            precedents = [p for p in precedents if p.case_id not in existing]
+            if not precedents:
+                return
+
+            chunks: List[Dict[str, Any]] = []
+            for p in precedents:
+                for chunk_index, content in enumerate(chunk_text(p.content, self.chunk_chars, self.overlap)):
+                    chunks.append({
+                        "case_id": p.case_id, "content": content, "chunk_index": chunk_index,
+                        "topic": p.topic or "본문", "hml_pattern": hml_pattern, "file_name": p.file_name,
+                        "start_page": p.start_page or "0", "source_id": p.precedent_no,
+                    })
+            if not chunks:
+                return
+
+            vectors = await self.embedding_model.aembed_documents([c["content"] for c in chunks])
+            for chunk, vector in zip(chunks, vectors):
+                chunk["content_vec"] = vector
+
+            saved = 0
+            for p in precedents:
+                case_chunks = [c for c in chunks if c["case_id"] == p.case_id]
+                try:
+                    saved += await self.vector_store.insert_precedent_chunks(p.case_id, case_chunks)
+                except Exception as e:
+                    logger.error(f"[판례 적재] 저장 실패 (사건번호: {p.case_id}): {e}")
+
+            self.ingested += saved
+            logger.info(f"[판례 적재] 웹 검색 판례 {len(precedents)}건, 청크 {saved}건 저장 (누적 {self.ingested}건)")
+        except Exception as e:
+            logger.error(f"[판례 적재] 오류 발생: {e}", exc_info=True)
+
+    async def close(self):
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
@@ -0,0 +1,87 @@
+import asyncio
+from typing import Any, Dict, List, Optional, Set
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+class InfringeRiskWriter:
+    """
+    tbl_infringe_risk 지연 일괄 저장 버퍼 (write-behind)
+    - add(): 버퍼에 적재 후 즉시 반환 (DB 왕복 대기 없음)
+    - batch_size 도달 또는 첫 적재 후 flush_interval초 경과 시 백그라운드 flush
+    - close(): 남은 데이터 flush 후 실패 목록 반환 (main 종료 시 호출)
+    """
+
+    def __init__(self, vector_store: Any, batch_size: int = 200, flush_interval: float = 5.0):
+        self.vector_store = vector_store
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.written = 0
+        self.failed: List[Dict[str, Any]] = []
+        self._buffer: List[Dict[str, Any]] = []
+        self._lock = asyncio.Lock()
+        self._timer: Optional[asyncio.Task] = None
+        self._pending: Set[asyncio.Future] = set()
+
+    async def add(self, risk_data: Dict[str, Any]):
+        """위험군 저장 데이터 적재 (c_tm, ensemble_result, p_trademark_reg_no)"""
+        self._buffer.append(risk_data)
+
+        if len(self._buffer) >= self.batch_size:
+            self._track(self.flush())
+        elif self._timer is None or self._timer.done():
+            self._timer = asyncio.create_task(self._flush_later())
+
+    def flush(self) -> "asyncio.Future[List[Dict[str, Any]]]":
+        """현재 버퍼를 분리해 일괄 저장, 이번 flush의 실패 목록 반환 (await 가능)"""
+        batch, self._buffer = self._buffer, []
+        return asyncio.ensure_future(self._write(batch))
+
+    async def _write(self, batch: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """배치 저장 (flush 간 순차 실행)"""
+        if not batch:
+            return []
+
+        async with self._lock:
+            failed = []
+            try:
+                await self.vector_store.insert_infringe_risks([self.vector_store.infringe_risk_params(r) for r in batch])
+                self.written += len(batch)
+            except Exception as e:
+                # 일괄 저장 실패 시 건별 재시도로 실패 행만 분리
+                logger.warning(f"[위험군 저장] 일괄 저장 실패 ({len(batch)}건), 건별 재시도: {e}")
+                for risk_data in batch:
+                    try:
+                        await self.vector_store.insert_infringe_risks([self.vector_store.infringe_risk_params(risk_data)])
+                        self.written += 1
+                    except Exception as row_error:
+                        failed.append({
+                            "p_trademark_reg_no": risk_data.get("p_trademark_reg_no"),
+                            "c_trademark_no": getattr(risk_data.get("c_tm"), "c_trademark_no", None),
+                            "c_trademark_name": getattr(risk_data.get("c_tm"), "c_trademark_name", None),
+                            "error": str(row_error),
+                        })
+                        logger.error(f"[위험군 저장] 저장 실패 (상표명: {failed[-1]['c_trademark_name']}): {row_error}")
+
+            self.failed.extend(failed)
+            logger.info(f"[위험군 저장] {len(batch) - len(failed)}/{len(batch)}건 저장 (누적 {self.written}건)")
+            return failed
+
+    async def close(self) -> List[Dict[str, Any]]:
+        """타이머 중지, 진행 중 flush 대기, 남은 버퍼 저장 후 전체 실패 목록 반환"""
+        if self._timer is not None and not self._timer.done():
+            self._timer.cancel()
+        self._timer = None
+
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+        await self.flush()
+        return self.failed
+
+    async def _flush_later(self):
+        await asyncio.sleep(self.flush_interval)
+        self._track(self.flush())
+
+    def _track(self, task: asyncio.Future):
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
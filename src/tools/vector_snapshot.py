@@ -0,0 +1,63 @@
+import argparse
+import asyncio
+from datetime import datetime
+from typing import Optional
+from src.utils.db import Database
+from src.container import Container
+from src.configs import model_config
+from src.tools.candidate_engine import load_catalog, merge_catalogs, save_catalog
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+async def refresh_snapshot(directory: str, full: bool = False) -> Optional[str]:
+    """
+    수집 상표 벡터 스냅샷 생성/갱신
+    - 기존 스냅샷이 있으면 c_trademark_ent_date >= watermark 인 행만 조회해 병합 (증분)
+    - full=True 이거나 스냅샷이 없으면 전체 재생성 (삭제된 수집 상표 정리는 전체 재생성 시 반영)
+    """
+    vector_store = Container.get_vector_store()
+    snapshot = None if full else load_catalog(directory)
+    
+    if snapshot is None or not snapshot[1].get('watermark'):
+        catalog, watermark = await vector_store.fetch_collected_catalog()
+        mode = "full"
+    else:
+        base, meta = snapshot
+        since = datetime.fromisoformat(meta['watermark'])
+        delta, delta_watermark = await vector_store.fetch_collected_catalog(
+            since=since, name_dim=base.name_matrix.shape[1], image_dim=base.image_matrix.shape[1])
+        catalog = merge_catalogs(base, delta)
+        watermark = max(since, delta_watermark) if delta_watermark is not None else since
+        mode = "incremental"
+        logger.info(f"[스냅샷] 증분 {len(delta)}건 병합 (기준: {since.isoformat()})")
+    
+    generation_dir = save_catalog(directory, catalog, {
+        "mode": mode,
+        "watermark": watermark.isoformat() if watermark is not None else None,
+        "name_dim": int(catalog.name_matrix.shape[1]),
+        "image_dim": int(catalog.image_matrix.shape[1]),
+        "created": datetime.now().isoformat(),
+    })
+    logger.info(f"[스냅샷] {mode} 저장 완료: {len(catalog)}건 -> {generation_dir}")
+    return generation_dir
+
+async def main(directory: str, full: bool):
+    """수집 상표 벡터 스냅샷 갱신 (야간 배치 전 실행)"""
+    await Database.get_pool()
+    
+    try:
+        await refresh_snapshot(directory, full)
+    finally:
+        await Database.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="수집 상표 벡터 스냅샷(.npy) 생성/갱신")
+    parser.add_argument("--dir", default=model_config.get('db', {}).get('candidate_snapshot_dir'), help="스냅샷 디렉터리 (기본: db.candidate_snapshot_dir)")
+    parser.add_argument("--full", action="store_true", help="전체 재생성")
+    args = parser.parse_args()
+    
+    if not args.dir:
+        parser.error("스냅샷 디렉터리가 지정되지 않았습니다. (--dir 또는 db.candidate_snapshot_dir)")
+    
+    asyncio.run(main(args.dir, args.full))
@@ -1,9 +1,17 @@
 import json
 import base64
-from typing import List, Dict, Any, Optional
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Set, Tuple
+import numpy as np
 from src.utils.db import Database
 from src.model.schema import Precedent, ReasonTrademark
-from src.configs import model_config
+from src.configs import model_config, model_config_version
+from src.utils.fingerprint import image_digest
+from src.utils.ranking import dedupe_precedents, rerank_precedents
+from src.tools.candidate_engine import (
+    CollectedCatalog, class_codes_to_mask, load_catalog, normalize_rows, parse_class_codes, parse_class_mask,
+    search_candidates, vectors_to_matrix,
+)
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -22,142 +30,25 @@ class VectorStore:
         1. 보호 상표 전체 조회
         2. 각 보호 상표에 대해 수집 상표 벡터 검색 (Cosine Distance)
         3. 유사도 threshold 이상인 쌍 반환
+        - db.candidate_engine: sql(보호 상표별 pgvector 쿼리) | matrix(수집 상표 행렬 일괄 연산)
         """
         try:
             pool = await Database.get_pool()
-            results = []
             
-            # pgvector 거리 계산: 1 - cosine_similarity = cosine_distance (<=> operator)
-            # similarity >= threshold  ==>  1 - distance >= threshold  ==>  distance <= 1 - threshold
             sim_threshold = model_config.get('db', {}).get('similar_trademark_threshold', 0.8)
-            distance_threshold = 1.0 - sim_threshold
+            engine = model_config.get('db', {}).get('candidate_engine', 'sql')
             
-            logger.info(f"[DB] 유사 상표 검색 시작 (기준 유사도: {sim_threshold:.2f})")
+            logger.info(f"[DB] 유사 상표 검색 시작 (기준 유사도: {sim_threshold:.2f}, 엔진: {engine})")
             
             async with pool.acquire() as conn:
                 # 1. 관리중인 보호 상표 전체 조회
-                p_query = """
-                    SELECT a.p_trademark_reg_no,
-                           a.p_trademark_name, 
-                           a.p_trademark_type, 
-                           a.p_trademark_class_code, 
-                           a.p_trademark_image, 
-                           a.p_trademark_user_no,
-                           a.p_trademark_name_vec, 
-                           a.p_trademark_image_vec,
-                           string_agg(distinct b.product_name, ', ' order by b.product_name) as p_product_kinds
-                      FROM tbl_protection_trademark a,
-                           tbl_p_trademark_product b
-                     where a.p_trademark_reg_no = b.p_trademark_reg_no 
-                       and a.manage_end_date is null
-                       and exists (select 1 
-                                     from tbl_customer_info z 
-                                    where z.customer_no = a.p_trademark_user_no 
-                                      and z.end_reason is null)
-                     group by a.p_trademark_reg_no
-                """
-                p_rows = await conn.fetch(p_query)
+                p_rows = await conn.fetch(self._PROTECTION_QUERY)
                 logger.info(f"[DB] 보호 상표 {len(p_rows)}건 조회됨")
                 
-                for p_row in p_rows:
-                    # 보호 상표 정보 매핑
-                    p_tm_dict = {
-                        "p_trademark_reg_no"      : p_row["p_trademark_reg_no"],
-                        "p_trademark_name"        : p_row["p_trademark_name"] or "",
-                        "p_trademark_type"        : p_row["p_trademark_type"] or "",
-                        "p_trademark_class_code"  : p_row["p_trademark_class_code"] or "",
-                        "p_trademark_image"       : self._encode_image(p_row["p_trademark_image"]),
-                        "p_trademark_image_vec"   : json.loads(p_row["p_trademark_image_vec"]),
-                        "p_trademark_user_no"     : p_row["p_trademark_user_no"],
-                        "p_product_kinds"         : p_row["p_product_kinds"] or "",
-                    }
-                    
-                    name_vec = p_row["p_trademark_name_vec"] 
-                    image_vec = p_row["p_trademark_image_vec"]
-                    
-                    # 유사 수집 상표 검색
-                    vector_conditions = []
-                    params = []
-                    param_idx = 1
-                    
-                    if name_vec:
-                        vector_conditions.append(f"(c_trademark_name_vec <=> ${param_idx}) <= {distance_threshold}")
-                        params.append(str(name_vec))
-                        param_idx += 1
-                    
-                    if image_vec:
-                        vector_conditions.append(f"(c_trademark_image_vec <=> ${param_idx}) <= {distance_threshold}")
-                        params.append(str(image_vec))
-                        param_idx += 1
-                    
-                    if not vector_conditions:
-                        continue
-                    
-                    class_code_where = []
-                    class_code_where.append(f"({' OR '.join(vector_conditions)})")
-                    
-                    if p_row["p_trademark_class_code"]:
-                        class_code_where.append(f"string_to_array(c_trademark_class_code, '|') && string_to_array(${param_idx}, '|')")
-                        params.append(p_row["p_trademark_class_code"])
-                        param_idx += 1
-                    
-                    where_clause = " AND ".join(class_code_where)
-                    
-                    # 현재 보호 상표에 대해 이미 침해 위험군 테이블에 등록된 수집 상표는 제외
-                    where_clause += f" AND not exists (select 1 from tbl_infringe_risk c where c.p_trademark_reg_no = ${param_idx} and c.c_product_name = a.c_product_name and (c.c_trademark_name = a.c_trademark_name or c.c_trademark_image = a.c_trademark_image))"
-                    params.append(p_row["p_trademark_reg_no"])
-                    param_idx += 1
-
-                    c_query = f"""
-                        SELECT c_trademark_no, 
-                               c_product_name, 
-                               c_product_page_url, 
-                               c_manufacturer_info, 
-                               c_brand_info, 
-                               c_l_category, 
-                               c_m_category, 
-                               c_s_category,                        
-                               c_trademark_type, 
-                               c_trademark_class_code,                        
-                               c_trademark_name, 
-                               c_trademark_name_vec,
-                               c_trademark_image,
-                               c_trademark_image_vec,
-                               c_trademark_ent_date
-                        FROM tbl_collect_trademark a
-                        WHERE {where_clause}
-                        LIMIT 100 
-                    """
-                    logger.info(f"c_query: {c_query}")
-                    c_rows = await conn.fetch(c_query, *params)
-                    
-                    c_tm_list = []
-                    for c_row in c_rows:
-                        c_tm_dict = {
-                            "c_trademark_no"                : c_row["c_trademark_no"],
-                            "c_product_name"                : c_row["c_product_name"] or "",
-                            "c_product_page_url"            : c_row["c_product_page_url"] or "",
-                            "c_manufacturer_info"           : c_row["c_manufacturer_info"] or "",
-                            "c_brand_info"                  : c_row["c_brand_info"] or "",
-                            "c_l_category"                  : c_row["c_l_category"] or "",
-                            "c_m_category"                  : c_row["c_m_category"] or "",
-                            "c_s_category"                  : c_row["c_s_category"] or "",
-                            "c_trademark_type"              : c_row["c_trademark_type"] or "",
-                            "c_trademark_class_code"        : c_row["c_trademark_class_code"] or "",
-                            "c_trademark_name"              : c_row["c_trademark_name"] or "",
-                            "c_trademark_name_vec"          : json.loads(c_row["c_trademark_name_vec"]) if c_row["c_trademark_name_vec"] is not None else [],
-                            "c_trademark_image"             : self._encode_image(c_row["c_trademark_image"]),
-                            "c_trademark_image_vec"         : json.loads(c_row["c_trademark_image_vec"]) if c_row["c_trademark_image_vec"] is not None else [],
-                            "c_trademark_ent_date"          : c_row["c_trademark_ent_date"],
-                        }
-                        c_tm_list.append(c_tm_dict)
-                    
-                    if c_tm_list:
-                        logger.debug(f"[DB] '{p_row['p_trademark_name']}'의 유사 상표 {len(c_tm_list)}건 발견")
-                        results.append({
-                            "protection_trademark": p_tm_dict,
-                            "collected_trademarks": c_tm_list
-                        })
+                if engine == 'matrix':
+                    results = await self._search_candidates_matrix(conn, p_rows, sim_threshold)
+                else:
+                    results = await self._search_candidates_sql(conn, p_rows, sim_threshold)
             
             logger.info(f"[DB] 검색 종료: 총 {len(results)}개 그룹 발견")
             return results
@@ -165,52 +56,577 @@ class VectorStore:
             logger.error(f"[DB] 유사 상표 검색 중 오류: {e}", exc_info=True)
             return []
 
-    async def save_infringe_risk(self, risk_data: Dict[str, Any]):
-        """침해 위험군 테이블 저장"""
-        try:
-            pool = await Database.get_pool()
+    _PROTECTION_QUERY = """
+        SELECT a.p_trademark_reg_no,
+               a.p_trademark_name, 
+               a.p_trademark_type, 
+               a.p_trademark_class_code, 
+               a.p_trademark_class_codes,
+               a.p_trademark_image, 
+               a.p_trademark_user_no,
+               a.p_trademark_name_vec, 
+               a.p_trademark_image_vec,
+               a.p_trademark_dhash,
+               string_agg(distinct b.product_name, ', ' order by b.product_name) as p_product_kinds
+          FROM tbl_protection_trademark a,
+               tbl_p_trademark_product b
+         where a.p_trademark_reg_no = b.p_trademark_reg_no 
+           and a.manage_end_date is null
+           and exists (select 1 
+                         from tbl_customer_info z 
+                        where z.customer_no = a.p_trademark_user_no 
+                          and z.end_reason is null)
+         group by a.p_trademark_reg_no
+    """
+
+    # 수집 상표 상세 정보 컬럼 (벡터 제외)
+    _COLLECTED_INFO_COLUMNS = """
+        c_trademark_no, 
+        c_product_name, 
+        c_product_page_url, 
+        c_manufacturer_info, 
+        c_brand_info, 
+        c_l_category, 
+        c_m_category, 
+        c_s_category,                        
+        c_trademark_type, 
+        c_trademark_class_code,                        
+        c_trademark_name, 
+        c_trademark_image,
+        c_trademark_ent_date,
+        c_trademark_dhash
+    """
+
+    _COLLECTED_COLUMNS = _COLLECTED_INFO_COLUMNS + """,
+        c_trademark_name_vec,
+        c_trademark_image_vec
+    """
+
+    async def _search_candidates_sql(self, conn, p_rows, sim_threshold: float) -> List[Dict[str, Any]]:
+        """보호 상표별 pgvector 쿼리로 후보 검색 (유사도 순 페이지 조회, 보호 상표별 candidate_budget건까지)"""
+        results = []
+        candidate_budget = int(model_config.get('db', {}).get('candidate_budget', 300))
+        
+        for p_row in p_rows:
+            c_tm_list = []
+            async for page in self.iter_candidate_pages(conn, p_row, sim_threshold):
+                c_tm_list.extend(self._collected_row_to_dict(c_row) for c_row in page)
+                if len(c_tm_list) >= candidate_budget:
+                    logger.info(f"[DB] '{p_row['p_trademark_name']}' 후보 {candidate_budget}건 도달, 이후 후보는 다음 배치에서 처리")
+                    c_tm_list = c_tm_list[:candidate_budget]
+                    break
             
-            c_tm = risk_data.get("c_tm")
-            ensemble_result = risk_data.get("ensemble_result")
-            p_trademark_reg_no = risk_data.get("p_trademark_reg_no")
+            if c_tm_list:
+                logger.debug(f"[DB] '{p_row['p_trademark_name']}'의 유사 상표 {len(c_tm_list)}건 발견")
+                results.append({
+                    "protection_trademark": self._protection_row_to_dict(p_row),
+                    "collected_trademarks": c_tm_list
+                })
+        
+        return results
 
-            query = """
-                INSERT INTO tbl_infringe_risk (
-                    c_product_name, c_product_page_url, c_manufacturer_info, c_brand_info, c_l_category, 
-                    c_m_category, c_s_category, c_trademark_type, c_trademark_class_code, c_trademark_name, 
-                    c_trademark_name_vec, c_trademark_image, c_trademark_image_vec, c_trademark_ent_date, visual_score, 
-                    visual_weight, phonetic_score, phonetic_weight, conceptual_score, conceptual_weight,
-                    total_score, risk_level, judge_date,p_trademark_reg_no
-                ) VALUES (
-                    $1, $2, $3, $4, $5, 
-                    $6, $7, $8, $9, $10, 
-                    $11, $12, $13, $14, $15, 
-                    $16, $17, $18, $19, $20,
-                    $21, $22, NOW(), $23
-                )
-            """
+    async def iter_candidate_pages(self, conn, p_row, sim_threshold: float):
+        """
+        보호 상표 1건의 유사 수집 상표를 최소 벡터 거리 오름차순으로 페이지 단위 조회 (keyset pagination)
+        - 정렬 키: (LEAST(상표명 거리, 이미지 거리), c_trademark_no) -> 페이지 경계에서 누락/중복 없음
+        - 페이지 크기: db.candidate_page_size
+        """
+        # pgvector 거리 계산: 1 - cosine_similarity = cosine_distance (<=> operator)
+        # similarity >= threshold  ==>  1 - distance >= threshold  ==>  distance <= 1 - threshold
+        distance_threshold = 1.0 - sim_threshold
+        page_size = int(model_config.get('db', {}).get('candidate_page_size', 100))
+        
+        # 판정 이력 기반 제외 설정
+        verdict_config = model_config.get('verdict', {})
+        use_verdict = verdict_config.get('enabled', False)
+        config_version = model_config_version()
+        
+        name_vec = p_row["p_trademark_name_vec"] 
+        image_vec = p_row["p_trademark_image_vec"]
+        
+        # 유사 수집 상표 검색
+        distance_exprs = []
+        params = []
+        param_idx = 1
+        
+        if name_vec:
+            distance_exprs.append(f"(c_trademark_name_vec <=> ${param_idx})")
+            params.append(str(name_vec))
+            param_idx += 1
+        
+        if image_vec:
+            distance_exprs.append(f"(c_trademark_image_vec <=> ${param_idx})")
+            params.append(str(image_vec))
+            param_idx += 1
+        
+        if not distance_exprs:
+            return
+        
+        vector_conditions = [f"{expr} <= {distance_threshold}" for expr in distance_exprs]
+        # LEAST는 NULL(벡터 없음)을 무시
+        best_distance = distance_exprs[0] if len(distance_exprs) == 1 else f"LEAST({', '.join(distance_exprs)})"
+        
+        class_code_where = []
+        class_code_where.append(f"({' OR '.join(vector_conditions)})")
+        
+        # 상품류 교집합 (정수 배열 GIN 인덱스 사용)
+        p_class_codes = self._protection_class_codes(p_row)
+        if p_class_codes:
+            class_code_where.append(f"c_trademark_class_codes && ${param_idx}::int[]")
+            params.append(p_class_codes)
+            param_idx += 1
+        
+        where_clause = " AND ".join(class_code_where)
+        
+        # 현재 보호 상표에 대해 이미 침해 위험군 테이블에 등록된 수집 상표는 제외 (동일 상품명 + 상표명/이미지 다이제스트 인덱스 조회)
+        where_clause += f" AND not exists (select 1 from tbl_infringe_risk c where c.p_trademark_reg_no = ${param_idx} and c.c_product_name = a.c_product_name and (c.c_name_digest = a.c_name_digest or c.c_image_digest = a.c_image_digest))"
+        params.append(p_row["p_trademark_reg_no"])
+        reg_no_idx = param_idx
+        param_idx += 1
+        
+        # 동일 입력(이미지, 상표명, 설정 버전)으로 유효 기간 내 판정된 쌍은 제외 (Safe 판정 재분석 방지)
+        if use_verdict:
+            where_clause += f""" AND not exists (select 1 from tbl_pair_verdict v 
+                                                  where v.p_trademark_reg_no = ${reg_no_idx} 
+                                                    and v.c_trademark_no = a.c_trademark_no 
+                                                    and v.config_version = ${param_idx} 
+                                                    and v.c_trademark_name = coalesce(a.c_trademark_name, '') 
+                                                    and v.c_image_digest = coalesce(a.c_image_digest, encode(sha256(''::bytea), 'hex')) 
+                                                    and v.judge_date >= NOW() - make_interval(days => ${param_idx + 1}))"""
+            params.append(config_version)
+            params.append(int(verdict_config.get('revisit_days', 30)))
+            param_idx += 2
+
+        c_query = f"""
+            SELECT {self._COLLECTED_COLUMNS},
+                   {best_distance} AS best_distance
+            FROM tbl_collect_trademark a
+            WHERE {where_clause}
+              AND ({best_distance}, c_trademark_no) > (${param_idx}, ${param_idx + 1})
+            ORDER BY best_distance, c_trademark_no
+            LIMIT {page_size} 
+        """
+        logger.info(f"c_query: {c_query}")
+        
+        # 첫 페이지는 모든 행이 통과하는 시작 키 (거리 >= 0)
+        last_key = (-1.0, -1)
+        while True:
+            c_rows = await conn.fetch(c_query, *params, *last_key)
+            if not c_rows:
+                return
+            yield c_rows
+            if len(c_rows) < page_size:
+                return
+            last_key = (c_rows[-1]["best_distance"], c_rows[-1]["c_trademark_no"])
+
+    async def _search_candidates_matrix(self, conn, p_rows, sim_threshold: float) -> List[Dict[str, Any]]:
+        """
+        수집 상표 벡터 카탈로그에 대해 블록 단위 행렬 곱으로 후보 검색
+        - 카탈로그: db.candidate_snapshot_dir 스냅샷(메모리 매핑) + 스냅샷 이후 등록분(DB), 미설정 시 DB 전체 적재
+        - 후보 조건(유사도, 상품류 교집합, 침해 위험군/판정 이력 제외)은 SQL 경로와 동일
+        - 보호 상표별 후보는 유사도 내림차순(동률은 c_trademark_no 오름차순) 상위 candidate_budget건 (SQL 경로와 동일 순서)
+        """
+        db_config = model_config.get('db', {})
+        candidate_budget = int(db_config.get('candidate_budget', 300))
+        block_size = int(db_config.get('candidate_block_size', 8192))
+        
+        # 벡터가 없는 보호 상표는 검색 대상 아님
+        p_rows = [p for p in p_rows if p["p_trademark_name_vec"] or p["p_trademark_image_vec"]]
+        if not p_rows:
+            return []
+        
+        # (카탈로그, 공통 제외 행) 목록
+        catalogs = []
+        snapshot = load_catalog(db_config['candidate_snapshot_dir']) if db_config.get('candidate_snapshot_dir') else None
+        if snapshot is not None:
+            base, meta = snapshot
+            since = datetime.fromisoformat(meta['watermark']) if meta.get('watermark') else None
+            delta, _ = await self.fetch_collected_catalog(
+                since=since, name_dim=base.name_matrix.shape[1], image_dim=base.image_matrix.shape[1], conn=conn)
+            logger.info(f"[DB] 스냅샷 {meta.get('generation')} {len(base)}건 + 이후 등록분 {len(delta)}건 사용")
+            # 스냅샷 이후 갱신된 행은 DB 최신본으로 대체
+            catalogs.append((base, base.rows_of(delta.ids)))
+            catalogs.append((delta, None))
+        else:
+            catalog, _ = await self.fetch_collected_catalog(conn=conn)
+            catalogs.append((catalog, None))
+        
+        name_dim = catalogs[0][0].name_matrix.shape[1]
+        image_dim = catalogs[0][0].image_matrix.shape[1]
+        
+        p_reg_nos = [p["p_trademark_reg_no"] for p in p_rows]
+        excluded_ids = await self._fetch_excluded_candidate_ids(conn, p_reg_nos)
+        
+        p_name_matrix, p_name_valid = normalize_rows(
+            [json.loads(p["p_trademark_name_vec"]) if p["p_trademark_name_vec"] else None for p in p_rows], dim=name_dim)
+        p_image_matrix, p_image_valid = normalize_rows(
+            [json.loads(p["p_trademark_image_vec"]) if p["p_trademark_image_vec"] else None for p in p_rows], dim=image_dim)
+        p_class_masks = np.array([class_codes_to_mask(self._protection_class_codes(p)) for p in p_rows], dtype=np.int64)
+        
+        # 보호 상표별 [(유사도, c_trademark_no, 카탈로그, 행)]
+        hits_by_p = [[] for _ in p_rows]
+        for catalog, common_excluded in catalogs:
+            if len(catalog) == 0:
+                continue
+            p_excluded_rows = [catalog.rows_of(excluded_ids.get(reg_no, ())) for reg_no in p_reg_nos]
+            candidates = search_candidates(
+                catalog,
+                p_name_matrix, p_name_valid,
+                p_image_matrix, p_image_valid,
+                p_class_masks, p_excluded_rows,
+                threshold=sim_threshold,
+                top_k=candidate_budget,
+                block_size=block_size,
+                excluded_rows=common_excluded,
+            )
+            for hits, found in zip(hits_by_p, candidates):
+                hits.extend((score, int(catalog.ids[row]), catalog, row) for row, score in found)
+        
+        for j, hits in enumerate(hits_by_p):
+            hits_by_p[j] = sorted(hits, key=lambda h: (-h[0], h[1]))[:candidate_budget]
+        
+        # 후보 수집 상표 상세 정보 일괄 조회 (벡터는 카탈로그 값 사용)
+        c_nos = sorted({c_no for hits in hits_by_p for _, c_no, _, _ in hits})
+        c_rows = await conn.fetch(
+            f"SELECT {self._COLLECTED_INFO_COLUMNS} FROM tbl_collect_trademark a WHERE c_trademark_no = ANY($1::bigint[])",
+            c_nos,
+        )
+        c_row_by_no = {c_row["c_trademark_no"]: c_row for c_row in c_rows}
+        
+        results = []
+        for p_row, hits in zip(p_rows, hits_by_p):
+            c_tm_list = []
+            for _, c_no, catalog, row in hits:
+                # 카탈로그 적재 이후 삭제된 수집 상표는 제외
+                if c_no not in c_row_by_no:
+                    continue
+                c_tm_dict = self._collected_row_to_dict(c_row_by_no[c_no])
+                c_tm_dict["c_trademark_name_vec"] = catalog.name_vector(row)
+                c_tm_dict["c_trademark_image_vec"] = catalog.image_vector(row)
+                c_tm_list.append(c_tm_dict)
             
+            if c_tm_list:
+                logger.debug(f"[DB] '{p_row['p_trademark_name']}'의 유사 상표 {len(c_tm_list)}건 발견")
+                results.append({
+                    "protection_trademark": self._protection_row_to_dict(p_row),
+                    "collected_trademarks": c_tm_list
+                })
+        
+        return results
+
+    async def fetch_collected_catalog(self,
+                                      since: Optional[datetime] = None,
+                                      name_dim: Optional[int] = None,
+                                      image_dim: Optional[int] = None,
+                                      conn=None) -> Tuple[CollectedCatalog, Optional[datetime]]:
+        """
+        수집 상표 벡터 카탈로그 적재 (c_trademark_no 오름차순)
+        - since 지정 시 c_trademark_ent_date >= since 인 행만 (증분)
+        - 반환: (카탈로그, 적재 행의 최대 c_trademark_ent_date)
+        """
+        if conn is None:
+            pool = await Database.get_pool()
+            async with pool.acquire() as conn:
+                return await self.fetch_collected_catalog(since, name_dim, image_dim, conn)
+        
+        query = """
+            SELECT c_trademark_no,
+                   c_trademark_name_vec,
+                   c_trademark_image_vec,
+                   c_trademark_class_code,
+                   c_trademark_class_codes,
+                   c_trademark_ent_date
+              FROM tbl_collect_trademark
+             where (c_trademark_name_vec is not null or c_trademark_image_vec is not null)
+        """
+        params = []
+        if since is not None:
+            query += " and c_trademark_ent_date >= $1"
+            params.append(since)
+        query += " ORDER BY c_trademark_no"
+        
+        ids, name_vecs, image_vecs, class_masks = [], [], [], []
+        watermark = None
+        
+        # 서버 측 커서로 분할 수신 (텍스트 레코드 전체를 메모리에 올리지 않음)
+        async with conn.transaction():
+            async for r in conn.cursor(query, *params, prefetch=2000):
+                ids.append(r["c_trademark_no"])
+                name_vecs.append(np.array(json.loads(r["c_trademark_name_vec"]), dtype=np.float32) if r["c_trademark_name_vec"] is not None else None)
+                image_vecs.append(np.array(json.loads(r["c_trademark_image_vec"]), dtype=np.float32) if r["c_trademark_image_vec"] is not None else None)
+                class_masks.append(class_codes_to_mask(r["c_trademark_class_codes"]) if r["c_trademark_class_codes"] is not None
+                                   else parse_class_mask(r["c_trademark_class_code"]))
+                if r["c_trademark_ent_date"] is not None and (watermark is None or r["c_trademark_ent_date"] > watermark):
+                    watermark = r["c_trademark_ent_date"]
+        
+        name_matrix, name_inv_norms = vectors_to_matrix(name_vecs, name_dim)
+        image_matrix, image_inv_norms = vectors_to_matrix(image_vecs, image_dim)
+        
+        catalog = CollectedCatalog(
+            ids=np.array(ids, dtype=np.int64),
+            name_matrix=name_matrix, name_inv_norms=name_inv_norms,
+            image_matrix=image_matrix, image_inv_norms=image_inv_norms,
+            class_masks=np.array(class_masks, dtype=np.int64),
+        )
+        logger.info(f"[DB] 수집 상표 벡터 {len(catalog)}건 적재 (상표명 {int((name_inv_norms > 0).sum())}건, 이미지 {int((image_inv_norms > 0).sum())}건)")
+        return catalog, watermark
+
+    async def _fetch_excluded_candidate_ids(self, conn, p_reg_nos: List[str]) -> Dict[str, Set[int]]:
+        """
+        보호 상표별 후보 제외 대상 c_trademark_no (SQL 경로의 not exists 조건과 동일)
+        - 침해 위험군에 동일 상품명 + (상표명 또는 이미지)로 등록된 수집 상표
+        - 동일 입력(상표명, 이미지, 설정 버전)으로 유효 기간 내 판정된 수집 상표
+        """
+        excluded: Dict[str, Set[int]] = {}
+        
+        rows = await conn.fetch("""
+            SELECT distinct c.p_trademark_reg_no, a.c_trademark_no
+              FROM tbl_infringe_risk c
+              join tbl_collect_trademark a
+                on c.c_product_name = a.c_product_name
+               and (c.c_name_digest = a.c_name_digest or c.c_image_digest = a.c_image_digest)
+             where c.p_trademark_reg_no = ANY($1::text[])
+        """, p_reg_nos)
+        for r in rows:
+            excluded.setdefault(r["p_trademark_reg_no"], set()).add(r["c_trademark_no"])
+        
+        verdict_config = model_config.get('verdict', {})
+        if verdict_config.get('enabled', False):
+            rows = await conn.fetch("""
+                SELECT v.p_trademark_reg_no, a.c_trademark_no
+                  FROM tbl_pair_verdict v
+                  join tbl_collect_trademark a
+                    on a.c_trademark_no = v.c_trademark_no
+                   and v.c_trademark_name = coalesce(a.c_trademark_name, '')
+                   and v.c_image_digest = coalesce(a.c_image_digest, encode(sha256(''::bytea), 'hex'))
+                 where v.p_trademark_reg_no = ANY($1::text[])
+                   and v.config_version = $2
+                   and v.judge_date >= NOW() - make_interval(days => $3)
+            """, p_reg_nos, model_config_version(), int(verdict_config.get('revisit_days', 30)))
+            for r in rows:
+                excluded.setdefault(r["p_trademark_reg_no"], set()).add(r["c_trademark_no"])
+        
+        return excluded
+
+    def _protection_class_codes(self, p_row) -> List[int]:
+        """보호 상표 상품류 코드 정수 배열 (백필 전이면 문자열에서 변환)"""
+        if p_row["p_trademark_class_codes"] is not None:
+            return list(p_row["p_trademark_class_codes"])
+        return parse_class_codes(p_row["p_trademark_class_code"])
+
+    def _protection_row_to_dict(self, p_row) -> Dict[str, Any]:
+        """보호 상표 조회 결과 -> ProtectionTrademarkInfo 입력 dict"""
+        return {
+            "p_trademark_reg_no"      : p_row["p_trademark_reg_no"],
+            "p_trademark_name"        : p_row["p_trademark_name"] or "",
+            "p_trademark_type"        : p_row["p_trademark_type"] or "",
+            "p_trademark_class_code"  : p_row["p_trademark_class_code"] or "",
+            "p_trademark_image"       : self._encode_image(p_row["p_trademark_image"]),
+            "p_trademark_image_vec"   : json.loads(p_row["p_trademark_image_vec"]),
+            "p_trademark_user_no"     : p_row["p_trademark_user_no"],
+            "p_product_kinds"         : p_row["p_product_kinds"] or "",
+            "p_trademark_dhash"       : p_row["p_trademark_dhash"],
+        }
+
+    def _collected_row_to_dict(self, c_row) -> Dict[str, Any]:
+        """수집 상표 조회 결과 -> CollectedTrademarkInfo 입력 dict"""
+        return {
+            "c_trademark_no"                : c_row["c_trademark_no"],
+            "c_product_name"                : c_row["c_product_name"] or "",
+            "c_product_page_url"            : c_row["c_product_page_url"] or "",
+            "c_manufacturer_info"           : c_row["c_manufacturer_info"] or "",
+            "c_brand_info"                  : c_row["c_brand_info"] or "",
+            "c_l_category"                  : c_row["c_l_category"] or "",
+            "c_m_category"                  : c_row["c_m_category"] or "",
+            "c_s_category"                  : c_row["c_s_category"] or "",
+            "c_trademark_type"              : c_row["c_trademark_type"] or "",
+            "c_trademark_class_code"        : c_row["c_trademark_class_code"] or "",
+            "c_trademark_name"              : c_row["c_trademark_name"] or "",
+            "c_trademark_name_vec"          : json.loads(c_row["c_trademark_name_vec"]) if c_row.get("c_trademark_name_vec") is not None else [],
+            "c_trademark_image"             : self._encode_image(c_row["c_trademark_image"]),
+            "c_trademark_image_vec"         : json.loads(c_row["c_trademark_image_vec"]) if c_row.get("c_trademark_image_vec") is not None else [],
+            "c_trademark_ent_date"          : c_row["c_trademark_ent_date"],
+            "c_trademark_dhash"             : c_row["c_trademark_dhash"],
+        }
+
+    _INFRINGE_RISK_INSERT = """
+        INSERT INTO tbl_infringe_risk (
+            c_product_name, c_product_page_url, c_manufacturer_info, c_brand_info, c_l_category, 
+            c_m_category, c_s_category, c_trademark_type, c_trademark_class_code, c_trademark_name, 
+            c_trademark_name_vec, c_trademark_image, c_trademark_image_vec, c_trademark_ent_date, visual_score, 
+            visual_weight, phonetic_score, phonetic_weight, conceptual_score, conceptual_weight,
+            total_score, risk_level, judge_date,p_trademark_reg_no,
+            visual_raw_score, phonetic_raw_score, conceptual_raw_score,
+            visual_grade, phonetic_grade, conceptual_grade,
+            c_trademark_no, c_image_digest
+        ) VALUES (
+            $1, $2, $3, $4, $5, 
+            $6, $7, $8, $9, $10, 
+            $11, $12, $13, $14, $15, 
+            $16, $17, $18, $19, $20,
+            $21, $22, NOW(), $23,
+            $24, $25, $26,
+            $27, $28, $29,
+            $30, $31
+        )
+    """
+
+    def infringe_risk_params(self, risk_data: Dict[str, Any]) -> tuple:
+        """
+        위험군 저장 데이터 -> INSERT 파라미터
+        - db.risk_storage: reference 이면 이미지/벡터는 저장하지 않고 c_trademark_no로 참조 (조회는 v_infringe_risk)
+        """
+        c_tm = risk_data.get("c_tm")
+        ensemble_result = risk_data.get("ensemble_result")
+        p_trademark_reg_no = risk_data.get("p_trademark_reg_no")
+        
+        c_image_digest = image_digest(c_tm.c_trademark_image) if c_tm.c_trademark_image else None
+        
+        if model_config.get('db', {}).get('risk_storage', 'copy') == 'reference':
+            c_image_bytes = c_trademark_name_vec = c_trademark_image_vec = None
+        else:
             c_image_bytes = self._decode_image(c_tm.c_trademark_image)
             
             # 빈 리스트 처리
             c_trademark_name_vec = str(c_tm.c_trademark_name_vec) if c_tm.c_trademark_name_vec else None
             c_trademark_image_vec = str(c_tm.c_trademark_image_vec) if c_tm.c_trademark_image_vec else None
+        
+        return (
+            c_tm.c_product_name, c_tm.c_product_page_url, c_tm.c_manufacturer_info, c_tm.c_brand_info, c_tm.c_l_category, 
+            c_tm.c_m_category, c_tm.c_s_category, c_tm.c_trademark_type, c_tm.c_trademark_class_code, c_tm.c_trademark_name, 
+            c_trademark_name_vec, c_image_bytes, c_trademark_image_vec, c_tm.c_trademark_ent_date, ensemble_result.visual_score, 
+            ensemble_result.visual_weight, ensemble_result.phonetic_score, ensemble_result.phonetic_weight, ensemble_result.conceptual_score, ensemble_result.conceptual_weight,
+            ensemble_result.total_score, ensemble_result.risk_level,p_trademark_reg_no,
+            ensemble_result.visual_raw_score, ensemble_result.phonetic_raw_score, ensemble_result.conceptual_raw_score,
+            ensemble_result.visual_grade, ensemble_result.phonetic_grade, ensemble_result.conceptual_grade,
+            c_tm.c_trademark_no, c_image_digest
+        )
+
+    async def save_infringe_risk(self, risk_data: Dict[str, Any]):
+        """침해 위험군 테이블 저장"""
+        try:
+            pool = await Database.get_pool()
+            params = self.infringe_risk_params(risk_data)
+            
+            async with pool.acquire() as conn:
+                await conn.execute(self._INFRINGE_RISK_INSERT, *params)
             
+            logger.info(f"[DB] 위험군 저장 성공 (상표명: {risk_data['c_tm'].c_trademark_name})")
+
+        except Exception as e:
+            logger.error(f"[DB] 위험군 저장 오류: {e}", exc_info=True)
+
+    async def insert_infringe_risks(self, params_list: List[tuple]):
+        """
+        침해 위험군 일괄 저장 (단일 트랜잭션 executemany)
+        - 오류 시 예외를 그대로 전달 (호출측 InfringeRiskWriter에서 실패 행 분리)
+        """
+        pool = await Database.get_pool()
+        async with pool.acquire() as conn:
+            async with conn.transaction():
+                await conn.executemany(self._INFRINGE_RISK_INSERT, params_list)
+
+    async def save_pair_verdict(self, p_trademark_reg_no: str, c_tm: Any, ensemble_result: Any):
+        """상표 쌍 판정 이력 저장 (Safe 포함, 동일 쌍은 최신 판정으로 갱신)"""
+        try:
+            pool = await Database.get_pool()
+            
+            query = """
+                INSERT INTO tbl_pair_verdict (
+                    p_trademark_reg_no, c_trademark_no, c_image_digest, c_trademark_name,
+                    config_version, risk_level, total_score, judge_date
+                ) VALUES ($1, $2, $3, $4, $5, $6, $7, NOW())
+                ON CONFLICT (p_trademark_reg_no, c_trademark_no) DO UPDATE
+                   SET c_image_digest = EXCLUDED.c_image_digest,
+                       c_trademark_name = EXCLUDED.c_trademark_name,
+                       config_version = EXCLUDED.config_version,
+                       risk_level = EXCLUDED.risk_level,
+                       total_score = EXCLUDED.total_score,
+                       judge_date = EXCLUDED.judge_date
+            """
             params = [
-                c_tm.c_product_name, c_tm.c_product_page_url, c_tm.c_manufacturer_info, c_tm.c_brand_info, c_tm.c_l_category, 
-                c_tm.c_m_category, c_tm.c_s_category, c_tm.c_trademark_type, c_tm.c_trademark_class_code, c_tm.c_trademark_name, 
-                c_trademark_name_vec, c_image_bytes, c_trademark_image_vec, c_tm.c_trademark_ent_date, ensemble_result.visual_score, 
-                ensemble_result.visual_weight, ensemble_result.phonetic_score, ensemble_result.phonetic_weight, ensemble_result.conceptual_score, ensemble_result.conceptual_weight,
-                ensemble_result.total_score, ensemble_result.risk_level,p_trademark_reg_no
+                p_trademark_reg_no, c_tm.c_trademark_no, image_digest(c_tm.c_trademark_image), c_tm.c_trademark_name,
+                model_config_version(), ensemble_result.risk_level, ensemble_result.total_score
             ]
             
             async with pool.acquire() as conn:
                 await conn.execute(query, *params)
             
-            logger.info(f"[DB] 위험군 저장 성공 (상표명: {c_tm.c_trademark_name})")
+            logger.debug(f"[DB] 판정 이력 저장 (상표명: {c_tm.c_trademark_name}, 위험도: {ensemble_result.risk_level})")
+        except Exception as e:
+            logger.error(f"[DB] 판정 이력 저장 오류: {e}", exc_info=True)
 
+    async def fetch_rescore_targets(self) -> List[Dict[str, Any]]:
+        """재채점 대상 조회 (원본 점수와 식별력 등급이 저장된 위험군 데이터)"""
+        try:
+            pool = await Database.get_pool()
+            
+            query = """
+                SELECT risk_no,
+                       p_trademark_reg_no,
+                       c_trademark_name,
+                       visual_raw_score,
+                       phonetic_raw_score,
+                       conceptual_raw_score,
+                       visual_grade,
+                       phonetic_grade,
+                       conceptual_grade,
+                       total_score,
+                       risk_level
+                  FROM tbl_infringe_risk
+                 WHERE visual_raw_score is not null
+                   and phonetic_raw_score is not null
+                   and conceptual_raw_score is not null
+                 ORDER BY risk_no
+            """
+            async with pool.acquire() as conn:
+                rows = await conn.fetch(query)
+            
+            logger.info(f"[DB] 재채점 대상 {len(rows)}건 조회됨")
+            return [dict(r) for r in rows]
         except Exception as e:
-            logger.error(f"[DB] 위험군 저장 오류: {e}", exc_info=True)
+            logger.error(f"[DB] 재채점 대상 조회 오류: {e}", exc_info=True)
+            return []
+
+    async def update_rescored_risks(self, rescored: List[Dict[str, Any]]) -> int:
+        """재채점 결과 반영 (점수, 가중치, 총점, 위험도)"""
+        if not rescored:
+            return 0
+        
+        try:
+            pool = await Database.get_pool()
+            
+            query = """
+                UPDATE tbl_infringe_risk
+                   SET visual_score = $2,
+                       visual_weight = $3,
+                       phonetic_score = $4,
+                       phonetic_weight = $5,
+                       conceptual_score = $6,
+                       conceptual_weight = $7,
+                       total_score = $8,
+                       risk_level = $9,
+                       rescore_date = NOW()
+                 WHERE risk_no = $1
+            """
+            params = [
+                (r["risk_no"],
+                 r["visual_score"], r["visual_weight"],
+                 r["phonetic_score"], r["phonetic_weight"],
+                 r["conceptual_score"], r["conceptual_weight"],
+                 r["total_score"], r["risk_level"])
+                for r in rescored
+            ]
+            
+            async with pool.acquire() as conn:
+                async with conn.transaction():
+                    await conn.executemany(query, params)
+            
+            logger.info(f"[DB] 재채점 결과 {len(params)}건 반영")
+            return len(params)
+        except Exception as e:
+            logger.error(f"[DB] 재채점 결과 반영 오류: {e}", exc_info=True)
+            return 0
 
     async def search_reason_trademark(self, query_vec: List[float], top_k: int) -> List[ReasonTrademark]:
         try:
@@ -244,37 +660,204 @@ class VectorStore:
             logger.error(f"[DB] 거절사유 검색 오류: {e}")
             return []
 
+    async def search_reason_trademarks_batch(self, query_vecs: List[List[float]], per_query_k: int, top_k: int = 10) -> List[ReasonTrademark]:
+        """
+        복수 쿼리 거절 사유 검색 (단일 SQL 왕복)
+        - 쿼리별 최근접 per_query_k건 조회 후 patent_id 기준 중복 제거 (최고 유사도 유지)
+        - 유사도 내림차순 상위 top_k건 반환
+        - 조회 오류는 재발생 (호출 측 캐시가 빈 결과를 저장하지 않도록)
+        """
+        if not query_vecs:
+            return []
+
+        try:
+            pool = await Database.get_pool()
+
+            query = """
+                SELECT patent_id, cleaned_content, reason_tags, product_tags, similarity
+                FROM (
+                    SELECT DISTINCT ON (r.patent_id)
+                        r.patent_id, r.cleaned_content, r.reason_tags, r.product_tags, r.similarity
+                    FROM unnest($1::text[]) AS q(query_vec)
+                    CROSS JOIN LATERAL (
+                        SELECT 
+                            patent_id, 
+                            cleaned_content, 
+                            reason_tags, 
+                            product_tags,
+                            1 - (cleaned_content_vec <=> CAST(q.query_vec AS public.vector)) AS similarity
+                        FROM tbl_reason_trademark
+                        ORDER BY cleaned_content_vec <=> CAST(q.query_vec AS public.vector) ASC
+                        LIMIT $2
+                    ) r
+                    ORDER BY r.patent_id, r.similarity DESC
+                ) merged
+                ORDER BY similarity DESC, patent_id
+                LIMIT $3
+            """
+            async with pool.acquire() as conn:
+                rows = await conn.fetch(query, [str(v) for v in query_vecs], per_query_k, top_k)
+
+            return [ReasonTrademark(
+                patent_id = str(row["patent_id"]),
+                cleaned_content = row["cleaned_content"],
+                reason_tags = row["reason_tags"],
+                product_tags = row["product_tags"],
+                similarity_score = row["similarity"],
+            ) for row in rows]
+        except Exception as e:
+            logger.error(f"[DB] 거절사유 일괄 검색 오류: {e}")
+            raise
+
     async def search_precedent(self, query_vec: List[float], target_hml: str, l_limit: int, f_limit: int) :
-        """단수형 메서드: HML 패턴 매칭 포함 판례 검색"""
+        """
+        단수형 메서드: HML 패턴 매칭 포함 판례 검색
+        1. 주제(법리/본문)별 최근접 후보를 limit x precedent.oversample건 조회 (HNSW 인덱스 사용)
+        2. HML 가중치, 본문 인용 감점 적용 후 재정렬하여 주제별 limit건 반환
+        """
         try:
             pool = await Database.get_pool()
+            precedent_config = model_config.get('precedent', {})
+            oversample = int(precedent_config.get('oversample', 3))
             
             query = f"""
                 (SELECT precedent_no, case_id, content, chunk_index, topic, hml_pattern, file_name, start_page, ruling_history,
-                        (1 - (content_vec <=> CAST($1 AS public.vector))) * (CASE WHEN hml_pattern = $2 THEN 1.2 ELSE 1.0 END) as score
+                        content_has_citation, 1 - (content_vec <=> CAST($1 AS public.vector)) as similarity
                     FROM tbl_precedent WHERE topic = '법리' 
-                    ORDER BY score DESC LIMIT $3)
+                    ORDER BY content_vec <=> CAST($1 AS public.vector) LIMIT $2)
                 UNION ALL
                 (SELECT precedent_no, case_id, content, chunk_index, topic, hml_pattern, file_name, start_page, ruling_history,
-                        (1 - (content_vec <=> CAST($1 AS public.vector))) * (CASE WHEN hml_pattern = $2 THEN 1.2 ELSE 1.0 END) *
-                        (CASE WHEN content ~ '대법원|판결|선고|제[0-9]+조' THEN 0.5 ELSE 1.0 END) as score
+                        content_has_citation, 1 - (content_vec <=> CAST($1 AS public.vector)) as similarity
                     FROM tbl_precedent WHERE topic = '본문' 
-                    ORDER BY score DESC LIMIT $4)
+                    ORDER BY content_vec <=> CAST($1 AS public.vector) LIMIT $3)
             """
             
             async with pool.acquire() as conn:
-                rows = await conn.fetch(query, str(query_vec), target_hml, l_limit, f_limit)
+                rows = await conn.fetch(query, str(query_vec), l_limit * oversample, f_limit * oversample)
                 
-                results = []
-                
-                for r in rows:
-                    results.append({**dict(r), "unique_key": f"{r['case_id']}_{r['chunk_index']}"})
-                    
-                return results
+            reranked = rerank_precedents(
+                [dict(r) for r in rows], target_hml, l_limit, f_limit,
+                hml_boost=precedent_config.get('hml_boost', 1.2),
+                citation_penalty=precedent_config.get('citation_penalty', 0.5),
+            )
+            
+            return [{**r, "unique_key": f"{r['case_id']}_{r['chunk_index']}"} for r in reranked]
         except Exception as e:
             logger.error(f"[DB] 판례 검색 오류: {e}")
             return []
 
+    async def search_precedents_batch(self, query_vecs: List[List[float]], target_hml: str, l_limit: int, f_limit: int) -> List[Dict[str, Any]]:
+        """
+        복수 쿼리 판례 검색 (단일 SQL 왕복)
+        1. unnest(쿼리 벡터 배열) WITH ORDINALITY + LATERAL 로 쿼리별/주제별 최근접 후보 조회
+        2. 쿼리별 재정렬(search_precedent 와 동일 규칙) 후 case_id_chunk_index 기준 중복 제거 (최고 점수 유지)
+        """
+        if not query_vecs:
+            return []
+
+        try:
+            pool = await Database.get_pool()
+            precedent_config = model_config.get('precedent', {})
+            oversample = int(precedent_config.get('oversample', 3))
+
+            query = """
+                SELECT q.query_no, p.*
+                FROM unnest($1::text[]) WITH ORDINALITY AS q(query_vec, query_no)
+                CROSS JOIN LATERAL (
+                    (SELECT precedent_no, case_id, content, chunk_index, topic, hml_pattern, file_name, start_page, ruling_history,
+                            content_has_citation, 1 - (content_vec <=> CAST(q.query_vec AS public.vector)) as similarity
+                        FROM tbl_precedent WHERE topic = '법리'
+                        ORDER BY content_vec <=> CAST(q.query_vec AS public.vector) LIMIT $2)
+                    UNION ALL
+                    (SELECT precedent_no, case_id, content, chunk_index, topic, hml_pattern, file_name, start_page, ruling_history,
+                            content_has_citation, 1 - (content_vec <=> CAST(q.query_vec AS public.vector)) as similarity
+                        FROM tbl_precedent WHERE topic = '본문'
+                        ORDER BY content_vec <=> CAST(q.query_vec AS public.vector) LIMIT $3)
+                ) p
+            """
+
+            async with pool.acquire() as conn:
+                rows = await conn.fetch(query, [str(v) for v in query_vecs], l_limit * oversample, f_limit * oversample)
+
+            rows_by_query: Dict[int, List[Dict[str, Any]]] = {}
+            for r in rows:
+                row = dict(r)
+                rows_by_query.setdefault(row.pop("query_no"), []).append(row)
+
+            reranked = []
+            for query_rows in rows_by_query.values():
+                reranked.extend(rerank_precedents(
+                    query_rows, target_hml, l_limit, f_limit,
+                    hml_boost=precedent_config.get('hml_boost', 1.2),
+                    citation_penalty=precedent_config.get('citation_penalty', 0.5),
+                ))
+
+            return dedupe_precedents([{**r, "unique_key": f"{r['case_id']}_{r['chunk_index']}"} for r in reranked])
+        except Exception as e:
+            logger.error(f"[DB] 판례 일괄 검색 오류: {e}")
+            return []
+
+    async def fetch_existing_precedent_case_ids(self, case_ids: List[str]) -> Set[str]:
+        """tbl_precedent 에 이미 존재하는 사건번호"""
+        if not case_ids:
+            return set()
+        pool = await Database.get_pool()
+        async with pool.acquire() as conn:
+            rows = await conn.fetch("SELECT DISTINCT case_id FROM tbl_precedent WHERE case_id = ANY($1::text[])", list(case_ids))
+        return {r["case_id"] for r in rows}
+
+    async def insert_precedent_chunks(self, case_id: str, chunks: List[Dict[str, Any]]) -> int:
+        """
+        판례 1건(사건번호 단위) 청크 일괄 저장
+        - 사건번호 advisory lock + 존재 확인으로 동시 적재 시에도 중복 방지
+        - 반환: 저장 청크 수 (이미 존재하면 0)
+        """
+        query = """
+            INSERT INTO tbl_precedent (
+                case_id, content, chunk_index, topic, hml_pattern, file_name, start_page, content_vec, source, source_id
+            ) VALUES ($1, $2, $3, $4, $5, $6, $7, CAST($8 AS public.vector), 'law_api', $9)
+        """
+        pool = await Database.get_pool()
+        async with pool.acquire() as conn:
+            async with conn.transaction():
+                await conn.execute("SELECT pg_advisory_xact_lock(hashtext($1))", case_id)
+                if await conn.fetchval("SELECT 1 FROM tbl_precedent WHERE case_id = $1 LIMIT 1", case_id):
+                    return 0
+                await conn.executemany(query, [(
+                    case_id, c["content"], c["chunk_index"], c["topic"], c["hml_pattern"],
+                    c["file_name"], c["start_page"], str(c["content_vec"]), c["source_id"],
+                ) for c in chunks])
+        return len(chunks)
+
+    async def fetch_precedent_corpus(self, conn=None) -> Tuple[List[Dict[str, Any]], List[Optional[np.ndarray]]]:
+        """
+        판례 코퍼스 전체 적재 (프로세스 내 판례 인덱스용)
+        - 반환: (판례 행 목록, content_vec 목록) - 행 순서 동일
+        """
+        if conn is None:
+            pool = await Database.get_pool()
+            async with pool.acquire() as conn:
+                return await self.fetch_precedent_corpus(conn)
+        
+        query = """
+            SELECT precedent_no, case_id, content, chunk_index, topic, hml_pattern, file_name, start_page, ruling_history,
+                   content_has_citation, content_vec
+              FROM tbl_precedent
+             where topic in ('법리', '본문')
+             ORDER BY precedent_no
+        """
+        
+        rows, vectors = [], []
+        async with conn.transaction():
+            async for r in conn.cursor(query, prefetch=2000):
+                row = dict(r)
+                content_vec = row.pop("content_vec")
+                rows.append(row)
+                vectors.append(np.array(json.loads(content_vec), dtype=np.float32) if content_vec is not None else None)
+        
+        logger.info(f"[DB] 판례 코퍼스 {len(rows)}건 적재")
+        return rows, vectors
+
     def _encode_image(self, image_bytes: Optional[bytes]) -> Optional[str]:
         """Bytes -> Base64 String"""
         try:
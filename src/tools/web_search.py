@@ -1,8 +1,12 @@
 import asyncio
 import aiohttp
+import json
 import re
 import os
-from typing import List, Dict, Any, Optional
+import sqlite3
+import time
+from urllib.parse import urlsplit
+from typing import List, Dict, Any, Hashable, Optional, Tuple
 from src.model.schema import Precedent
 from src.graph.state import GraphState
 from src.configs import model_config
@@ -34,23 +38,84 @@ def _clean_html(raw_html: str) -> str:
         return raw_html or ""
 
 
+def _parse_precedent_list(data: Dict[str, Any], keywords: List[str]) -> List[str]:
+    """목록 조회 응답 -> 판례일련번호 리스트"""
+    # API 응답 구조: {'PrecSearch': {'prec': [...]}}
+    search_result = data.get("PrecSearch", {})
+    
+    # 검색 결과가 없거나 에러인 경우
+    if not search_result or "prec" not in search_result:
+        logger.info(f"[웹 검색 API] 검색 결과 없음 (키워드: {keywords})")
+        return []
+        
+    prec_list = search_result["prec"]
+    
+    # 검색 결과가 1개일 경우 dict, 여러 개일 경우 list
+    if isinstance(prec_list, dict):
+        prec_list = [prec_list]
+    
+    ids = [item["판례일련번호"] for item in prec_list if "판례일련번호" in item]
+    logger.debug(f"[웹 검색 API] 판례 ID 목록 확보: {len(ids)}건")
+    return ids
+
+def _parse_precedent_detail(prec_no: str, data: Dict[str, Any]) -> Optional[Precedent]:
+    """상세 조회 응답 -> Precedent (본문 없으면 None)"""
+    info = data.get("PrecService", {})
+    
+    if not info:
+        return None
+        
+    # 본문 추출 우선순위: 판결요지 > 판시사항 > 판결내용 > 본문없음
+    content = info.get("판결요지", "")
+    if not content:
+        content = info.get("판시사항", "")
+    # 판결요지/판시사항은 법리, 판결내용은 본문
+    topic = "법리" if content else "본문"
+    if not content:
+        content = info.get("판결내용", "") 
+    
+    if not content:
+        return None
+    
+    cleaned_content = _clean_html(content)
+    
+    return Precedent(
+        precedent_no=prec_no,
+        case_id=info.get("사건번호", "Unknown"),
+        file_name=info.get("사건명", "Unknown"),     # 파일명 대신 사건명 매핑
+        start_page="0",                             # API 결과에는 페이지 정보 없음
+        content=cleaned_content,
+        is_relevant=False, # 초기값
+        topic=topic,
+    )
+
+def _list_params(keywords: List[str], user_id: Optional[str] = None) -> List[Tuple[str, str]]:
+    # 쿼리 스트링 파라미터 구성 (MultiDict 지원을 위해 list of tuples 사용)
+    params = [
+        ("OC", user_id or API_USER_ID),
+        ("target", "prec"),
+        ("type", "JSON"),
+        ("search", "2"),                                    # 본문 검색
+        ("display", str(model_config.get('web_search').get('display'))),  # 검색 결과 출력 건수
+        ("page", "1")
+    ]
+    # 키워드 추가
+    for k in keywords:
+        params.append(("query", k))
+    return params
+
+def _detail_params(prec_no: str, user_id: Optional[str] = None) -> Dict[str, str]:
+    return {
+        "OC": user_id or API_USER_ID,
+        "target": "prec",
+        "ID": prec_no,
+        "type": "JSON"
+    }
+
 async def fetch_precedent_list(session: aiohttp.ClientSession, keywords: List[str]) -> List[str]:
     """판례 목록 조회하여 일련번호 리스트 반환"""
     try:
-        # 쿼리 스트링 파라미터 구성 (MultiDict 지원을 위해 list of tuples 사용)
-        params = [
-            ("OC", API_USER_ID),
-            ("target", "prec"),
-            ("type", "JSON"),
-            ("search", "2"),                                    # 본문 검색
-            ("display", str(model_config.get('web_search').get('display'))),  # 검색 결과 출력 건수
-            ("page", "1")
-        ]
-        # 키워드 추가
-        for k in keywords:
-            params.append(("query", k))
-            
-        async with session.get(SEARCH_URL, params=params) as response:
+        async with session.get(SEARCH_URL, params=_list_params(keywords)) as response:
             
             if response.status != 200:
                 logger.error(f"[웹 검색 API] HTTP 상태 오류: {response.status}")
@@ -62,23 +127,7 @@ async def fetch_precedent_list(session: aiohttp.ClientSession, keywords: List[st
                 logger.error("[웹 검색 API] 응답 JSON 파싱 실패")
                 return []
 
-            # API 응답 구조: {'PrecSearch': {'prec': [...]}}
-            search_result = data.get("PrecSearch", {})
-            
-            # 검색 결과가 없거나 에러인 경우
-            if not search_result or "prec" not in search_result:
-                logger.info(f"[웹 검색 API] 검색 결과 없음 (키워드: {keywords})")
-                return []
-                
-            prec_list = search_result["prec"]
-            
-            # 검색 결과가 1개일 경우 dict, 여러 개일 경우 list
-            if isinstance(prec_list, dict):
-                prec_list = [prec_list]
-            
-            ids = [item["판례일련번호"] for item in prec_list if "판례일련번호" in item]
-            logger.debug(f"[웹 검색 API] 판례 ID 목록 확보: {len(ids)}건")
-            return ids
+            return _parse_precedent_list(data, keywords)
             
     except Exception as e:
         logger.error(f"[웹 검색 API] 목록 조회 중 오류: {e}", exc_info=True)
@@ -87,14 +136,7 @@ async def fetch_precedent_list(session: aiohttp.ClientSession, keywords: List[st
 async def fetch_precedent_detail(session: aiohttp.ClientSession, prec_no: str) -> Optional[Precedent]:
     """개별 판례 본문 상세 조회"""
     try:
-        params = {
-            "OC": API_USER_ID,
-            "target": "prec",
-            "ID": prec_no,
-            "type": "JSON"
-        }
-        
-        async with session.get(SERVICE_URL, params=params) as response:
+        async with session.get(SERVICE_URL, params=_detail_params(prec_no)) as response:
             if response.status != 200:
                 return None
             
@@ -103,32 +145,239 @@ async def fetch_precedent_detail(session: aiohttp.ClientSession, prec_no: str) -
             except Exception:
                 return None
 
-            info = data.get("PrecService", {})
-            
-            if not info:
-                return None
-                
-            # 본문 추출 우선순위: 판결요지 > 판시사항 > 판결내용 > 본문없음
-            content = info.get("판결요지", "")
-            if not content:
-                content = info.get("판시사항", "")
-            if not content:
-                content = info.get("판결내용", "") 
-            
-            if not content:
-                return None
-            
-            cleaned_content = _clean_html(content)
-            
-            return Precedent(
-                precedent_no=prec_no,
-                case_id=info.get("사건번호", "Unknown"),
-                file_name=info.get("사건명", "Unknown"),     # 파일명 대신 사건명 매핑
-                start_page="0",                             # API 결과에는 페이지 정보 없음
-                content=cleaned_content,
-                is_relevant=False # 초기값
-            )
+            return _parse_precedent_detail(prec_no, data)
             
     except Exception as e:
         logger.error(f"[웹 검색 API] 상세 조회 중 오류 ({prec_no}): {e}", exc_info=True)
-        return None
\ No newline at end of file
+        return None
+
+
+class ResponseCache:
+    """
+    API 응답 영구 캐시 (SQLite, 키별 만료 시각)
+    - 목록: 검색 파라미터(OC 제외) 키, 상세: 판례일련번호 키
+    - 로컬 파일 조회는 수 ms 이내이므로 이벤트 루프에서 동기 실행
+    """
+
+    def __init__(self, path: str):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("CREATE TABLE IF NOT EXISTS response_cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)")
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[Any]:
+        row = self._conn.execute("SELECT value, expires_at FROM response_cache WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        if row[1] < time.time():
+            self._conn.execute("DELETE FROM response_cache WHERE key = ?", (key,))
+            self._conn.commit()
+            return None
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any, ttl: float):
+        self._conn.execute(
+            "INSERT OR REPLACE INTO response_cache (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, json.dumps(value, ensure_ascii=False), time.time() + ttl),
+        )
+        self._conn.commit()
+
+    def close(self):
+        self._conn.close()
+
+
+class LawApiClient:
+    """
+    법령정보센터 Open API 클라이언트 (실행 단위 장기 세션)
+    - Keep-alive 연결 풀 (max_connections, 호스트당 max_per_host)
+    - 호스트당 동시 요청 수 제한 (Semaphore)
+    - 목록/상세 응답 영구 캐시 (TTL), 오류 응답은 캐시하지 않음
+    """
+
+    def __init__(self,
+                 search_url: Optional[str] = None,
+                 service_url: Optional[str] = None,
+                 user_id: Optional[str] = None,
+                 max_connections: int = 20,
+                 max_per_host: int = 4,
+                 timeout: float = 15.0,
+                 cache: Optional[ResponseCache] = None,
+                 list_cache_ttl: float = 86400,
+                 detail_cache_ttl: float = 2592000):
+        self.search_url = search_url or SEARCH_URL
+        self.service_url = service_url or SERVICE_URL
+        self.user_id = user_id or API_USER_ID
+        self.max_connections = max_connections
+        self.max_per_host = max_per_host
+        self.timeout = timeout
+        self.cache = cache
+        self.list_cache_ttl = list_cache_ttl
+        self.detail_cache_ttl = detail_cache_ttl
+        self.stats = {"requests": 0, "cache_hits": 0, "errors": 0}
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                limit_per_host=self.max_per_host,
+                keepalive_timeout=30,
+                ttl_dns_cache=300,
+            )
+            self._session = aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=self.timeout))
+        return self._session
+
+    def _semaphore(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc
+        if host not in self._semaphores:
+            self._semaphores[host] = asyncio.Semaphore(self.max_per_host)
+        return self._semaphores[host]
+
+    async def _get_json(self, url: str, params, cache_key: str, ttl: float, counter: Optional[Dict[str, int]]) -> Optional[Dict[str, Any]]:
+        """캐시 조회 -> (미적중 시) 동시성 제한 하에 GET, 정상 JSON 응답만 캐시"""
+        if self.cache is not None:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                self.stats["cache_hits"] += 1
+                return cached
+
+        async with self._semaphore(url):
+            self.stats["requests"] += 1
+            if counter is not None:
+                counter["api_calls"] = counter.get("api_calls", 0) + 1
+            try:
+                async with self._get_session().get(url, params=params) as response:
+                    if response.status != 200:
+                        self.stats["errors"] += 1
+                        logger.error(f"[웹 검색 API] HTTP 상태 오류: {response.status}")
+                        return None
+                    data = await response.json(content_type=None)
+            except Exception as e:
+                self.stats["errors"] += 1
+                logger.error(f"[웹 검색 API] 요청 오류: {e}")
+                return None
+
+        if self.cache is not None and isinstance(data, dict):
+            self.cache.set(cache_key, data, ttl)
+        return data
+
+    async def search(self, keywords: List[str], counter: Optional[Dict[str, int]] = None) -> List[str]:
+        """판례 목록 조회 (판례일련번호 리스트)"""
+        params = _list_params(keywords, self.user_id)
+        cache_key = "list:" + json.dumps([p for p in params if p[0] != "OC"], ensure_ascii=False)
+        data = await self._get_json(self.search_url, params, cache_key, self.list_cache_ttl, counter)
+        if not data:
+            return []
+        try:
+            return _parse_precedent_list(data, keywords)
+        except Exception as e:
+            logger.error(f"[웹 검색 API] 목록 응답 처리 오류: {e}")
+            return []
+
+    async def detail(self, prec_no: str, counter: Optional[Dict[str, int]] = None) -> Optional[Precedent]:
+        """개별 판례 본문 상세 조회"""
+        data = await self._get_json(self.service_url, _detail_params(prec_no, self.user_id), f"detail:{prec_no}", self.detail_cache_ttl, counter)
+        if not data:
+            return None
+        try:
+            return _parse_precedent_detail(prec_no, data)
+        except Exception as e:
+            logger.error(f"[웹 검색 API] 상세 응답 처리 오류 ({prec_no}): {e}")
+            return None
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        if self.cache is not None:
+            self.cache.close()
+        logger.info(f"[웹 검색 API] 클라이언트 종료 | {self.stats}")
+
+
+async def search_precedents(client: LawApiClient, keywords: List[str], counter: Optional[Dict[str, int]] = None) -> List[Precedent]:
+    """
+    키워드 웹 검색 (목록 조회 1회 + 상세 조회 N회, 동시성은 클라이언트가 제한)
+    - counter 지정 시 실제 API 호출 수(api_calls, 캐시 적중 제외) 누적 (투기 실행 비용 계측용)
+    """
+    counter = counter if counter is not None else {}
+    counter.setdefault("api_calls", 0)
+    
+    # 판례 목록 조회
+    prec_ids = await client.search(keywords, counter)
+    
+    if not prec_ids:
+        logger.info("[웹 검색] 외부 API에서 판례를 찾지 못했습니다.")
+        return []
+    
+    # 판례 본문 조회 (병렬 처리)
+    logger.info(f"[웹 검색] 상세 본문 조회 시작 ({len(prec_ids)}건)")
+    results = await asyncio.gather(*[client.detail(pid, counter) for pid in prec_ids])
+    
+    # None 제외 및 유효한 결과만 필터링
+    return [r for r in results if r is not None]
+
+
+class SpeculativeWebSearch:
+    """
+    투기적 웹 검색 (판례 검증과 병렬로 미리 조회)
+    - start(): 검증 시작 시 백그라운드 검색 시작 (쌍 단위 key, 1건만 유지)
+    - take(): 검증 결과 web_search 일 때 결과 회수 (키워드 불일치 시 reuse_on_mismatch 에 따라 재사용/폐기)
+    - cancel(): 검증 결과가 web_search 가 아니면 취소
+    - stats: started / used / cancelled / discarded 건수, 사용/낭비 API 호출 수
+    """
+
+    def __init__(self, client: LawApiClient):
+        self.client = client
+        self._tasks: Dict[Hashable, Tuple[List[str], Dict[str, int], asyncio.Task]] = {}
+        self.stats = {"started": 0, "used": 0, "cancelled": 0, "discarded": 0, "used_api_calls": 0, "wasted_api_calls": 0}
+
+    def start(self, key: Hashable, keywords: List[str]) -> bool:
+        if not keywords or key in self._tasks:
+            return False
+        counter = {"api_calls": 0}
+        self._tasks[key] = (list(keywords), counter, asyncio.create_task(search_precedents(self.client, keywords, counter)))
+        self.stats["started"] += 1
+        logger.info(f"[투기 웹 검색] 시작: 키워드={keywords}")
+        return True
+
+    def cancel(self, key: Hashable):
+        entry = self._tasks.pop(key, None)
+        if entry is None:
+            return
+        _, counter, task = entry
+        task.cancel()
+        self.stats["cancelled"] += 1
+        self.stats["wasted_api_calls"] += counter["api_calls"]
+        logger.info(f"[투기 웹 검색] 취소 (API 호출 {counter['api_calls']}회 낭비) | 누적 {self.stats}")
+
+    async def take(self, key: Hashable, keywords: List[str], reuse_on_mismatch: bool = False) -> Optional[List[Precedent]]:
+        """
+        투기 검색 결과 회수 (진행 중이면 완료 대기, 사용 불가 시 None)
+        - 키워드 불일치 시 폐기 (reuse_on_mismatch=True 여도 검색어 단어가 하나도 겹치지 않으면 폐기)
+        """
+        entry = self._tasks.pop(key, None)
+        if entry is None:
+            return None
+        spec_keywords, counter, task = entry
+
+        overlaps = bool({t for k in keywords for t in k.split()} & {t for k in spec_keywords for t in k.split()})
+        if list(keywords) != spec_keywords and not (reuse_on_mismatch and overlaps):
+            task.cancel()
+            self.stats["discarded"] += 1
+            self.stats["wasted_api_calls"] += counter["api_calls"]
+            logger.info(f"[투기 웹 검색] 키워드 불일치로 폐기 ({spec_keywords} != {keywords}) | 누적 {self.stats}")
+            return None
+
+        try:
+            precedents = await task
+        except (asyncio.CancelledError, Exception) as e:
+            self.stats["discarded"] += 1
+            self.stats["wasted_api_calls"] += counter["api_calls"]
+            logger.warning(f"[투기 웹 검색] 결과 회수 실패: {e}")
+            return None
+
+        self.stats["used"] += 1
+        self.stats["used_api_calls"] += counter["api_calls"]
+        logger.info(f"[투기 웹 검색] 결과 사용: {len(precedents)}건 | 누적 {self.stats}")
+        return precedents
@@ -0,0 +1,72 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+class MemoCache:
+    """
+    프로세스 내 비동기 메모이제이션 캐시 (LRU + TTL)
+    - get_or_compute(): 캐시 적중 시 즉시 반환, 동일 키 동시 요청은 진행 중 작업 1건을 공유
+    - 계산 중 예외는 캐시하지 않음 (다음 요청 시 재계산)
+    """
+
+    def __init__(self, name: str, maxsize: int = 256, ttl: Optional[float] = None):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """만료되지 않은 캐시 값 조회 (없으면 default)"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return default
+
+        value, expires_at = entry
+        if expires_at is not None and expires_at < time.monotonic():
+            del self._entries[key]
+            return default
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any):
+        """캐시 저장 (maxsize 초과 시 가장 오래 사용되지 않은 항목 제거)"""
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    async def get_or_compute(self, key: Hashable, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """캐시 조회, 미적중 시 compute() 결과를 저장 후 반환"""
+        sentinel = object()
+        value = self.get(key, sentinel)
+        if value is not sentinel:
+            self.hits += 1
+            logger.debug(f"[캐시:{self.name}] 적중 (hit {self.hits} / miss {self.misses})")
+            return value
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.hits += 1
+            return await asyncio.shield(inflight)
+
+        self.misses += 1
+        future = asyncio.ensure_future(compute())
+        self._inflight[key] = future
+        try:
+            value = await asyncio.shield(future)
+            self.set(key, value)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+    def clear(self):
+        self._entries.clear()
@@ -0,0 +1,34 @@
+import base64
+import hashlib
+import re
+from typing import Optional, Union
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+def image_to_bytes(image: Optional[Union[str, bytes, memoryview]]) -> bytes:
+    """Base64 문자열 / bytes / memoryview -> bytes (None은 빈 bytes)"""
+    if image is None:
+        return b""
+    if isinstance(image, memoryview):
+        return image.tobytes()
+    if isinstance(image, bytes):
+        return image
+    try:
+        return base64.b64decode(image)
+    except Exception as e:
+        logger.warning(f"이미지 디코딩 실패 (원본 문자열로 해시): {e}")
+        return image.encode('utf-8')
+
+def image_digest(image: Optional[Union[str, bytes, memoryview]]) -> str:
+    """
+    이미지 SHA-256 다이제스트 (hex)
+    DB 측 encode(sha256(coalesce(image, ''::bytea)), 'hex') 와 동일한 값
+    """
+    return hashlib.sha256(image_to_bytes(image)).hexdigest()
+
+def normalize_trademark_name(name: Optional[str]) -> str:
+    """상표명 정규화 (소문자, 공백/특수문자 제거)"""
+    if not name:
+        return ""
+    return re.sub(r'[\W_]+', '', name.lower())
@@ -0,0 +1,65 @@
+import io
+from typing import Dict, Optional, Union
+import numpy as np
+from src.utils.fingerprint import image_digest, image_to_bytes
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 이미지 다이제스트 -> dHash (외관/관념 노드, 중복 클러스터링, 동시 클러스터 간 재사용)
+_DHASH_CACHE: Dict[str, Optional[int]] = {}
+_DHASH_CACHE_MAX = 4096
+
+def dhash(image: Optional[Union[str, bytes, memoryview]], hash_size: int = 8) -> Optional[int]:
+    """
+    Difference Hash (dHash) 계산
+    - 그레이스케일 (hash_size+1) x hash_size 축소 후 인접 픽셀 밝기 차이를 비트로 인코딩
+    - 재인코딩/리사이즈/경미한 크롭에 강건한 64비트 지각 해시
+    - PostgreSQL bigint 저장을 위해 signed 64비트 정수로 반환
+    """
+    try:
+        from PIL import Image
+    except ImportError:
+        logger.warning("Pillow 모듈을 찾을 수 없어 이미지 해시 계산을 건너뜁니다.")
+        return None
+
+    try:
+        image_bytes = image_to_bytes(image)
+        if not image_bytes:
+            return None
+
+        with Image.open(io.BytesIO(image_bytes)) as img:
+            # 투명 배경(PNG)은 흰색으로 합성하여 배경색 차이에 의한 해시 변동 방지
+            if img.mode in ("RGBA", "LA", "P"):
+                img = img.convert("RGBA")
+                background = Image.new("RGBA", img.size, (255, 255, 255, 255))
+                img = Image.alpha_composite(background, img)
+            gray = img.convert("L").resize((hash_size + 1, hash_size), Image.LANCZOS)
+
+        pixels = np.asarray(gray, dtype=np.int16)
+        diff = (pixels[:, 1:] > pixels[:, :-1]).flatten()
+
+        value = 0
+        for bit in diff:
+            value = (value << 1) | int(bit)
+
+        # unsigned -> signed 64비트 (bigint)
+        if value >= 1 << 63:
+            value -= 1 << 64
+        return value
+    except Exception as e:
+        logger.warning(f"이미지 해시 계산 실패: {e}")
+        return None
+
+def cached_dhash(image: Optional[Union[str, bytes, memoryview]]) -> Optional[int]:
+    """dHash (이미지 SHA-256 다이제스트 기준 캐시, 상한 초과 시 비움)"""
+    key = image_digest(image)
+    if key not in _DHASH_CACHE:
+        if len(_DHASH_CACHE) >= _DHASH_CACHE_MAX:
+            _DHASH_CACHE.clear()
+        _DHASH_CACHE[key] = dhash(image)
+    return _DHASH_CACHE[key]
+
+def hamming_distance(hash_a: int, hash_b: int) -> int:
+    """두 64비트 해시 간 해밍 거리"""
+    return bin((hash_a ^ hash_b) & ((1 << 64) - 1)).count("1")
@@ -7,38 +7,54 @@ import mimetypes
 
 logger = get_logger(__name__)
 
+def _build_messages(system_prompt: str, user_prompt: str, detail_prompt: str, image_byte_array=None) -> list:
+    if image_byte_array:
+        image_url = get_image_url_from_bytea(image_byte_array)
+        
+        logger.info(f"[LLM] 이미지 URL: {image_url[:100]}")
+        
+        human_message = HumanMessage(content=[
+            {"type": "text", "text": user_prompt},
+            {"type": "image_url", "image_url": {"url": image_url, "detail": detail_prompt}},
+        ])
+        logger.debug("[LLM] 이미지 입력 포함 호출")
+    else:
+        human_message = HumanMessage(content=[
+            {"type": "text", "text": user_prompt},
+        ])            
+    
+    # 로깅을 위해 프롬프트 일부 출력 (너무 길면 잘림)
+    log_prompt = user_prompt[:100].replace('\n', ' ')
+    logger.info(f"[LLM] 생성 요청: {log_prompt}...")
+    
+    return [SystemMessage(content=system_prompt), human_message]
+
+
+def _response_text(response) -> str:
+    #raw = response.choices[0].message.content.strip()
+    raw = response.content.strip()
+    clean_text = raw[:100].replace('\n', ' ')
+    logger.info(f"[LLM] 생성 응답: {clean_text}...")
+    return raw
+
+
 def generate_text(model : AzureChatOpenAI, system_prompt: str, user_prompt: str, detail_prompt: str, image_byte_array=None):
     try:
-        if image_byte_array:
-            image_url = get_image_url_from_bytea(image_byte_array)
-            
-            logger.info(f"[LLM] 이미지 URL: {image_url[:100]}")
-            
-            human_message = HumanMessage(content=[
-                {"type": "text", "text": user_prompt},
-                {"type": "image_url", "image_url": {"url": image_url, "detail": detail_prompt}},
-            ])
-            logger.debug("[LLM] 이미지 입력 포함 호출")
-        else:
-            human_message = HumanMessage(content=[
-                {"type": "text", "text": user_prompt},
-            ])            
-            
         if model:
-            # 로깅을 위해 프롬프트 일부 출력 (너무 길면 잘림)
-            log_prompt = user_prompt[:100].replace('\n', ' ')
-            logger.info(f"[LLM] 생성 요청: {log_prompt}...")
-            
-            response = model.invoke([
-                SystemMessage(content=system_prompt),
-                human_message
-            ])
-            #raw = response.choices[0].message.content.strip()
-            raw = response.content.strip()
-            clean_text = raw[:100].replace('\n', ' ')
-            logger.info(f"[LLM] 생성 응답: {clean_text}...")
-            
-            return raw
+            response = model.invoke(_build_messages(system_prompt, user_prompt, detail_prompt, image_byte_array))
+            return _response_text(response)
+    except Exception as e:
+        logger.error(f"[LLM] 텍스트 생성 중 오류: {e}", exc_info=True)
+        return ""
+    return ""
+
+
+async def agenerate_text(model : AzureChatOpenAI, system_prompt: str, user_prompt: str, detail_prompt: str, image_byte_array=None):
+    """generate_text 비동기 버전 (async 노드에서 이벤트 루프를 막지 않도록 ainvoke 사용)"""
+    try:
+        if model:
+            response = await model.ainvoke(_build_messages(system_prompt, user_prompt, detail_prompt, image_byte_array))
+            return _response_text(response)
     except Exception as e:
         logger.error(f"[LLM] 텍스트 생성 중 오류: {e}", exc_info=True)
         return ""
@@ -0,0 +1,117 @@
+import math
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+from src.configs import model_config
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+TRUNCATION_MARK = " …(중략)"
+
+@lru_cache(maxsize=4)
+def _encoding(name: str):
+    """tiktoken 인코딩 로드 (BPE 파일 다운로드 불가 등 실패 시 None -> 문자 수 기반 추정)"""
+    try:
+        import tiktoken
+        return tiktoken.get_encoding(name)
+    except Exception as e:
+        logger.warning(f"[프롬프트 예산] tiktoken 인코딩 로드 실패 (문자 수 기반 추정 사용): {e}")
+        return None
+
+def _budget_config() -> Dict[str, Any]:
+    return model_config.get('prompt_budget', {}) or {}
+
+def count_tokens(text: Optional[str]) -> int:
+    """토큰 수 (prompt_budget.encoding 기준, 인코딩 로드 실패 시 chars_per_token 으로 추정)"""
+    if not text:
+        return 0
+    config = _budget_config()
+    encoding = _encoding(config.get('encoding', 'o200k_base'))
+    if encoding is None:
+        return math.ceil(len(text) / float(config.get('chars_per_token', 1.5)))
+    return len(encoding.encode(text))
+
+def truncate_to_tokens(text: Optional[str], max_tokens: int) -> str:
+    """max_tokens 이내로 앞부분만 유지 (잘린 경우 중략 표시 포함)"""
+    if not text or count_tokens(text) <= max_tokens:
+        return text or ""
+    # 중략 표시 토큰 포함하여 max_tokens 이내
+    max_tokens -= count_tokens(TRUNCATION_MARK)
+    if max_tokens <= 0:
+        return ""
+
+    config = _budget_config()
+    encoding = _encoding(config.get('encoding', 'o200k_base'))
+    if encoding is not None:
+        return encoding.decode(encoding.encode(text)[:max_tokens]) + TRUNCATION_MARK
+
+    # 추정 모드: 문자 단위 이분 탐색
+    low, high = 0, len(text)
+    while low < high:
+        mid = (low + high + 1) // 2
+        if count_tokens(text[:mid]) <= max_tokens:
+            low = mid
+        else:
+            high = mid - 1
+    return text[:low] + TRUNCATION_MARK
+
+def fit_precedents(precedents: List[Dict[str, Any]],
+                   budget: int,
+                   max_chunk_tokens: int,
+                   min_chunk_tokens: int = 100) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    판례 목록(순위순)을 토큰 예산에 맞춤
+    - 판례별 content 를 max_chunk_tokens 로 절단
+    - 상위 판례부터 누적, 예산 초과 지점의 판례는 남은 예산(min_chunk_tokens 이상)으로 절단 후 이후 판례 제외
+    - 항상 상위 연속 구간만 유지 -> 프롬프트 인덱스(판례 N)가 원래 목록 인덱스와 동일
+    - 반환: (유지 판례, 기록 {kept, truncated, dropped, tokens, budget})
+    """
+    kept, truncated = [], []
+    used = 0
+
+    for i, p in enumerate(precedents):
+        content = p.get("content") or ""
+        tokens = count_tokens(content)
+        limit = min(max_chunk_tokens, budget - used)
+
+        if tokens > limit:
+            if limit < min_chunk_tokens:
+                break
+            content = truncate_to_tokens(content, limit)
+            tokens = count_tokens(content)
+            truncated.append(p.get("case_id"))
+
+        kept.append({**p, "content": content})
+        used += tokens
+
+    dropped = [p.get("case_id") for p in precedents[len(kept):]]
+    return kept, {"kept": len(kept), "truncated": truncated, "dropped": dropped, "tokens": used, "budget": budget}
+
+def fit_precedent_context(context: Dict[str, Any], task: str) -> Dict[str, Any]:
+    """프롬프트 컨텍스트의 precedents 를 작업별 예산(prompt_budget.<task>)에 맞춘 새 컨텍스트 반환"""
+    task_config = _budget_config().get(task)
+    precedents = context.get("precedents") or []
+    if not task_config or not precedents:
+        return context
+
+    kept, record = fit_precedents(
+        precedents,
+        budget=int(task_config.get('precedent_tokens', 8000)),
+        max_chunk_tokens=int(task_config.get('max_chunk_tokens', 800)),
+        min_chunk_tokens=int(task_config.get('min_chunk_tokens', 100)),
+    )
+
+    if record["truncated"] or record["dropped"]:
+        logger.info(f"[프롬프트 예산] {task}: 판례 {record['kept']}/{len(precedents)}건 유지, "
+                    f"절단 {len(record['truncated'])}건, 토큰 {record['tokens']}/{record['budget']}, "
+                    f"제외 사건번호 {record['dropped']}")
+    return {**context, "precedents": kept}
+
+def completion_token_limit(prompt_tokens: int, max_tokens: int, context_window: Optional[int], margin: int = 256) -> int:
+    """컨텍스트 윈도우 내 생성 가능 토큰 수 (max_tokens 상한, 최소 1)"""
+    if not context_window:
+        return max_tokens
+    available = context_window - prompt_tokens - margin
+    if available < max_tokens:
+        logger.warning(f"[프롬프트 예산] 프롬프트 {prompt_tokens}토큰으로 생성 한도 축소 ({max_tokens} -> {max(available, 1)})")
+    return max(1, min(max_tokens, available))
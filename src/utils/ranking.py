@@ -0,0 +1,53 @@
+import re
+from typing import Any, Dict, List, Optional
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 판결 인용 표현 (migrations/007 content_has_citation 과 동일 패턴)
+CITATION_PATTERN = re.compile(r'대법원|판결|선고|제[0-9]+조')
+
+def has_citation(content: Optional[str]) -> bool:
+    """본문 청크의 판결 인용 표현 포함 여부"""
+    return bool(content) and CITATION_PATTERN.search(content) is not None
+
+def rerank_precedents(rows: List[Dict[str, Any]],
+                      target_hml: str,
+                      l_limit: int,
+                      f_limit: int,
+                      hml_boost: float = 1.2,
+                      citation_penalty: float = 0.5) -> List[Dict[str, Any]]:
+    """
+    판례 후보 재정렬 (주제별 최근접 후보 -> 최종 점수 상위 l_limit / f_limit건)
+    - score = similarity x (HML 패턴 일치 시 hml_boost) x (본문 청크 인용 표현 포함 시 citation_penalty)
+    - rows: similarity, topic, hml_pattern, content (또는 content_has_citation) 포함
+    """
+    ranked = {"법리": [], "본문": []}
+
+    for row in rows:
+        topic = row.get("topic")
+        if topic not in ranked:
+            continue
+
+        score = row["similarity"] * (hml_boost if row.get("hml_pattern") == target_hml else 1.0)
+        if topic == "본문":
+            citation = row.get("content_has_citation")
+            if citation is None:
+                citation = has_citation(row.get("content"))
+            if citation:
+                score *= citation_penalty
+
+        ranked[topic].append({**row, "score": score})
+
+    legal = sorted(ranked["법리"], key=lambda r: r["score"], reverse=True)[:l_limit]
+    fact = sorted(ranked["본문"], key=lambda r: r["score"], reverse=True)[:f_limit]
+    return legal + fact
+
+def dedupe_precedents(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """unique_key(case_id_chunk_index) 기준 중복 제거 (최고 score 유지, score 내림차순 반환)"""
+    best: Dict[str, Dict[str, Any]] = {}
+    for row in rows:
+        kept = best.get(row["unique_key"])
+        if kept is None or row["score"] > kept["score"]:
+            best[row["unique_key"]] = row
+    return sorted(best.values(), key=lambda r: r["score"], reverse=True)
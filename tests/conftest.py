@@ -3,6 +3,7 @@ import os
 from pathlib import Path
 from datetime import datetime
 import pytest
+import pytest_asyncio
 
 # 프로젝트 루트 디렉토리를 sys.path에 추가하여 src 모듈을 import 할 수 있게 함
 project_root = Path(__file__).parent.parent
@@ -81,3 +82,19 @@ def mock_state(mock_protection_trademark, mock_collected_trademark, mock_ensembl
         "regeneration_count": 0,
         "is_infringement_found": False
     }
+
+@pytest_asyncio.fixture
+async def fake_law_api():
+    """법령정보센터 API 로컬 대역 서버 팩토리 (테스트 종료 시 일괄 종료)"""
+    from tests.fakes.law_api_server import FakeLawApi
+
+    servers = []
+
+    async def start(**kwargs) -> FakeLawApi:
+        server = await FakeLawApi(**kwargs).__aenter__()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        await server.__aexit__(None, None, None)
@@ -0,0 +1,221 @@
+"""
+법령정보센터 Open API 로컬 대역 서버 (lawSearch.do / lawService.do)
+- fetch_precedent_list / fetch_precedent_detail / LawApiClient 가 쓰는 JSON 형태를 그대로 응답
+- 지연 분포, 오류율(HTTP 500), 무응답(타임아웃 유도), 결과 1건 시 dict 응답 특성 재현
+- 주입 여부/지연은 (seed, 경로, 파라미터, 동일 요청 반복 횟수)로 결정 -> 동시 실행 순서와 무관하게 재현 가능
+
+사용:
+    async with FakeLawApi(latency=lognormal(0.05, 0.5), error_rate=0.1) as api:
+        client = LawApiClient(search_url=api.search_url, service_url=api.service_url, user_id="test")
+
+단독 실행 (부하 시험용, OPEN_API_SEARCH_URL / OPEN_API_SERVICE_URL 을 이 서버로 지정):
+    python -m tests.fakes.law_api_server --port 8081 --latency lognormal:0.2:0.5 --error-rate 0.05
+"""
+import argparse
+import asyncio
+import math
+import random
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+Latency = Callable[[random.Random], float]
+
+# 가상 판례 본문 생성용 어휘 (상표 사건 위주)
+_TERMS = ["상표", "호칭", "외관", "관념", "유사", "혼동", "식별력", "지정상품", "등록무효", "거절결정",
+          "저명", "희석", "부정경쟁", "도형", "결합상표", "요부", "출처", "수요자", "사용", "취소"]
+
+
+def constant(seconds: float) -> Latency:
+    return lambda rng: seconds
+
+
+def uniform(low: float, high: float) -> Latency:
+    return lambda rng: rng.uniform(low, high)
+
+
+def lognormal(median: float, sigma: float) -> Latency:
+    """중앙값 median, 로그 표준편차 sigma (꼬리 지연 재현용)"""
+    return lambda rng: rng.lognormvariate(math.log(median), sigma) if median > 0 else 0.0
+
+
+def parse_latency(spec: str) -> Latency:
+    """'0.1' | 'uniform:0.05:0.2' | 'lognormal:0.1:0.5' -> Latency"""
+    kind, *args = spec.split(":")
+    if not args:
+        return constant(float(kind))
+    factories = {"constant": constant, "uniform": uniform, "lognormal": lognormal}
+    return factories[kind](*map(float, args))
+
+
+def build_corpus(size: int, seed: int = 0, body_only_rate: float = 0.1) -> Dict[str, Dict[str, str]]:
+    """판례일련번호 -> 상세 필드 (body_only_rate 비율은 판결요지/판시사항 없이 판결내용만)"""
+    rng = random.Random(seed)
+    corpus = {}
+    for i in range(size):
+        prec_no = str(100000 + i)
+        terms = rng.sample(_TERMS, 5)
+        text = f"{terms[0]} 및 {terms[1]}에 관하여, 양 상표는 {terms[2]}·{terms[3]}이 {terms[4]}하다.<br/>"
+        info = {
+            "판례정보일련번호": prec_no,
+            "사건명": f"{terms[0]} {terms[-1]}",
+            "사건번호": f"20{10 + i % 15}후{1000 + i}",
+            "선고일자": f"20{10 + i % 15}0{1 + i % 9}15",
+            "법원명": "대법원",
+        }
+        if rng.random() < body_only_rate:
+            info["판결내용"] = f"<p>【이유】 {text}</p>"
+        else:
+            info["판시사항"] = f"<p>{text}</p>"
+            info["판결요지"] = f"<p>[1] {text} [2] 따라서 {terms[0]}은 {terms[4]}하다.</p>"
+        corpus[prec_no] = info
+    return corpus
+
+
+class FakeLawApi:
+    """
+    law.go.kr 판례 API 대역
+    - latency: 요청당 지연 (constant / uniform / lognormal 또는 rng -> 초 callable)
+    - error_rate: HTTP 500 응답 비율, hang_rate: hang_sec 동안 무응답 비율 (클라이언트 타임아웃 유도)
+    - single_as_dict: 검색 결과 1건이면 prec 를 dict 로 응답 (실제 API 특성)
+    - stats: 경로별 요청 수, 주입된 오류/무응답 수, 최대 동시 처리 수 (peak_in_flight)
+    """
+
+    def __init__(self,
+                 corpus: Optional[Dict[str, Dict[str, str]]] = None,
+                 corpus_size: int = 50,
+                 latency: Optional[Latency] = None,
+                 error_rate: float = 0.0,
+                 hang_rate: float = 0.0,
+                 hang_sec: float = 30.0,
+                 single_as_dict: bool = True,
+                 seed: int = 0):
+        self.corpus = corpus if corpus is not None else build_corpus(corpus_size, seed)
+        self.latency = latency or constant(0.0)
+        self.error_rate = error_rate
+        self.hang_rate = hang_rate
+        self.hang_sec = hang_sec
+        self.single_as_dict = single_as_dict
+        self.seed = seed
+        self.stats: Dict[str, int] = defaultdict(int)
+        self._in_flight = 0
+        self._seen: Dict[str, int] = defaultdict(int)
+        self._server: Optional[TestServer] = None
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get("/DRF/lawSearch.do", self._search)
+        app.router.add_get("/DRF/lawService.do", self._service)
+        return app
+
+    async def __aenter__(self) -> "FakeLawApi":
+        self._server = TestServer(self.app())
+        await self._server.start_server()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self._server.close()
+
+    @property
+    def search_url(self) -> str:
+        return str(self._server.make_url("/DRF/lawSearch.do"))
+
+    @property
+    def service_url(self) -> str:
+        return str(self._server.make_url("/DRF/lawService.do"))
+
+    def _rng(self, request: web.Request) -> random.Random:
+        """요청 단위 난수 (OC 제외 파라미터 + 반복 횟수 기준, 도착 순서와 무관)"""
+        key = request.path + "?" + "&".join(f"{k}={v}" for k, v in sorted(request.query.items()) if k != "OC")
+        self._seen[key] += 1
+        return random.Random(f"{self.seed}:{key}:{self._seen[key]}")
+
+    async def _inject(self, request: web.Request) -> Optional[web.Response]:
+        """지연/오류/무응답 주입 (정상 진행 시 None)"""
+        rng = self._rng(request)
+        self.stats[request.path] += 1
+        self._in_flight += 1
+        self.stats["peak_in_flight"] = max(self.stats["peak_in_flight"], self._in_flight)
+        try:
+            roll = rng.random()
+            if roll < self.hang_rate:
+                self.stats["hangs"] += 1
+                await asyncio.sleep(self.hang_sec)
+            await asyncio.sleep(max(0.0, self.latency(rng)))
+            if roll >= 1.0 - self.error_rate:
+                self.stats["errors"] += 1
+                return web.Response(status=500, text="<html>일시적인 오류</html>", content_type="text/html")
+            return None
+        finally:
+            self._in_flight -= 1
+
+    def _matches(self, queries: List[str]) -> List[str]:
+        """모든 검색어가 본문 어딘가에 포함된 판례 (검색어 내 공백은 AND)"""
+        terms = [t for q in queries for t in q.split()]
+        return [
+            prec_no for prec_no, info in self.corpus.items()
+            if all(any(t in str(v) for v in info.values()) for t in terms)
+        ]
+
+    async def _search(self, request: web.Request) -> web.Response:
+        error = await self._inject(request)
+        if error is not None:
+            return error
+
+        display = int(request.query.get("display", 20))
+        hits = self._matches(request.query.getall("query", []))
+        result: Dict[str, Any] = {
+            "target": "prec",
+            "키워드": " ".join(request.query.getall("query", [])),
+            "section": "bdyText" if request.query.get("search") == "2" else "evtNm",
+            "totalCnt": str(len(hits)),
+            "page": request.query.get("page", "1"),
+        }
+        items = [
+            {
+                "id": str(i + 1),
+                "판례일련번호": prec_no,
+                **{k: self.corpus[prec_no][k] for k in ("사건명", "사건번호", "선고일자", "법원명") if k in self.corpus[prec_no]},
+                "판례상세링크": f"/DRF/lawService.do?target=prec&ID={prec_no}&type=HTML",
+            }
+            for i, prec_no in enumerate(hits[:display])
+        ]
+        if len(items) == 1 and self.single_as_dict:
+            result["prec"] = items[0]
+        elif items:
+            result["prec"] = items
+        return web.json_response({"PrecSearch": result})
+
+    async def _service(self, request: web.Request) -> web.Response:
+        error = await self._inject(request)
+        if error is not None:
+            return error
+
+        info = self.corpus.get(request.query.get("ID", ""))
+        if info is None:
+            return web.json_response({"Law": "일치하는 판례가 없습니다. 판례명을 확인하여 주십시오."})
+        return web.json_response({"PrecService": info})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="법령정보센터 판례 API 로컬 대역 서버")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--corpus-size", type=int, default=500)
+    parser.add_argument("--latency", default="0", help="'0.1' | 'uniform:lo:hi' | 'lognormal:median:sigma'")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--hang-rate", type=float, default=0.0)
+    parser.add_argument("--hang-sec", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    fake = FakeLawApi(corpus_size=args.corpus_size, latency=parse_latency(args.latency), error_rate=args.error_rate,
+                      hang_rate=args.hang_rate, hang_sec=args.hang_sec, seed=args.seed)
+    print(f"OPEN_API_SEARCH_URL=http://127.0.0.1:{args.port}/DRF/lawSearch.do")
+    print(f"OPEN_API_SERVICE_URL=http://127.0.0.1:{args.port}/DRF/lawService.do")
+    web.run_app(fake.app(), host="127.0.0.1", port=args.port)
+
+
+if __name__ == "__main__":
+    main()
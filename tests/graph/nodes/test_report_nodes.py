@@ -1,7 +1,27 @@
 import pytest
 from unittest.mock import AsyncMock, MagicMock
 from src.graph.nodes.report_nodes import generate_report_node, evaluate_report_node
-from src.model.schema import EvaluationResult
+from src.model.schema import EvaluationResult, ProtectionTrademarkInfo, CollectedTrademarkInfo
+
+@pytest.fixture
+def best_of_n_state():
+    """conftest mock_state 와 독립된 최소 상태 (검증 없이 model_construct)"""
+    return {
+        "protection_trademark": ProtectionTrademarkInfo.model_construct(
+            p_trademark_reg_no="4000000000000", p_trademark_name="보호상표", p_trademark_type="text",
+            p_trademark_class_code="35", p_product_kinds="광고업", p_trademark_image="",
+        ),
+        "current_collected_trademark": CollectedTrademarkInfo.model_construct(
+            c_trademark_no=1, c_trademark_name="수집상표", c_trademark_type="text",
+            c_trademark_class_code="35", c_product_name="광고 대행", c_trademark_image="",
+        ),
+        "ensemble_result": None,
+        "refined_precedents": [],
+        "retrieved_precedents": [],
+        "report_content": "",
+        "report_candidates": [],
+        "regeneration_count": 0,
+    }
 
 @pytest.mark.asyncio
 async def test_generate_report_success(mock_state, mocker):
@@ -70,3 +90,40 @@ async def test_evaluate_report_regenerate(mock_state, mocker):
     
     assert result["evaluation_decision"] == "regenerate"
     assert result["regeneration_count"] == 1
+
+@pytest.mark.asyncio
+async def test_best_of_n_generates_candidates_and_selects_best(best_of_n_state, mocker):
+    mocker.patch.dict('src.graph.nodes.report_nodes.model_config', {
+        "report_sampling": {"enabled": True, "n": 3, "use_n_param": True, "temperature": 0.7},
+        "retry": {"report_evaluation_threshold": 70},
+    })
+    mock_client = AsyncMock()
+    mock_response = MagicMock()
+    mock_response.choices = [MagicMock() for _ in range(3)]
+    for choice, content in zip(mock_response.choices, ["후보 A", "후보 B", "후보 C"]):
+        choice.message.content = content
+    mock_client.chat.completions.create.return_value = mock_response
+    mocker.patch('src.container.Container.get_vllm_client', return_value=mock_client)
+    
+    generated = await generate_report_node(best_of_n_state)
+    
+    assert generated["report_candidates"] == ["후보 A", "후보 B", "후보 C"]
+    assert mock_client.chat.completions.create.await_args.kwargs["n"] == 3
+    
+    scores = {"후보 A": 60.0, "후보 B": 85.0, "후보 C": 75.0}
+    mock_llm = MagicMock()
+    mock_structured_llm = MagicMock()
+    mock_structured_llm.ainvoke = AsyncMock(side_effect=lambda messages: next(
+        EvaluationResult(score=s, feedback=c, decision="approved" if s >= 70 else "regenerate")
+        for c, s in scores.items() if c in messages[1].content
+    ))
+    mock_llm.with_structured_output.return_value = mock_structured_llm
+    mocker.patch('src.container.Container.get_gpt51_chat', return_value=mock_llm)
+    mocker.patch('src.services.report.render_user_prompt', side_effect=lambda name, **ctx: ctx.get("report_content", ""))
+    
+    result = await evaluate_report_node({**best_of_n_state, **generated})
+    
+    assert result["report_content"] == "후보 B"
+    assert result["evaluation_score"] == 85.0
+    assert result["report_candidates"] == []
+    assert mock_structured_llm.ainvoke.await_count == 3
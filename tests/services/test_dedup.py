@@ -0,0 +1,56 @@
+import base64
+from datetime import datetime
+from src.model.schema import CollectedTrademarkInfo
+from src.services.dedup import cluster_collected_trademarks
+
+
+def _c_tm(no: int, name: str, image: bytes) -> CollectedTrademarkInfo:
+    return CollectedTrademarkInfo(
+        c_trademark_no=no,
+        c_product_name=f"상품{no}",
+        c_product_page_url=f"http://example.com/{no}",
+        c_manufacturer_info="",
+        c_brand_info="",
+        c_l_category="",
+        c_m_category="",
+        c_s_category="",
+        c_trademark_type="text",
+        c_trademark_class_code="30",
+        c_trademark_name=name,
+        c_trademark_name_vec=[],
+        c_trademark_image=base64.b64encode(image).decode("utf-8"),
+        c_trademark_image_vec=[],
+        c_trademark_ent_date=datetime(2026, 2, 11),
+    )
+
+
+def test_cluster_by_normalized_name_and_image():
+    c_tm_list = [
+        _c_tm(1, "Star Bucks", b"img-a"),
+        _c_tm(2, "starbucks!", b"img-a"),   # 정규화 상표명 + 이미지 동일 -> 1번과 같은 클러스터
+        _c_tm(3, "starbucks", b"img-b"),    # 이미지 다름
+        _c_tm(4, "스타벅", b"img-a"),         # 상표명 다름
+    ]
+
+    clusters = cluster_collected_trademarks(c_tm_list)
+
+    assert [[c.c_trademark_no for c in cluster] for cluster in clusters] == [[1, 2], [3], [4]]
+
+
+def test_cluster_mixes_stored_and_computed_dhash():
+    import io
+    import pytest
+    from src.utils.image_hash import dhash
+
+    Image = pytest.importorskip("PIL.Image")
+    buf = io.BytesIO()
+    Image.new("RGB", (32, 32), (200, 30, 30)).save(buf, format="PNG")
+    image = buf.getvalue()
+
+    backfilled = _c_tm(1, "starbucks", image)
+    backfilled.c_trademark_dhash = dhash(image)
+    not_backfilled = _c_tm(2, "starbucks", image)   # 백필 전 행 (해시 없음) -> 계산 후 같은 키
+
+    clusters = cluster_collected_trademarks([backfilled, not_backfilled])
+
+    assert [[c.c_trademark_no for c in cluster] for cluster in clusters] == [[1, 2]]
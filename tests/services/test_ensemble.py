@@ -0,0 +1,52 @@
+import asyncio
+import time
+import pytest
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+from src.services import ensemble
+
+
+@pytest.mark.asyncio
+async def test_calculate_risk_llm_calls_do_not_block_event_loop(mocker):
+    async def ainvoke(messages):
+        await asyncio.sleep(0.05)
+        return SimpleNamespace(content='{"queries": ["호칭 유사"]}')
+
+    model = MagicMock()
+    model.ainvoke = ainvoke
+    model.invoke.side_effect = AssertionError("동기 invoke 호출 금지")
+    mocker.patch.object(ensemble.Container, "get_gpt51_chat", return_value=model)
+    mocker.patch.object(ensemble.Container, "get_gpt4o_mini", return_value=model)
+    mocker.patch.object(ensemble, "render_user_prompt", return_value="user")
+    mocker.patch.object(ensemble, "_search_reason_trademark", return_value="")
+    p_tm = SimpleNamespace(p_trademark_reg_no="R1", p_trademark_name="스타벅스", p_product_kinds="커피", p_trademark_image=None)
+
+    started = time.monotonic()
+    results = await asyncio.gather(*(ensemble.calculate_risk(p_tm, None, 0.9, 90.0, 0.8, "관념") for _ in range(4)))
+    elapsed = time.monotonic() - started
+
+    # 쌍당 LLM 호출 3회(0.05초씩) 순차 -> 4쌍 동시 실행 시 약 0.15초 (이벤트 루프 블로킹 시 0.6초)
+    assert elapsed < 0.4
+    assert all(r.visual_raw_score == 0.9 for r in results)
+    model.invoke.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_reason_trademark_lookup_failure_is_not_cached(mocker):
+    from unittest.mock import AsyncMock
+    from src.utils.cache import MemoCache
+
+    embedding = MagicMock()
+    embedding.aembed_documents = AsyncMock(return_value=[[0.1, 0.2]])
+    vector_store = MagicMock()
+    vector_store.search_reason_trademarks_batch = AsyncMock(side_effect=[
+        ConnectionError("DB 일시 오류"),
+        [SimpleNamespace(patent_id="P1", cleaned_content="호칭 유사로 거절", reason_tags="호칭", product_tags="커피", similarity_score=0.9)],
+    ])
+    mocker.patch.object(ensemble.Container, "get_text_embedding_model", return_value=embedding)
+    mocker.patch.object(ensemble.Container, "get_vector_store", return_value=vector_store)
+    mocker.patch.object(ensemble.Container, "get_reason_trademark_cache", return_value=MemoCache("reason", ttl=3600))
+
+    assert await ensemble._search_reason_trademark(["호칭 유사"], "R1") == ""
+    assert "호칭 유사로 거절" in await ensemble._search_reason_trademark(["호칭 유사"], "R1")
+    assert vector_store.search_reason_trademarks_batch.await_count == 2
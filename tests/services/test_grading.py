@@ -0,0 +1,49 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from src.model.schema import JudgeDecision
+from src.services import precedent as precedent_service
+from src.services.precedent import merge_chunk_decisions
+
+
+def test_merge_chunk_decisions_remaps_indices():
+    merged = merge_chunk_decisions([
+        (5, 5, JudgeDecision(decision="approve", reasoning=["b"], relevant_indices=[1, 7])),
+        (0, 5, JudgeDecision(decision="approve", reasoning=["a1", "a2"], relevant_indices=[0, 3])),
+        (10, 2, JudgeDecision(decision="rewrite", reasoning=[], feedback_or_query="지정상품 보강")),
+    ])
+
+    assert merged.decision == "approve"
+    assert merged.relevant_indices == [0, 3, 6]   # 청크 범위 밖 인덱스(7) 제외, 원래 목록 기준
+    assert merged.reasoning == ["a1", "a2", "b"]
+
+
+def test_merge_chunk_decisions_fallbacks():
+    web = JudgeDecision(decision="web_search", reasoning=[], feedback_or_query="상표 호칭 유사")
+    rewrite = JudgeDecision(decision="rewrite", reasoning=[], feedback_or_query="쿼리 구체화")
+    weak = JudgeDecision(decision="approve", reasoning=["a"], relevant_indices=[0])
+
+    assert merge_chunk_decisions([(0, 5, weak), (5, 5, web)], min_relevant=2).decision == "web_search"
+    assert merge_chunk_decisions([(0, 5, web), (5, 5, rewrite)]).feedback_or_query == "쿼리 구체화"
+    assert merge_chunk_decisions([(0, 5, JudgeDecision(decision="approve", reasoning=[], relevant_indices=[9]))]).relevant_indices == []
+
+
+@pytest.mark.asyncio
+async def test_grade_in_chunks_runs_each_chunk_and_tolerates_failure(mocker):
+    mocker.patch.object(precedent_service, "render_user_prompt", side_effect=lambda name, **ctx: str([p["case_id"] for p in ctx["precedents"]]))
+    mocker.patch.object(precedent_service, "get_system_prompt", return_value="system")
+
+    async def judge(messages):
+        chunk = messages[1].content
+        if "'2'" in chunk:
+            raise TimeoutError("chunk timeout")
+        return JudgeDecision(decision="approve", reasoning=["r"], relevant_indices=[1])
+
+    structured_llm = MagicMock()
+    structured_llm.ainvoke = AsyncMock(side_effect=judge)
+    context = {"precedents": [{"case_id": str(i)} for i in range(5)]}
+
+    result = await precedent_service._grade_in_chunks(structured_llm, context, chunk_size=2, min_relevant=1)
+
+    assert structured_llm.ainvoke.await_count == 3
+    assert result.decision == "approve"
+    assert result.relevant_indices == [1]   # 두 번째 청크 실패, 세 번째 청크(1건)의 인덱스 1은 범위 밖
@@ -0,0 +1,66 @@
+from types import SimpleNamespace
+from src.container import Container
+from src.services import precedent as precedent_service
+from src.services.precedent import generate_query, risk_profile_key
+
+
+def _state(reg_no="4000000000000", visual_weight=0.33, phonetic_weight=0.31, conceptual_weight=0.36):
+    return {
+        "protection_trademark": SimpleNamespace(p_trademark_reg_no=reg_no),
+        "visual_similarity_score": 0.9, "phonetic_similarity_score": 0.5, "conceptual_similarity_score": 0.2,
+        "visual_weight": visual_weight, "phonetic_weight": phonetic_weight, "conceptual_weight": conceptual_weight,
+    }
+
+
+def test_risk_profile_key_buckets_weights(mocker):
+    mocker.patch.dict(precedent_service.model_config, {"precedent": {"memo": {"enabled": True, "weight_bucket": 0.1}}})
+
+    key = risk_profile_key(_state())
+
+    assert key == ("4000000000000", "LHM", (0.3, 0.3, 0.4))
+    assert risk_profile_key(_state(visual_weight=0.29, conceptual_weight=0.38)) == key
+    assert risk_profile_key(_state(reg_no="4000000000001")) != key
+
+
+def test_generate_query_reuses_memo(mocker):
+    mocker.patch.dict(precedent_service.model_config, {"precedent": {"memo": {"enabled": True}}})
+    mocker.patch.object(Container, "get_gpt4o")
+    mocker.patch.object(precedent_service, "render_system_prompt", return_value="system")
+    mocker.patch.object(precedent_service, "render_user_prompt", return_value="user")
+    llm = mocker.patch.object(precedent_service, "generate_text", return_value='{"queries": ["호칭 유사 판례"]}')
+    Container.get_query_memo().clear()
+
+    key = ("4000000000000", "LHM", (0.3, 0.3, 0.4), 0)
+    first = generate_query("상표", "커피", "묘사", {}, {}, memo_key=key)
+    second = generate_query("상표", "커피", "다른 묘사", {}, {}, memo_key=key)
+    rewritten = generate_query("상표", "커피", "묘사", {}, {}, memo_key=key[:3] + (1,))
+
+    assert first == second == rewritten == {"queries": ["호칭 유사 판례"]}
+    assert llm.call_count == 2
+
+
+def test_query_memo_skipped_after_failed_report_evaluation(mocker):
+    from src.graph.nodes.precedent_nodes import generate_query_node
+
+    mocker.patch.dict(precedent_service.model_config, {"precedent": {"memo": {"enabled": True, "weight_bucket": 0.1}}})
+    mocker.patch.object(Container, "get_gpt4o")
+    mocker.patch.object(precedent_service, "render_system_prompt", return_value="system")
+    mocker.patch.object(precedent_service, "render_user_prompt", return_value="user")
+    llm = mocker.patch.object(precedent_service, "generate_text", side_effect=['{"queries": ["첫 쿼리"]}', '{"queries": ["새 쿼리"]}'])
+    Container.get_query_memo().clear()
+
+    state = {
+        **_state(),
+        "protection_trademark": SimpleNamespace(p_trademark_reg_no="4000000000000", p_trademark_name="상표", p_product_kinds="커피"),
+        "ensemble_result": SimpleNamespace(visual_description="묘사"),
+        "rewrite_count": 0,
+        "evaluation_decision": "",
+    }
+    first = generate_query_node(state)
+    # 보고서 평가 미달 -> generate_query 재진입 (rewrite_count 불변): 메모 재사용 없이 새 쿼리 생성
+    again = generate_query_node({**state, "evaluation_decision": "regenerate"})
+
+    assert first["search_querys"] == ["첫 쿼리"]
+    assert again["search_querys"] == ["새 쿼리"]
+    assert llm.call_count == 2
+    assert precedent_service.precedent_memo_key({**state, "evaluation_decision": "regenerate"}, ()) is None
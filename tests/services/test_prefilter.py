@@ -0,0 +1,42 @@
+from types import SimpleNamespace
+from src.model.schema import Precedent
+from src.services import precedent as precedent_service
+from src.tools.precedent_index import KoreanTokenizer
+
+
+def _state(precedents):
+    return {
+        "protection_trademark": SimpleNamespace(p_trademark_name="스타벅스", p_product_kinds="커피"),
+        "current_collected_trademark": SimpleNamespace(c_trademark_name="스타벅"),
+        "ensemble_result": None,
+        "search_querys": ["커피 상표 호칭 유사"],
+        "retrieved_precedents": precedents,
+    }
+
+
+def test_prefilter_keeps_top_k_by_hybrid_score(mocker):
+    mocker.patch.dict(precedent_service.model_config, {
+        "precedent": {"prefilter": {"enabled": True, "top_k": 2, "lexical_weight": 0.5}},
+    })
+    mocker.patch.object(precedent_service, "_tokenizer", return_value=KoreanTokenizer(use_mecab=False))
+    precedents = [
+        Precedent(precedent_no="1", content="지정상품 의류 외관 비교", is_relevant=False, score=0.9),
+        Precedent(precedent_no="2", content="커피 상표 호칭 유사 판단", is_relevant=False, score=0.6),
+        Precedent(precedent_no="3", content="기타 사건", is_relevant=False, score=0.5),
+        Precedent(precedent_no="4", content="웹 검색 판례 커피", is_relevant=False),
+    ]
+
+    kept = precedent_service.prefilter_precedents(_state(precedents))
+
+    assert [p.precedent_no for p in kept] == ["2", "1"]
+    assert kept[0].score >= kept[1].score
+
+
+def test_prefilter_disabled_or_small_list_passes_through(mocker):
+    precedents = [Precedent(precedent_no=str(i), content="내용", is_relevant=False, score=0.1) for i in range(3)]
+
+    mocker.patch.dict(precedent_service.model_config, {"precedent": {"prefilter": {"enabled": False, "top_k": 1}}})
+    assert precedent_service.prefilter_precedents(_state(precedents)) == precedents
+
+    mocker.patch.dict(precedent_service.model_config, {"precedent": {"prefilter": {"enabled": True, "top_k": 5}}})
+    assert precedent_service.prefilter_precedents(_state(precedents)) == precedents
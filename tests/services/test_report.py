@@ -0,0 +1,81 @@
+import asyncio
+import pytest
+from unittest.mock import MagicMock
+from src.model.schema import EvaluationResult
+from src.services import report as report_service
+from src.services.report import select_best_report
+
+
+@pytest.mark.asyncio
+async def test_generate_report_awaits_vllm_within_concurrency_limit(mocker):
+    mocker.patch.object(report_service, "render_user_prompt", side_effect=lambda name, **ctx: ctx["pair"])
+    mocker.patch.object(report_service, "get_system_prompt", return_value="system")
+    state = {"in_flight": 0, "peak": 0}
+
+    async def create(**kwargs):
+        state["in_flight"] += 1
+        state["peak"] = max(state["peak"], state["in_flight"])
+        await asyncio.sleep(0.01)
+        state["in_flight"] -= 1
+        response = MagicMock()
+        response.choices = [MagicMock()]
+        response.choices[0].message.content = f"보고서 {kwargs['messages'][1]['content']}"
+        return response
+
+    client = MagicMock()
+    client.chat.completions.create = create
+    mocker.patch.object(report_service.Container, "get_vllm_client", return_value=client)
+    mocker.patch.object(report_service.Container, "get_vllm_semaphore", return_value=asyncio.Semaphore(2))
+
+    reports = await asyncio.gather(*(report_service.generate_report({"pair": str(i)}) for i in range(5)))
+
+    assert reports == [f"보고서 {i}" for i in range(5)]
+    assert state["peak"] == 2
+
+
+def _client_returning(contents, fail_at=()):
+    calls = []
+
+    async def create(**kwargs):
+        calls.append(kwargs)
+        if len(calls) - 1 in fail_at:
+            raise TimeoutError("vLLM timeout")
+        response = MagicMock()
+        response.choices = [MagicMock() for _ in range(kwargs.get("n", 1))]
+        for i, choice in enumerate(response.choices):
+            choice.message.content = contents[(len(calls) - 1 + i) % len(contents)]
+        return response
+
+    client = MagicMock()
+    client.chat.completions.create = create
+    return client, calls
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("use_n_param, fail_at, expected_calls, expected", [
+    (True, (), 1, ["A", "B", "C"]),
+    (False, (1,), 3, ["A", "C"]),
+])
+async def test_generate_report_candidates(mocker, use_n_param, fail_at, expected_calls, expected):
+    mocker.patch.object(report_service, "render_user_prompt", return_value="user")
+    mocker.patch.object(report_service, "get_system_prompt", return_value="system")
+    client, calls = _client_returning(["A", "B", "C"], fail_at)
+    mocker.patch.object(report_service.Container, "get_vllm_client", return_value=client)
+    mocker.patch.object(report_service.Container, "get_vllm_semaphore", return_value=asyncio.Semaphore(3))
+
+    candidates = await report_service.generate_report_candidates({}, 3, use_n_param=use_n_param, temperature=0.7)
+
+    assert candidates == expected
+    assert len(calls) == expected_calls
+    assert all(c["temperature"] == 0.7 for c in calls)
+
+
+def test_select_best_report():
+    def ev(score, decision):
+        return EvaluationResult(score=score, feedback="", decision=decision)
+
+    # 통과 후보 중 최고점 (approved 판정 또는 임계값 이상)
+    assert select_best_report([ev(65, "regenerate"), ev(72, "regenerate"), None, ev(71, "approved")], 70) == 1
+    # 모두 미달이면 최고점 후보 (재생성 루프로 진행)
+    assert select_best_report([ev(40, "regenerate"), None, ev(55, "regenerate")], 70) == 2
+    assert select_best_report([None, None], 70) is None
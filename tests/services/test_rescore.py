@@ -0,0 +1,65 @@
+import copy
+from src.configs import model_config
+from src.services.ensemble import compute_ensemble_score
+from src.rescore import rescore_rows
+
+
+def _row(**overrides):
+    row = {
+        "risk_no": 1,
+        "p_trademark_reg_no": "4019423700000",
+        "c_trademark_name": "스타벅",
+        "visual_raw_score": 0.9,
+        "phonetic_raw_score": 95.0,
+        "conceptual_raw_score": 0.8,
+        "visual_grade": 5,
+        "phonetic_grade": 5,
+        "conceptual_grade": 3,
+        "total_score": 0.0,
+        "risk_level": "S",
+    }
+    row.update(overrides)
+    return row
+
+
+def test_compute_ensemble_score_dominant_part():
+    # 식별력 강함(5등급) + 보정 점수 높음 -> 요부 관찰: 최대 보정 점수 채택
+    result = compute_ensemble_score(
+        {"visual": 0.9, "phonetic": 95.0, "semantic": 0.8},
+        {"visual": 5, "phonetic": 5, "semantic": 3},
+    )
+    assert result["calibrated_scores"]["phonetic"] == 0.975
+    assert result["total_score"] == 0.975
+    assert result["risk_level"] == "H"
+
+
+def test_compute_ensemble_score_overall_observation():
+    # 식별력 약함 -> 전체 관찰(가중 RMS)
+    result = compute_ensemble_score(
+        {"visual": 0.2, "phonetic": 50.0, "semantic": 0.5},
+        {"visual": 1, "phonetic": 1, "semantic": 1},
+    )
+    assert result["weights"] == {"visual": 0.05, "phonetic": 0.05, "semantic": 0.05}
+    assert result["total_score"] == 0.1
+    assert result["risk_level"] == "S"
+
+
+def test_rescore_rows_reports_only_changes():
+    unchanged = _row(risk_no=1, total_score=0.975, risk_level="H")
+    changed = _row(risk_no=2, total_score=0.5, risk_level="L")
+
+    result = rescore_rows([unchanged, changed])
+
+    assert [r["risk_no"] for r in result] == [2]
+    assert result[0]["prev_risk_level"] == "L"
+    assert result[0]["risk_level"] == "H"
+
+
+def test_rescore_rows_with_alternate_thresholds():
+    risk_config = copy.deepcopy(model_config["risk"])
+    risk_config["risk_threshold"] = {"H": 0.99, "M": 0.9, "L": 0.5}
+
+    result = rescore_rows([_row(total_score=0.975, risk_level="H")], risk_config)
+
+    assert len(result) == 1
+    assert result[0]["risk_level"] == "M"
@@ -0,0 +1,13 @@
+import pytest
+from src.tools import backfill
+
+
+@pytest.mark.asyncio
+async def test_reference_copies_refused_unless_reference_storage(mocker):
+    mocker.patch.dict(backfill.model_config, {"db": {"risk_storage": "copy"}})
+    get_pool = mocker.patch.object(backfill.Database, "get_pool")
+
+    with pytest.raises(ValueError):
+        await backfill.backfill_reference_copies()
+
+    get_pool.assert_not_called()
@@ -0,0 +1,100 @@
+import os
+import numpy as np
+from src.tools.candidate_engine import (
+    CollectedCatalog, load_catalog, merge_catalogs, normalize_rows, parse_class_codes, parse_class_mask,
+    save_catalog, search_candidates, vectors_to_matrix,
+)
+
+
+def _catalog(name_vecs, image_vecs, class_codes, ids=None):
+    name_matrix, name_inv_norms = vectors_to_matrix(name_vecs)
+    image_matrix, image_inv_norms = vectors_to_matrix(image_vecs)
+    return CollectedCatalog(
+        ids=np.asarray(ids if ids is not None else range(100, 100 + len(name_vecs)), dtype=np.int64),
+        name_matrix=name_matrix, name_inv_norms=name_inv_norms,
+        image_matrix=image_matrix, image_inv_norms=image_inv_norms,
+        class_masks=np.array([parse_class_mask(c) for c in class_codes], dtype=np.int64),
+    )
+
+
+def _cosine(a, b):
+    if a is None or b is None:
+        return -np.inf
+    return float(np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b)))
+
+
+def test_parse_class_mask():
+    assert parse_class_mask(None) == 0
+    assert parse_class_mask("1|3") == 0b101
+    assert parse_class_mask("25| x |") == 1 << 24
+    # DB class_code_array()와 동일: 1~2자리 숫자만, 중복 제거 후 정렬
+    assert parse_class_codes("09|3|9|123|abc") == [3, 9]
+
+
+def test_search_candidates_matches_brute_force():
+    rng = np.random.default_rng(0)
+    n, m, dim = 300, 7, 16
+    name_vecs = [rng.normal(size=dim) if i % 5 else None for i in range(n)]
+    image_vecs = [rng.normal(size=dim) * 3 if i % 3 else None for i in range(n)]
+    codes = [str(rng.integers(1, 6)) for _ in range(n)]
+    catalog = _catalog(name_vecs, image_vecs, codes)
+
+    p_names = [rng.normal(size=dim) for _ in range(m)]
+    p_images = [rng.normal(size=dim) if j % 2 else None for j in range(m)]
+    p_codes = ["1|2", "3", "", "4|5", "1", "2", ""]
+    excluded = [np.array([3, 10], dtype=np.int64)] + [np.empty(0, dtype=np.int64)] * (m - 1)
+    common_excluded = np.array([20, 250], dtype=np.int64)
+    threshold, top_k = 0.2, 15
+
+    p_name_matrix, p_name_valid = normalize_rows(p_names, dim=dim)
+    p_image_matrix, p_image_valid = normalize_rows(p_images, dim=dim)
+    results = search_candidates(
+        catalog, p_name_matrix, p_name_valid, p_image_matrix, p_image_valid,
+        np.array([parse_class_mask(c) for c in p_codes], dtype=np.int64), excluded,
+        threshold=threshold, top_k=top_k, block_size=64, excluded_rows=common_excluded,
+    )
+
+    for j in range(m):
+        p_mask = parse_class_mask(p_codes[j])
+        expected = []
+        for i in range(n):
+            score = max(_cosine(name_vecs[i], p_names[j]), _cosine(image_vecs[i], p_images[j]))
+            if score < threshold or i in excluded[j] or i in common_excluded:
+                continue
+            if p_mask and not (p_mask & parse_class_mask(codes[i])):
+                continue
+            expected.append((i, score))
+        expected.sort(key=lambda x: (-x[1], x[0]))
+
+        assert [r for r, _ in results[j]] == [r for r, _ in expected[:top_k]]
+        assert np.allclose([s for _, s in results[j]], [s for _, s in expected[:top_k]], atol=1e-5)
+
+
+def test_rows_of_ignores_unknown_ids():
+    catalog = _catalog([[1.0, 0.0]] * 3, [None] * 3, ["1"] * 3, ids=[5, 7, 9])
+
+    assert catalog.rows_of([9, 5, 6, 100]).tolist() == [0, 2]
+    assert catalog.image_vector(0) == []
+    assert catalog.name_vector(1) == [1.0, 0.0]
+
+
+def test_snapshot_roundtrip_and_merge(tmp_path):
+    base = _catalog([[1.0, 0.0], [0.0, 2.0]], [None, [3.0, 4.0]], ["1", "2"], ids=[1, 3])
+    delta = _catalog([[0.5, 0.5], [1.0, 1.0]], [[1.0, 0.0], None], ["3", ""], ids=[2, 3])
+
+    merged = merge_catalogs(base, delta)
+    assert merged.ids.tolist() == [1, 2, 3]
+    assert merged.name_vector(2) == [1.0, 1.0]
+    assert merged.image_vector(2) == []
+
+    directory = str(tmp_path)
+    save_catalog(directory, base, {"watermark": None})
+    save_catalog(directory, merged, {"watermark": "2026-01-01T00:00:00"})
+    save_catalog(directory, merged, {"watermark": "2026-01-02T00:00:00"})
+
+    loaded, meta = load_catalog(directory)
+    assert meta["watermark"] == "2026-01-02T00:00:00"
+    assert meta["count"] == 3
+    assert isinstance(loaded.name_matrix, np.memmap)
+    assert np.array_equal(loaded.image_matrix, merged.image_matrix)
+    assert len([d for d in os.listdir(directory) if d.startswith("gen-")]) == 2
@@ -0,0 +1,89 @@
+import asyncio
+import time
+import aiohttp
+import pytest
+from src.tools import web_search
+from src.tools.web_search import LawApiClient, ResponseCache
+from tests.fakes.law_api_server import build_corpus, constant, lognormal
+
+
+def _client(api, **kwargs):
+    return LawApiClient(search_url=api.search_url, service_url=api.service_url, user_id="test", **kwargs)
+
+
+@pytest.fixture(autouse=True)
+def _display(mocker):
+    mocker.patch.dict(web_search.model_config, {"web_search": {"display": 20}})
+
+
+@pytest.mark.asyncio
+async def test_legacy_fetch_handles_single_dict_and_body_only(fake_law_api, mocker):
+    corpus = {
+        "1": {"사건번호": "2020후1", "사건명": "상표 등록무효", "판결내용": "<p>호칭<br/>유사</p>"},
+        "2": {"사건번호": "2021후2", "사건명": "상표 거절결정", "판결요지": "외관 유사"},
+    }
+    api = await fake_law_api(corpus=corpus)
+    mocker.patch.object(web_search, "SEARCH_URL", api.search_url)
+    mocker.patch.object(web_search, "SERVICE_URL", api.service_url)
+    mocker.patch.object(web_search, "API_USER_ID", "test")
+
+    async with aiohttp.ClientSession() as session:
+        assert await web_search.fetch_precedent_list(session, ["호칭"]) == ["1"]
+        assert await web_search.fetch_precedent_list(session, ["상표"]) == ["1", "2"]
+        assert await web_search.fetch_precedent_list(session, ["없는 키워드"]) == []
+        body_only = await web_search.fetch_precedent_detail(session, "1")
+        missing = await web_search.fetch_precedent_detail(session, "999")
+
+    assert body_only.case_id == "2020후1" and body_only.topic == "본문"
+    assert body_only.content == "호칭 유사"
+    assert missing is None
+
+
+@pytest.mark.asyncio
+async def test_client_bounds_concurrency_and_injected_errors_are_reproducible(fake_law_api):
+    async def run():
+        api = await fake_law_api(corpus=build_corpus(60), latency=lognormal(0.01, 0.5), error_rate=0.2, seed=7)
+        client = _client(api, max_per_host=3)
+        results = await asyncio.gather(*(client.detail(prec_no) for prec_no in api.corpus))
+        await client.close()
+        return api, client, [r is None for r in results]
+
+    api, client, failed = await run()
+    _, _, failed_again = await run()
+
+    assert api.stats["peak_in_flight"] <= 3
+    assert api.stats["errors"] == client.stats["errors"] == sum(failed) > 0
+    assert failed == failed_again
+
+
+@pytest.mark.asyncio
+async def test_client_timeout_on_hang(fake_law_api):
+    api = await fake_law_api(hang_rate=1.0, hang_sec=5.0)
+    client = _client(api, timeout=0.2)
+
+    started = time.monotonic()
+    precedents = await web_search.search_precedents(client, ["상표"])
+    elapsed = time.monotonic() - started
+    await client.close()
+
+    assert precedents == []
+    assert elapsed < 2.0
+    assert client.stats["errors"] == 1 and api.stats["hangs"] == 1
+
+
+@pytest.mark.asyncio
+async def test_cache_removes_repeat_round_trips(fake_law_api, tmp_path):
+    api = await fake_law_api(latency=constant(0.05))
+    client = _client(api, max_per_host=8, cache=ResponseCache(str(tmp_path / "cache.sqlite3")))
+
+    first = await web_search.search_precedents(client, ["상표"])
+    requests = api.stats["/DRF/lawSearch.do"] + api.stats["/DRF/lawService.do"]
+    started = time.monotonic()
+    second = await web_search.search_precedents(client, ["상표"])
+    elapsed = time.monotonic() - started
+    await client.close()
+
+    assert first and [p.precedent_no for p in first] == [p.precedent_no for p in second]
+    assert requests == 1 + len(first)
+    assert api.stats["/DRF/lawSearch.do"] + api.stats["/DRF/lawService.do"] == requests
+    assert elapsed < 0.05
@@ -0,0 +1,40 @@
+from src.tools.precedent_index import BM25Index, KoreanTokenizer, PrecedentIndex
+
+
+def _precedent(no, topic, content, hml="HHL", case_id=None, chunk_index=0):
+    return {
+        "precedent_no": no, "case_id": case_id or f"2020후{no}", "content": content, "chunk_index": chunk_index,
+        "topic": topic, "hml_pattern": hml, "file_name": f"{no}.pdf", "start_page": "1", "ruling_history": None,
+        "content_has_citation": False,
+    }
+
+
+def test_bm25_prefers_rare_term_matches():
+    tokenizer = KoreanTokenizer(use_mecab=False)
+    docs = [tokenizer(t) for t in ["상표 외관 유사", "상표 호칭 유사 호칭", "상표 관념"]]
+    scores = BM25Index(docs).scores(tokenizer("호칭"))
+
+    assert scores.argmax() == 1
+    assert scores[0] == scores[2] == 0
+
+
+def test_search_batch_topic_limits_lexical_signal_and_dedupe():
+    rows = [
+        _precedent(1, "법리", "외관 유사 판단 기준"),
+        _precedent(2, "법리", "호칭 유사 판단 기준", hml="LLL"),
+        _precedent(3, "본문", "호칭 동일 오인 혼동"),
+        _precedent(4, "본문", "지정상품 동일"),
+        _precedent(5, "본문", "벡터 없음"),
+    ]
+    vectors = [[1.0, 0.0], [0.9, 0.1], [0.0, 1.0], [0.1, 0.9], None]
+    index = PrecedentIndex(rows, vectors, tokenizer=KoreanTokenizer(use_mecab=False), lexical_weight=0.5)
+
+    results = index.search_batch([[1.0, 0.0], [1.0, 0.0]], ["외관", "호칭"], "HHL", l_limit=1, f_limit=1)
+
+    # 쿼리 1: 법리 1(외관 일치 + HML 가중치), 쿼리 2: 벡터는 1에 가깝지만 어휘 신호로 법리 2(호칭 일치)
+    assert sorted(r["precedent_no"] for r in results if r["topic"] == "법리") == [1, 2]
+    # 본문: 쿼리 2의 어휘 신호로 3 선택, 벡터 없는 5 제외
+    assert {r["precedent_no"] for r in results if r["topic"] == "본문"} <= {3, 4}
+    assert 3 in [r["precedent_no"] for r in results]
+    assert len({r["unique_key"] for r in results}) == len(results)
+    assert results == sorted(results, key=lambda r: r["score"], reverse=True)
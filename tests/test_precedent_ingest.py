@@ -0,0 +1,61 @@
+import pytest
+from src.model.schema import Precedent
+from src.tools.precedent_ingest import PrecedentIngestor, chunk_text
+
+
+def test_chunk_text_respects_limit_and_overlap():
+    text = " ".join(f"{i}번째 문장은 상표 유사 판단에 관한 설명이다." for i in range(40))
+
+    chunks = chunk_text(text, chunk_chars=200, overlap=30)
+
+    assert len(chunks) > 1
+    assert all(len(c) <= 200 for c in chunks)
+    assert chunks[1].startswith(chunks[0][-30:])
+    assert chunk_text("짧은 본문", chunk_chars=200) == ["짧은 본문"]
+    assert all(len(c) <= 50 for c in chunk_text("가" * 120, chunk_chars=50, overlap=0))
+
+
+class _FakeStore:
+    def __init__(self, existing):
+        self.existing = set(existing)
+        self.saved = {}
+
+    async def fetch_existing_precedent_case_ids(self, case_ids):
+        return self.existing & set(case_ids)
+
+    async def insert_precedent_chunks(self, case_id, chunks):
+        self.saved[case_id] = chunks
+        return len(chunks)
+
+
+class _FakeEmbedding:
+    def __init__(self):
+        self.calls = 0
+
+    async def aembed_documents(self, texts):
+        self.calls += 1
+        return [[float(len(t)), 1.0] for t in texts]
+
+
+@pytest.mark.asyncio
+async def test_ingestor_dedupes_by_case_id_and_embeds_in_batch():
+    store, embedding = _FakeStore(existing={"2019후1"}), _FakeEmbedding()
+    ingestor = PrecedentIngestor(store, embedding, chunk_chars=100, overlap=0)
+    precedents = [
+        Precedent(precedent_no="11", case_id="2019후1", content="이미 적재된 판례", is_relevant=False, topic="법리"),
+        Precedent(precedent_no="12", case_id="2020후2", content="상표의 유사 여부는 외관 호칭 관념을 종합하여 판단한다. " * 5, is_relevant=False, topic="법리"),
+        Precedent(precedent_no="13", case_id="2021후3", content="판결내용 본문", is_relevant=False),
+    ]
+
+    ingestor.submit(precedents, "HHL")
+    ingestor.submit(precedents, "HHL")   # 동일 실행 내 재제출은 무시
+    await ingestor.close()
+
+    assert set(store.saved) == {"2020후2", "2021후3"}
+    assert embedding.calls == 1
+    assert len(store.saved["2020후2"]) > 1
+    assert {c["topic"] for c in store.saved["2020후2"]} == {"법리"}
+    assert store.saved["2021후3"][0]["topic"] == "본문"
+    assert store.saved["2021후3"][0]["hml_pattern"] == "HHL"
+    assert store.saved["2021후3"][0]["source_id"] == "13"
+    assert ingestor.ingested == len(store.saved["2020후2"]) + 1
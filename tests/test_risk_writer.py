@@ -0,0 +1,63 @@
+import asyncio
+from types import SimpleNamespace
+import pytest
+from src.tools.risk_writer import InfringeRiskWriter
+
+
+class _FakeStore:
+    """insert_infringe_risks 호출 기록, 'bad' 상표명이 포함된 배치는 실패"""
+
+    def __init__(self):
+        self.batches = []
+
+    def infringe_risk_params(self, risk_data):
+        return (risk_data["p_trademark_reg_no"], risk_data["c_tm"].c_trademark_name)
+
+    async def insert_infringe_risks(self, params_list):
+        if any(name == "bad" for _, name in params_list):
+            raise ValueError("invalid row")
+        self.batches.append(list(params_list))
+
+
+def _risk(name, c_no=1):
+    return {"p_trademark_reg_no": "4000000000000", "c_tm": SimpleNamespace(c_trademark_no=c_no, c_trademark_name=name), "ensemble_result": None}
+
+
+@pytest.mark.asyncio
+async def test_flushes_on_batch_size_and_close():
+    store = _FakeStore()
+    writer = InfringeRiskWriter(store, batch_size=2, flush_interval=60)
+
+    for i in range(5):
+        await writer.add(_risk(f"상표{i}"))
+    failed = await writer.close()
+
+    assert failed == []
+    assert [len(b) for b in store.batches] == [2, 2, 1]
+    assert writer.written == 5
+
+
+@pytest.mark.asyncio
+async def test_flushes_after_interval():
+    store = _FakeStore()
+    writer = InfringeRiskWriter(store, batch_size=100, flush_interval=0.01)
+
+    await writer.add(_risk("상표"))
+    await asyncio.sleep(0.05)
+
+    assert len(store.batches) == 1
+    await writer.close()
+
+
+@pytest.mark.asyncio
+async def test_isolates_failed_rows():
+    store = _FakeStore()
+    writer = InfringeRiskWriter(store, batch_size=100, flush_interval=60)
+
+    await writer.add(_risk("정상1", 1))
+    await writer.add(_risk("bad", 2))
+    await writer.add(_risk("정상2", 3))
+    failed = await writer.close()
+
+    assert [f["c_trademark_no"] for f in failed] == [2]
+    assert writer.written == 2
@@ -60,6 +60,89 @@ async def test_search_similar_trademarks():
         # 리소스 정리
         await Database.close()
 
+
+class _FakePagedConn:
+    """(best_distance, c_trademark_no) 정렬 키 이후의 행을 페이지 크기만큼 반환하는 가짜 커넥션"""
+
+    def __init__(self, rows, page_size):
+        self.rows = sorted(rows, key=lambda r: (r["best_distance"], r["c_trademark_no"]))
+        self.page_size = page_size
+        self.calls = 0
+
+    async def fetch(self, query, *params):
+        self.calls += 1
+        last_key = (params[-2], params[-1])
+        page = [r for r in self.rows if (r["best_distance"], r["c_trademark_no"]) > last_key]
+        return page[:self.page_size]
+
+
+def _collected_row(c_no, distance):
+    return {
+        "c_trademark_no": c_no, "c_product_name": "", "c_product_page_url": "", "c_manufacturer_info": "",
+        "c_brand_info": "", "c_l_category": "", "c_m_category": "", "c_s_category": "",
+        "c_trademark_type": "", "c_trademark_class_code": "", "c_trademark_name": f"상표{c_no}",
+        "c_trademark_image": None, "c_trademark_ent_date": None, "c_trademark_dhash": None,
+        "best_distance": distance,
+    }
+
+
+@pytest.mark.asyncio
+async def test_search_candidates_sql_pages_best_first(mocker):
+    """동일 거리 행이 페이지 경계에 걸쳐도 누락/중복 없이 거리순으로 candidate_budget건까지 조회"""
+    from src.tools.vector_store import VectorStore
+
+    mocker.patch.dict("src.tools.vector_store.model_config", {
+        "db": {"candidate_page_size": 3, "candidate_budget": 5},
+        "verdict": {"enabled": False},
+    })
+    rows = [_collected_row(c_no, d) for c_no, d in [(7, 0.1), (3, 0.1), (5, 0.1), (1, 0.05), (9, 0.2), (2, 0.25), (4, 0.3)]]
+    conn = _FakePagedConn(rows, page_size=3)
+    p_row = {
+        "p_trademark_reg_no": "4000000000000", "p_trademark_name": "보호상표", "p_trademark_type": "",
+        "p_trademark_class_code": "", "p_trademark_class_codes": None, "p_trademark_image": None, "p_trademark_user_no": 1,
+        "p_trademark_name_vec": "[1.0, 0.0]", "p_trademark_image_vec": "[0.0, 1.0]",
+        "p_trademark_dhash": None, "p_product_kinds": "",
+    }
+
+    results = await VectorStore()._search_candidates_sql(conn, [p_row], 0.7)
+
+    assert [c["c_trademark_no"] for c in results[0]["collected_trademarks"]] == [1, 3, 5, 7, 9]
+    assert conn.calls == 2
+
+
+def test_infringe_risk_params_reference_storage(mocker):
+    """reference 저장 모드: 이미지/벡터 대신 수집 상표 번호와 이미지 다이제스트만 저장"""
+    import base64
+    from types import SimpleNamespace
+    from src.tools.vector_store import VectorStore
+    from src.utils.fingerprint import image_digest
+
+    image = base64.b64encode(b"image-bytes").decode("utf-8")
+    c_tm = SimpleNamespace(
+        c_trademark_no=42, c_product_name="가방", c_product_page_url="http://shop/1", c_manufacturer_info="",
+        c_brand_info="", c_l_category="", c_m_category="", c_s_category="", c_trademark_type="",
+        c_trademark_class_code="18", c_trademark_name="스타벅", c_trademark_name_vec=[0.1, 0.2],
+        c_trademark_image=image, c_trademark_image_vec=[0.3, 0.4], c_trademark_ent_date=None,
+    )
+    ensemble_result = SimpleNamespace(
+        visual_score=0.9, visual_weight=1.0, phonetic_score=0.9, phonetic_weight=1.0, conceptual_score=0.9,
+        conceptual_weight=1.0, total_score=0.9, risk_level="H", visual_raw_score=0.9, phonetic_raw_score=90.0,
+        conceptual_raw_score=0.9, visual_grade=5, phonetic_grade=5, conceptual_grade=5,
+    )
+    risk_data = {"c_tm": c_tm, "ensemble_result": ensemble_result, "p_trademark_reg_no": "4000000000000"}
+    store = VectorStore()
+
+    mocker.patch.dict("src.tools.vector_store.model_config", {"db": {"risk_storage": "copy"}})
+    copied = store.infringe_risk_params(risk_data)
+    mocker.patch.dict("src.tools.vector_store.model_config", {"db": {"risk_storage": "reference"}})
+    referenced = store.infringe_risk_params(risk_data)
+
+    assert len(copied) == len(referenced) == 31
+    assert copied[11] == b"image-bytes" and copied[10] == "[0.1, 0.2]"
+    assert referenced[10] is None and referenced[11] is None and referenced[12] is None
+    assert referenced[29:] == (42, image_digest(image))
+
+
 if __name__ == "__main__":
     # 스크립트로 직접 실행 시
     asyncio.run(test_search_similar_trademarks())
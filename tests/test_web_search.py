@@ -0,0 +1,122 @@
+import asyncio
+import pytest
+from src.model.schema import Precedent
+from src.tools import web_search
+from src.tools.web_search import SpeculativeWebSearch
+
+
+def _fake_search(delay=0.0):
+    async def search(client, keywords, counter=None):
+        counter["api_calls"] += 1
+        await asyncio.sleep(delay)
+        counter["api_calls"] += 2
+        return [Precedent(precedent_no=k, content=f"{k} 판결요지", is_relevant=False) for k in keywords]
+    return search
+
+
+@pytest.mark.asyncio
+async def test_speculative_search_used_when_taken(mocker):
+    mocker.patch.object(web_search, "search_precedents", side_effect=_fake_search())
+    spec = SpeculativeWebSearch(client=None)
+
+    assert spec.start(("R1", 1), ["상표 호칭"])
+    assert not spec.start(("R1", 1), ["중복 시작"])
+    precedents = await spec.take(("R1", 1), ["상표 외관"], reuse_on_mismatch=True)
+
+    assert [p.precedent_no for p in precedents] == ["상표 호칭"]
+    assert spec.stats["used"] == 1 and spec.stats["used_api_calls"] == 3
+    assert await spec.take(("R1", 1), ["상표 호칭"]) is None
+
+
+@pytest.mark.asyncio
+async def test_speculative_search_cancel_and_mismatch_count_waste(mocker):
+    mocker.patch.object(web_search, "search_precedents", side_effect=_fake_search(delay=10))
+    spec = SpeculativeWebSearch(client=None)
+
+    spec.start(("R1", 1), ["상표"])
+    await asyncio.sleep(0)
+    spec.cancel(("R1", 1))
+
+    spec.start(("R1", 2), ["상표"])
+    await asyncio.sleep(0)
+    assert await spec.take(("R1", 2), ["다른 키워드"]) is None
+
+    # 재사용 허용이어도 검색어 단어가 겹치지 않으면 폐기
+    spec.start(("R1", 3), ["상표"])
+    await asyncio.sleep(0)
+    assert await spec.take(("R1", 3), ["다른 키워드"], reuse_on_mismatch=True) is None
+
+    assert spec.stats["cancelled"] == 1 and spec.stats["discarded"] == 2
+    assert spec.stats["wasted_api_calls"] == 3
+
+
+@pytest.mark.asyncio
+async def test_law_api_client_caches_and_limits_concurrency(tmp_path, mocker):
+    from aiohttp import web
+    from aiohttp.test_utils import TestServer
+    from src.tools.web_search import LawApiClient, ResponseCache
+
+    mocker.patch.dict(web_search.model_config, {"web_search": {"display": 10}})
+    state = {"in_flight": 0, "peak": 0, "requests": 0}
+
+    async def search(request):
+        state["requests"] += 1
+        return web.json_response({"PrecSearch": {"prec": {"판례일련번호": "100"}}})
+
+    async def service(request):
+        state["requests"] += 1
+        state["in_flight"] += 1
+        state["peak"] = max(state["peak"], state["in_flight"])
+        await asyncio.sleep(0.01)
+        state["in_flight"] -= 1
+        return web.json_response({"PrecService": {"사건번호": "2020후" + request.query["ID"], "판결요지": "<p>호칭 유사</p>"}})
+
+    app = web.Application()
+    app.router.add_get("/lawSearch.do", search)
+    app.router.add_get("/lawService.do", service)
+
+    async with TestServer(app) as server:
+        client = LawApiClient(
+            search_url=str(server.make_url("/lawSearch.do")), service_url=str(server.make_url("/lawService.do")),
+            user_id="test", max_per_host=2, cache=ResponseCache(str(tmp_path / "cache.sqlite3")),
+        )
+        precedents = await web_search.search_precedents(client, ["상표"])
+        details = await asyncio.gather(*(client.detail(str(i)) for i in range(6)))
+        counter = {}
+        again = await web_search.search_precedents(client, ["상표"], counter)
+        await client.close()
+
+    assert [p.case_id for p in precedents] == [p.case_id for p in again] == ["2020후100"]
+    assert precedents[0].content == "호칭 유사"
+    assert all(d is not None for d in details)
+    assert state["peak"] <= 2
+    assert state["requests"] == 2 + 6
+    assert counter["api_calls"] == 0 and client.stats["cache_hits"] == 2
+
+
+@pytest.mark.parametrize("web_search_count, retrieval_score, expected", [
+    (0, 0.2, True),    # 검색 직후 첫 검증, 원점수 빈약 -> 투기 시작
+    (0, 0.9, False),   # 사전 필터가 score 를 낮춰도 원점수 충분 -> 미시작
+    (1, None, False),  # 웹 검색 결과 재검증 (원점수 없음) -> 미시작
+])
+def test_speculation_only_on_first_grade_with_raw_score(mocker, web_search_count, retrieval_score, expected):
+    from types import SimpleNamespace
+    from src.graph.nodes import precedent_nodes
+
+    mocker.patch.dict(precedent_nodes.model_config, {"precedent": {
+        "max_web_search_count": 3,
+        "speculative_web_search": {"enabled": True, "min_hits": 1, "min_score": 0.5},
+    }})
+    spec = mocker.patch.object(precedent_nodes.Container, "get_speculative_web_search")
+    spec.return_value.start.return_value = True
+    state = {
+        "protection_trademark": SimpleNamespace(p_trademark_reg_no="R1", p_trademark_name="상표"),
+        "current_collected_trademark": SimpleNamespace(c_trademark_no=1),
+        "search_querys": ["상표 호칭"],
+        "web_search_count": web_search_count,
+        "retrieved_precedents": [Precedent(precedent_no="1", content="판결요지", is_relevant=False,
+                                           score=0.1, retrieval_score=retrieval_score)],
+    }
+
+    assert precedent_nodes._start_speculative_web_search(state) is expected
+    assert spec.return_value.start.called is expected
@@ -0,0 +1,41 @@
+import asyncio
+import pytest
+from src.utils.cache import MemoCache
+
+
+@pytest.mark.asyncio
+async def test_memo_cache_shares_inflight_and_skips_errors():
+    cache = MemoCache("test", maxsize=2)
+    calls = []
+
+    async def compute(value):
+        calls.append(value)
+        await asyncio.sleep(0.01)
+        return value
+
+    results = await asyncio.gather(*(cache.get_or_compute("a", lambda: compute(1)) for _ in range(3)))
+    assert results == [1, 1, 1]
+    assert calls == [1]
+
+    async def fail():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        await cache.get_or_compute("b", fail)
+    assert await cache.get_or_compute("b", lambda: compute(2)) == 2
+
+    # maxsize 초과 시 가장 오래 사용되지 않은 항목 제거
+    await cache.get_or_compute("c", lambda: compute(3))
+    assert cache.get("a") is None
+    assert cache.get("c") == 3
+
+
+def test_memo_cache_ttl_expiry(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("src.utils.cache.time.monotonic", lambda: now[0])
+    cache = MemoCache("test", ttl=10)
+
+    cache.set("k", "v")
+    assert cache.get("k") == "v"
+    now[0] += 11
+    assert cache.get("k") is None
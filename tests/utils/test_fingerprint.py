@@ -0,0 +1,16 @@
+import base64
+import hashlib
+from src.utils.fingerprint import image_digest
+
+
+def test_image_digest_matches_raw_bytes():
+    raw = b"\x89PNG\r\n\x1a\nfake-image"
+    encoded = base64.b64encode(raw).decode("utf-8")
+
+    assert image_digest(encoded) == hashlib.sha256(raw).hexdigest()
+    assert image_digest(raw) == image_digest(memoryview(raw))
+
+
+def test_image_digest_none_is_empty_bytes():
+    # DB 측 coalesce(image, ''::bytea)와 동일
+    assert image_digest(None) == hashlib.sha256(b"").hexdigest()
@@ -0,0 +1,67 @@
+import io
+import pytest
+from src.utils.image_hash import dhash, hamming_distance
+
+Image = pytest.importorskip("PIL.Image")
+
+
+def _encode(img, fmt: str, **kwargs) -> bytes:
+    buf = io.BytesIO()
+    img.save(buf, format=fmt, **kwargs)
+    return buf.getvalue()
+
+
+def _gradient(width: int, height: int, reverse: bool = False):
+    img = Image.new("L", (width, height))
+    for x in range(width):
+        value = int(255 * x / (width - 1))
+        for y in range(height):
+            img.putpixel((x, y), 255 - value if reverse else value)
+    return img.convert("RGB")
+
+
+def test_dhash_reencoded_image_is_near_duplicate():
+    original = _gradient(64, 64)
+
+    png_hash = dhash(_encode(original, "PNG"))
+    jpeg_hash = dhash(_encode(original.resize((48, 48)), "JPEG", quality=60))
+
+    assert png_hash is not None and jpeg_hash is not None
+    assert hamming_distance(png_hash, jpeg_hash) <= 4
+
+
+def test_dhash_different_image_is_far():
+    a = dhash(_encode(_gradient(64, 64), "PNG"))
+    b = dhash(_encode(_gradient(64, 64, reverse=True), "PNG"))
+
+    assert hamming_distance(a, b) > 32
+
+
+def test_dhash_invalid_image_returns_none():
+    assert dhash(b"not-an-image") is None
+    assert dhash(None) is None
+
+
+def test_hamming_distance_handles_signed_values():
+    assert hamming_distance(-1, 0) == 64
+    assert hamming_distance(-1, -1) == 0
+
+
+def test_near_duplicate_check_caches_hash_without_mutating_models(mocker):
+    from types import SimpleNamespace
+    from src.services import visual_scoring
+
+    mocker.patch.dict(visual_scoring.model_config, {"image_hash": {"enabled": True, "near_duplicate_distance": 4}})
+    from src.utils import image_hash
+
+    mocker.patch.dict(image_hash._DHASH_CACHE, clear=True)
+    spy = mocker.spy(image_hash, "dhash")
+    image = _encode(_gradient(64, 64), "PNG")
+    p_tm = SimpleNamespace(p_trademark_dhash=None, p_trademark_image=image)
+    c_tm = SimpleNamespace(c_trademark_dhash=None, c_trademark_image=_encode(_gradient(64, 64), "JPEG", quality=60))
+
+    assert visual_scoring.is_near_duplicate_image(p_tm, c_tm)
+    assert visual_scoring.is_near_duplicate_image(p_tm, c_tm)
+
+    assert p_tm.p_trademark_dhash is None and c_tm.c_trademark_dhash is None
+    assert spy.call_count == 2
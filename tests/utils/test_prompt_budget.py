@@ -0,0 +1,46 @@
+import pytest
+from src.utils import prompt_budget
+from src.utils.prompt_budget import completion_token_limit, count_tokens, fit_precedent_context, fit_precedents
+
+
+@pytest.fixture(autouse=True)
+def char_estimate(mocker):
+    """오프라인 환경 대비: 문자 1개 = 1토큰 추정 모드로 고정"""
+    mocker.patch.object(prompt_budget, "_encoding", return_value=None)
+    mocker.patch.dict(prompt_budget.model_config, {"prompt_budget": {
+        "chars_per_token": 1,
+        "precedent_grading": {"precedent_tokens": 250, "max_chunk_tokens": 120, "min_chunk_tokens": 50},
+    }})
+
+
+def _precedent(case_id, length):
+    return {"case_id": case_id, "file_name": "f.pdf", "start_page": "1", "content": "가" * length}
+
+
+def test_fit_precedents_keeps_ranked_prefix():
+    precedents = [_precedent("A", 100), _precedent("B", 200), _precedent("C", 40), _precedent("D", 10)]
+
+    kept, record = fit_precedents(precedents, budget=250, max_chunk_tokens=120, min_chunk_tokens=50)
+
+    # A(100) + B(120으로 절단) = 220, C는 남은 30토큰 < 최소 50이므로 C 이후 제외 (D가 들어갈 자리가 있어도 상위 연속 구간만 유지)
+    assert [p["case_id"] for p in kept] == ["A", "B"]
+    assert record["truncated"] == ["B"]
+    assert record["dropped"] == ["C", "D"]
+    assert count_tokens(kept[1]["content"]) <= 120
+    assert record["tokens"] <= 250
+
+
+def test_fit_precedent_context_uses_task_budget():
+    context = {"p_trademark_name": "상표", "precedents": [_precedent(str(i), 100) for i in range(5)]}
+
+    fitted = fit_precedent_context(context, "precedent_grading")
+
+    assert len(fitted["precedents"]) == 3
+    assert len(context["precedents"]) == 5
+    assert fit_precedent_context(context, "unknown_task") is context
+
+
+def test_completion_token_limit():
+    assert completion_token_limit(1000, 3000, 32768) == 3000
+    assert completion_token_limit(31000, 3000, 32768, margin=256) == 32768 - 31000 - 256
+    assert completion_token_limit(1000, 3000, None) == 3000
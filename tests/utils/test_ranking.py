@@ -0,0 +1,41 @@
+from src.utils.ranking import dedupe_precedents, has_citation, rerank_precedents
+
+
+def _row(no, topic, similarity, hml="HHL", content="상표의 유사 여부는 외관, 호칭, 관념을 종합하여 판단"):
+    return {"precedent_no": no, "topic": topic, "similarity": similarity, "hml_pattern": hml, "content": content}
+
+
+def test_has_citation():
+    assert has_citation("대법원 2019. 1. 1. 선고 판결 참조")
+    assert has_citation("상표법 제34조 제1항")
+    assert not has_citation("외관이 유사하다")
+    assert not has_citation(None)
+
+
+def test_rerank_applies_hml_boost_and_citation_penalty():
+    rows = [
+        _row(1, "법리", 0.80, hml="LLL"),
+        _row(2, "법리", 0.70, hml="HHL"),       # 0.70 x 1.2 = 0.84
+        _row(3, "법리", 0.60, hml="LLL"),
+        _row(4, "본문", 0.90, content="대법원 판결에 의하면"),  # 0.90 x 1.2 x 0.5 = 0.54
+        _row(5, "본문", 0.60, hml="LLL"),
+        {**_row(6, "본문", 0.95, hml="LLL"), "content_has_citation": True},  # 저장 컬럼 우선: 0.475
+    ]
+
+    result = rerank_precedents(rows, "HHL", l_limit=2, f_limit=2)
+
+    assert [r["precedent_no"] for r in result] == [2, 1, 5, 4]
+    assert round(result[0]["score"], 4) == 0.84
+    assert round(result[3]["score"], 4) == 0.54
+
+
+def test_dedupe_precedents_keeps_best_score():
+    rows = [
+        {"unique_key": "2020다1_0", "score": 0.5, "query": 1},
+        {"unique_key": "2020다2_3", "score": 0.7, "query": 1},
+        {"unique_key": "2020다1_0", "score": 0.9, "query": 2},
+    ]
+
+    result = dedupe_precedents(rows)
+
+    assert [(r["unique_key"], r["query"]) for r in result] == [("2020다1_0", 2), ("2020다2_3", 1)]